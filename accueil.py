@@ -1,9 +1,11 @@
-﻿import os
-import json
-import streamlit as st
+﻿import streamlit as st
 
 from components.access_guard import enforce_access
 from components.everboarding_gate import log_event_via_webhook  # logs existants
+from components.profile_store import normalize_email
+from components.profiler import maybe_profile
+from components.repository import Profile, get_repository
+from components.user_context import update_profile
 
 # =============================
 # STREAMLIT CONFIG (MUST BE FIRST)
@@ -18,10 +20,6 @@ st.caption("DEPLOY_FINGERPRINT=EVERINSIGHT_PROD_MAIN_2026-01-28_C")
 # =============================
 PORTAL_URL = (st.secrets.get("PORTAL_ACCESS_URL") or "https://everboarding.fr/everinsight").strip()
 
-DATA_DIR = "Data"
-PROFILE_PATH = os.path.join(DATA_DIR, "profil_apprenant.json")
-os.makedirs(DATA_DIR, exist_ok=True)
-
 DEBUG = bool(st.secrets.get("DEBUG", False))
 
 # =============================
@@ -30,30 +28,7 @@ DEBUG = bool(st.secrets.get("DEBUG", False))
 access = enforce_access(portal_url=PORTAL_URL, page_name="accueil")
 approved_email = (access.get("email") or "").strip().lower()
 st.session_state["approved_email"] = approved_email  # verrouillage email
-
-# =============================
-# HELPERS
-# =============================
-def load_profile() -> dict:
-    if os.path.exists(PROFILE_PATH):
-        try:
-            with open(PROFILE_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
-
-
-def save_profile(profile: dict) -> None:
-    with open(PROFILE_PATH, "w", encoding="utf-8") as f:
-        json.dump(profile, f, ensure_ascii=False, indent=2)
-
-
-def normalize_email(raw: str) -> str:
-    if raw is None:
-        return ""
-    return str(raw).replace("\u00A0", " ").strip().lower()
-
+maybe_profile("accueil", approved_email)
 
 # =============================
 # UI
@@ -61,11 +36,12 @@ def normalize_email(raw: str) -> str:
 st.title("Bienvenue dans EVERINSIGHT")
 st.markdown("Renseigne tes infos une seule fois. Elles seront réutilisées dans toute l’app.")
 
-profile = load_profile()
-default_prenom = profile.get("prenom", "")
-default_nom = profile.get("nom", "")
+# Profil de CET apprenant (un enregistrement par email, plus de fichier partagé)
+profile = get_repository().get_profile(approved_email or st.session_state.get("email")) or Profile()
+default_prenom = profile.first_name
+default_nom = profile.last_name
 
-default_email = approved_email if approved_email else profile.get("email", "")
+default_email = approved_email if approved_email else profile.email
 
 with st.form("profil_form", clear_on_submit=False):
     prenom = st.text_input("Prénom", value=default_prenom)
@@ -96,7 +72,7 @@ if submitted:
             "Astuce : clique dans le champ email et tape un caractère si ton navigateur l'a auto-rempli."
         )
     else:
-        save_profile({"prenom": prenom.strip(), "nom": nom.strip(), "email": email})
+        update_profile(email, first_name=prenom.strip(), last_name=nom.strip())
         st.success("Profil enregistré. Tu peux aller sur “Mon espace” / “Mon programme”.")
 
         # log profile_saved
@@ -2,11 +2,9 @@
 # Synthese DISC + plan d'action EverINSIGHT
 
 import os
-import json
 from datetime import datetime
 import io
 import math
-import tempfile
 import smtplib
 import ssl
 from email.message import EmailMessage
@@ -15,7 +13,16 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import matplotlib.pyplot as plt
-from fpdf import FPDF
+
+from components.access_guard import log_page_open
+from components.allowlist import get_allowlist
+from components.blob_store import get_session_blob, put_session_blob
+from components.disc_texts import DIM_EXCESS, DIM_LABELS, DIM_NATURAL_STRENGTHS, GROWTH_TEXT
+from components.history_index import get_history_index
+from components.pdf_report import get_or_build_pdf
+from components.percentile_index import get_percentile_index
+from components.repository import DISC_LOG_PATH, get_repository
+from components.send_ledger import get_ledger
 
 st.set_page_config(
     page_title="Mes resultats & plan d'action",
@@ -26,49 +33,9 @@ st.set_page_config(
 st.title("Mes resultats & plan d'action")
 
 # -------------------------------------------------------------------
-# 0. Constantes communes
+# 0. Constantes communes (textes DISC : components/disc_texts.py)
 # -------------------------------------------------------------------
 
-# Libelles des dimensions
-DIM_LABELS = {
-    "D": ("Dominance", "Resultats / decision / vitesse"),
-    "I": ("Influence", "Relation / energie / inspiration"),
-    "S": ("Stabilite", "Cooperation / patience / fiabilite"),
-    "C": ("Conformite", "Qualite / precision / normes"),
-}
-
-# Lecture "forces naturelles"
-DIM_NATURAL_STRENGTHS = {
-    "D": "Vous aimez relever des defis, aller vite et orienter les decisions.",
-    "I": "Vous mettez facilement de l’energie et du lien dans le groupe.",
-    "S": "Vous favorisez la cooperation, l’ecoute et un climat stable.",
-    "C": "Vous apportez de la rigueur, de la precision et le sens des normes.",
-}
-
-# Risques d'exces pour les energies fortes (affichage ecran + PDF)
-DIM_EXCESS = {
-    "D": "En exces, vous pouvez aller trop vite, imposer vos vues ou prendre peu de temps pour ecouter.",
-    "I": "En exces, vous pouvez beaucoup parler, vous disperser ou perdre de vue l’objectif.",
-    "S": "En exces, vous pouvez eviter les conflits, trop vous adapter ou avoir du mal a dire non.",
-    "C": "En exces, vous pouvez sur-structurer, rechercher trop de details ou avoir du mal a decider.",
-}
-
-# Axes de developpement pour les energies moins naturelles
-GROWTH_TEXT = {
-    "D": "Developper davantage la Dominance (D) vous aiderait a prendre plus facilement des decisions, tenir vos positions et oser vous affirmer dans les moments cles.",
-    "I": "Developper davantage l’Influence (I) vous aiderait a partager vos idees, creer plus de lien et embarquer plus facilement les autres.",
-    "S": "Developper davantage la Stabilite (S) vous aiderait a mieux reflechir aux consequences de vos actions, prendre en compte l’ensemble des acteurs et installer un climat de confiance.",
-    "C": "Developper davantage la Conformite (C) vous aiderait a structurer vos demarches, securiser les points de detail importants et fiabiliser vos decisions.",
-}
-
-# Pour le PDF : textes axes de dev (formulation un peu plus courte)
-DIM_DEV = {
-    "D": "Vous pourriez gagner a ecouter davantage, poser des questions et partager la decision quand c’est utile.",
-    "I": "Vous pourriez gagner a structurer davantage vos messages, prioriser et conclure plus clairement.",
-    "S": "Vous pourriez gagner a exprimer vos desaccords, poser des limites et oser dire non.",
-    "C": "Vous pourriez gagner a simplifier, aller a l’essentiel et accepter une part d’incertitude.",
-}
-
 # Couleurs radar
 COLOR = {"D": "#E41E26", "I": "#FFC107", "S": "#2ECC71", "C": "#2E86DE"}
 
@@ -79,6 +46,7 @@ COLOR = {"D": "#E41E26", "I": "#FFC107", "S": "#2ECC71", "C": "#2E86DE"}
 
 session_email = (st.session_state.get("email") or "").strip().lower()
 session_first_name = (st.session_state.get("first_name") or "").strip()
+log_page_open(session_email, "resultats")
 
 st.markdown(
     """
@@ -114,31 +82,14 @@ disc_results = st.session_state.get("disc_results")
 if disc_results and (disc_results.get("user", "").strip().lower() == email):
     last_rec = disc_results
 else:
-    # Fallback : lecture du fichier JSONL
-    PAGES_DIR = os.path.dirname(os.path.abspath(__file__))
-    PROJECT_ROOT = os.path.dirname(PAGES_DIR)
-    LOG_DIR = os.path.join(PROJECT_ROOT, "Data", "logs")
-    LOG_PATH = os.path.join(LOG_DIR, "disc_forced_sessions.jsonl")
-
-    if not os.path.exists(LOG_PATH):
+    # Fallback : dernière session enregistrée dans le journal DISC (lecture mise en cache)
+    if not os.path.exists(DISC_LOG_PATH):
         st.error("Aucun resultat trouve pour l’instant. Le fichier de reponses n’existe pas encore.")
         st.stop()
 
-    records = []
-    with open(LOG_PATH, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rec = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            user_field = (rec.get("user") or "").strip().lower()
-            if user_field == email:
-                records.append(rec)
-
-    if not records:
+    last_session = get_repository().last_disc_session(email)
+
+    if last_session is None:
         st.warning(
             "Aucun resultat DISC trouve pour cet e-mail. "
             "Vous n’avez peut-etre pas encore valide le questionnaire, "
@@ -146,7 +97,7 @@ else:
         )
         st.stop()
 
-    last_rec = records[-1]
+    last_rec = last_session.to_record()
 
 scores = last_rec.get("scores", {}) or {}
 for k in ["D", "I", "S", "C"]:
@@ -197,6 +148,53 @@ if len(df) >= 2:
         f"avec une energie secondaire **{top2['Libelle']} ({top2['Dimension']})**."
     )
 
+# Position dans la cohorte (index de percentiles en mémoire, mis à jour à chaque nouvelle session)
+cohort = get_allowlist().cohort_of(email)
+percentile_index = get_percentile_index()
+cohort_size = percentile_index.count(cohort)
+if cohort and cohort_size >= 5:
+    lines = []
+    for k, _ in ordered:
+        pct = percentile_index.percentile(k, scores[k], cohort)
+        if pct is not None:
+            lines.append(f"- **{DIM_LABELS[k][0]} ({k})** : {round(pct)}e percentile")
+    st.markdown(f"**Votre position dans votre cohorte** ({cohort_size} apprenants) :")
+    st.markdown("\n".join(lines))
+    st.caption(
+        "Un score au 80e percentile est superieur ou egal a celui d'environ 80 % des apprenants de votre cohorte "
+        "(derniere session de chacun)."
+    )
+
+# Evolution depuis la premiere passation (historique en memoire, mis a jour a chaque nouvelle session)
+history_index = get_history_index()
+evolution = history_index.delta(email)
+if evolution:
+    st.subheader("Votre evolution")
+    trajectory = pd.DataFrame(history_index.trajectory(email))
+    trajectory["Passation"] = range(1, len(trajectory) + 1)
+    long_df = trajectory.melt(
+        id_vars=["Passation", "ts"], value_vars=["D", "I", "S", "C"], var_name="Dimension", value_name="Score"
+    )
+    evolution_chart = (
+        alt.Chart(long_df)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X("Passation:O"),
+            y="Score:Q",
+            color="Dimension:N",
+            tooltip=["Passation", "ts", "Dimension", "Score"],
+        )
+        .properties(height=260)
+    )
+    st.altair_chart(evolution_chart, use_container_width=True)
+    lines = [
+        f"- **{DIM_LABELS[k][0]} ({k})** : {evolution['first'][k]} → {evolution['latest'][k]} "
+        f"({evolution[k]:+d})"
+        for k in ["D", "I", "S", "C"]
+    ]
+    st.markdown(f"**Entre votre premiere et votre derniere passation** ({evolution['n_sessions']} passations) :")
+    st.markdown("\n".join(lines))
+
 # -------------------------------------------------------------------
 # 4. Radar / spider chart
 # -------------------------------------------------------------------
@@ -368,7 +366,8 @@ ax.set_rlim(0, 1.05)
 buf = io.BytesIO()
 fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
 buf.seek(0)
-st.session_state["radar_png"] = buf.getvalue()
+# Sur disque : la session ne garde qu'une référence (BlobRef)
+put_session_blob("radar_png", buf.getvalue(), mime="image/png")
 
 mid = st.columns([1, 2, 1])[1]
 with mid:
@@ -482,102 +481,6 @@ st.markdown("---")
 st.subheader("Exporter ma synthese en PDF")
 
 
-def sanitize(text: str) -> str:
-    """Convertit tout texte en latin-1 compatible pour FPDF."""
-    if text is None:
-        return ""
-    return text.encode("latin-1", "ignore").decode("latin-1")
-
-
-def build_pdf(
-    email: str,
-    scores: dict,
-    ordered_dims,
-    situation_success: str,
-    situation_difficult: str,
-    radar_png: bytes | None = None,
-) -> bytes:
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(0, 10, sanitize("Profil DISC - Synthese personnelle"), ln=True)
-
-    pdf.set_font("Arial", "", 11)
-    pdf.cell(0, 8, sanitize(f"Email : {email}"), ln=True)
-    pdf.ln(2)
-
-    # Scores
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 8, sanitize("Scores detaillees :"), ln=True)
-    pdf.set_font("Arial", "", 11)
-    scores_line = (
-        f"D : {scores['D']}, I : {scores['I']}, "
-        f"S : {scores['S']}, C : {scores['C']}"
-    )
-    pdf.cell(0, 8, sanitize(scores_line), ln=True)
-    pdf.ln(4)
-
-    # Points forts
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 8, sanitize("Vos points forts naturels :"), ln=True)
-    pdf.set_font("Arial", "", 11)
-    for dim in [ordered_dims[0][0], ordered_dims[1][0]]:
-        txt = f"- {DIM_LABELS[dim][0]} ({dim}) : {DIM_NATURAL_STRENGTHS[dim]}"
-        pdf.multi_cell(0, 6, sanitize(txt))
-    pdf.ln(2)
-
-    # Axes de reflexion
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 8, sanitize("Axes de reflexion pour progresser :"), ln=True)
-    pdf.set_font("Arial", "", 11)
-    pdf.multi_cell(0, 6, sanitize("Utiliser vos forces sans tomber dans leurs exces :"))
-    for dim in [ordered_dims[0][0], ordered_dims[1][0]]:
-        txt = f"- {DIM_LABELS[dim][0]} ({dim}) : {DIM_EXCESS[dim]}"
-        pdf.multi_cell(0, 6, sanitize(txt))
-    pdf.ln(1)
-    pdf.multi_cell(0, 6, sanitize("Developper davantage vos energies moins naturelles :"))
-    for dim in ["D", "I", "S", "C"]:
-        if dim not in [ordered_dims[0][0], ordered_dims[1][0]]:
-            txt = f"- {DIM_LABELS[dim][0]} ({dim}) : {DIM_DEV[dim]}"
-            pdf.multi_cell(0, 6, sanitize(txt))
-    pdf.ln(2)
-
-    # Page radar
-    if radar_png:
-        pdf.add_page()
-        pdf.set_font("Arial", "B", 14)
-        pdf.cell(0, 8, sanitize("Votre profil DISC (radar)"), ln=True)
-        pdf.ln(4)
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-            tmp.write(radar_png)
-            tmp_path = tmp.name
-
-        pdf.image(tmp_path, x=25, y=None, w=160)
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
-
-    # Page plan d'action
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 8, sanitize("Plan d'action - Situation reussie :"), ln=True)
-    pdf.set_font("Arial", "", 11)
-    pdf.multi_cell(0, 6, sanitize(situation_success or "(non renseigne)"))
-    pdf.ln(1)
-
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 8, sanitize("Plan d'action - Situation difficile :"), ln=True)
-    pdf.set_font("Arial", "", 11)
-    pdf.multi_cell(0, 6, sanitize(situation_difficult or "(non renseigne)"))
-
-    pdf_bytes = pdf.output(dest="S").encode("latin-1", "ignore")
-    return pdf_bytes
-
-
 def send_pdf_by_email(recipient_email: str, pdf_bytes: bytes) -> None:
     """Envoie le PDF au participant via SMTP (config dans [email] de secrets.toml)."""
     try:
@@ -626,29 +529,43 @@ st.markdown(
 )
 
 if st.button("Generer mon PDF et me l'envoyer par e-mail"):
-    radar_png = st.session_state.get("radar_png")
-    pdf_bytes = build_pdf(
+    # Memes entrees => meme PDF (cache), et pas de second e-mail dans la fenetre du registre
+    pdf_bytes, pdf_key = get_or_build_pdf(
         email=email,
         scores=scores,
         ordered_dims=ordered,
         situation_success=situation_success,
         situation_difficult=situation_difficult,
-        radar_png=radar_png,
+        radar_png=get_session_blob("radar_png"),
     )
-    st.session_state["last_pdf_bytes"] = pdf_bytes
-
-    try:
-        send_pdf_by_email(email, pdf_bytes)
-        st.success("PDF genere et envoye par e-mail.")
-    except Exception as e:
-        st.error("Le PDF a ete genere mais l'envoi e-mail a echoue. Verifiez la config SMTP.")
-        st.exception(e)
+    put_session_blob("last_pdf_bytes", pdf_bytes, mime="application/pdf")
+
+    ledger = get_ledger()
+    claim_id = ledger.claim(email, pdf_key)
+    if claim_id is None:
+        st.info("Ce PDF vous a deja ete envoye par e-mail : il reste disponible au telechargement ci-dessous.")
+    else:
+        sent = False
+        try:
+            send_pdf_by_email(email, pdf_bytes)
+            sent = True
+            st.success("PDF genere et envoye par e-mail.")
+        except Exception as e:
+            st.error("Le PDF a ete genere mais l'envoi e-mail a echoue. Verifiez la config SMTP.")
+            st.exception(e)
+        finally:
+            # Echec (ou st.stop) : la reservation est liberee pour permettre un nouvel essai
+            if sent:
+                ledger.complete(claim_id)
+            else:
+                ledger.release(claim_id)
 
 # Bouton de telechargement si un PDF vient d'etre genere
-if "last_pdf_bytes" in st.session_state:
+last_pdf_bytes = get_session_blob("last_pdf_bytes")
+if last_pdf_bytes:
     st.download_button(
         "⬇️ Telecharger le PDF",
-        data=io.BytesIO(st.session_state["last_pdf_bytes"]),
+        data=io.BytesIO(last_pdf_bytes),
         file_name="profil_disc_synthese.pdf",
         mime="application/pdf",
     )
@@ -0,0 +1,99 @@
+import os
+
+import streamlit as st
+
+from components.access_guard import log_page_open
+from components.disc_questionnaire import QUESTION_BANK_PATH, get_question_bank, new_submission_id, submit
+
+st.set_page_config(
+    page_title="Questionnaire Everinsight DISC",
+    page_icon="📝",
+    layout="wide",
+)
+
+st.title("Questionnaire Everinsight DISC")
+
+# -------------------------------------------------------------------
+# 1. Recuperation email depuis la session
+# -------------------------------------------------------------------
+
+email = (st.session_state.get("approved_email") or st.session_state.get("email") or "").strip().lower()
+log_page_open(email, "questionnaire")
+
+if not email:
+    st.warning(
+        "Je ne trouve pas ton adresse e-mail en memoire. "
+        "Merci de passer d'abord par l’onglet **Accueil**."
+    )
+    st.stop()
+
+st.caption(f"Connecte en tant que **{email}**")
+
+# -------------------------------------------------------------------
+# 2. Banque de questions (chargee une fois par process)
+# -------------------------------------------------------------------
+
+if not os.path.exists(QUESTION_BANK_PATH):
+    st.error(
+        "La banque de questions est introuvable (Data/disc_questions.json). "
+        "Une ebauche peut etre reconstituee avec `python -m components.disc_questionnaire --draft ...`."
+    )
+    st.stop()
+
+try:
+    bank = get_question_bank()
+except ValueError as e:
+    st.error(f"Banque de questions invalide : {e}")
+    st.stop()
+
+# Identifiant de la tentative : conserve jusqu'a la fin du questionnaire (double clic, rerun,
+# second onglet -> une seule session enregistree)
+if "_disc_submission_id" not in st.session_state:
+    st.session_state["_disc_submission_id"] = new_submission_id()
+
+st.markdown(
+    "Pour chaque situation, choisis la proposition qui te ressemble **le plus**. "
+    "Il n’y a pas de bonne ou de mauvaise reponse."
+)
+
+# -------------------------------------------------------------------
+# 3. Formulaire
+# -------------------------------------------------------------------
+
+with st.form("disc_questionnaire"):
+    answers = {}
+    for n, q in enumerate(bank.questions, start=1):
+        choice = st.radio(
+            f"**{n}. {q.prompt}**" if q.prompt else f"**Question {n}**",
+            options=range(len(q.options)),
+            format_func=lambda i, q=q: q.options[i].text,
+            index=None,
+            key=f"disc_q_{q.qid}",
+        )
+        if choice is not None:
+            answers[q.qid] = choice
+    submitted = st.form_submit_button("Valider mes reponses", type="primary")
+
+if submitted:
+    missing = len(bank.questions) - len(answers)
+    if missing:
+        st.warning(f"Il reste {missing} question(s) sans reponse.")
+        st.stop()
+    try:
+        record, created = submit(email, answers, st.session_state["_disc_submission_id"], bank=bank)
+    except OSError as e:
+        st.error(f"Enregistrement impossible pour le moment : {e}")
+        st.stop()
+    st.session_state["disc_results"] = record
+    if created:
+        st.success(f"Merci ! Tes reponses sont enregistrees. Ton style dominant : **{record['style']}**.")
+    else:
+        st.info("Tes reponses avaient deja ete enregistrees.")
+    st.markdown("Tu peux maintenant consulter tes resultats et ton plan d’action.")
+
+if st.session_state.get("disc_results", {}).get("submission_id") == st.session_state.get("_disc_submission_id"):
+    if st.button("Refaire le questionnaire"):
+        st.session_state["_disc_submission_id"] = new_submission_id()
+        for q in bank.questions:
+            st.session_state.pop(f"disc_q_{q.qid}", None)
+        st.rerun()
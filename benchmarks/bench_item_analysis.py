@@ -0,0 +1,83 @@
+# benchmarks/bench_item_analysis.py
+# Analyse des items (components/item_analysis) sur un journal synthétique.
+#
+#   python benchmarks/bench_item_analysis.py --sessions 300000
+#
+# Mesure la première lecture du journal, les calculs (taux, alpha, item-total), la relecture
+# après l'ajout de quelques sessions (lignes nouvelles seulement) et la lecture en cache.
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from components.cache import MemoryCache  # noqa: E402
+from components.disc_texts import DIMS  # noqa: E402
+from components.disc_log import LogTail  # noqa: E402
+from components.item_analysis import ItemMatrix, analyze_matrix, get_item_analysis  # noqa: E402
+
+
+def write_log(path: str, n: int, questions: int = 25, seed: int = 0, start: int = 0) -> None:
+    """Sessions au format du journal ; chaque question propose les 4 énergies."""
+    rng = np.random.default_rng(seed)
+    prefs = rng.dirichlet(np.ones(len(DIMS)), size=n)
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(n):
+            picks = rng.choice(len(DIMS), size=questions, p=prefs[i])
+            counts = np.bincount(picks, minlength=len(DIMS))
+            rec = {
+                "ts": "2026-01-01T00:00:00Z",
+                "user": f"apprenant{start + i}@example.com",
+                "scores": {dim: int(c) for dim, c in zip(DIMS, counts)},
+                "choices": [
+                    {"qid": q + 1, "choice": f"Proposition {DIMS[d]} de la question {q + 1}", "dim": DIMS[d]}
+                    for q, d in enumerate(picks)
+                ],
+            }
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+def _timed(label: str, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"{label:<40}{time.perf_counter() - t0:>8.3f} s")
+    return out
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Analyse des items : temps de calcul.")
+    parser.add_argument("--sessions", type=int, default=300_000)
+    parser.add_argument("--append", type=int, default=1_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "disc_forced_sessions.jsonl")
+        _timed(f"génération ({args.sessions} sessions)", lambda: write_log(path, args.sessions))
+        print(f"journal : {os.path.getsize(path) / 1e6:.0f} Mo\n")
+
+        snapshot = os.path.join(tmp, "item_matrix.npz")
+        cache = MemoryCache()
+        analysis = _timed(
+            "première analyse (lecture + calcul)", lambda: get_item_analysis(path, cache=cache, snapshot_path=snapshot)
+        )
+        _timed("même version du journal (cache)", lambda: get_item_analysis(path, cache=cache))
+        write_log(path, args.append, seed=1, start=args.sessions)
+        analysis = _timed(f"après ajout de {args.append} sessions", lambda: get_item_analysis(path, cache=cache))
+
+        # Nouveau process : la matrice est rechargée depuis l'instantané, rien n'est relu
+        matrix = _timed("nouveau process (instantané)", lambda: ItemMatrix(LogTail(path), snapshot))
+        _timed("  + lecture des sessions ajoutées", matrix.refresh)
+        _timed("  + calcul", lambda: analyze_matrix(matrix.matrix(), matrix.qids, matrix.texts))
+
+        print(f"\n{analysis.n_sessions} sessions, {len(analysis.options)} propositions")
+        print(analysis.dimensions.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_mon_espace.py
+# Temps serveur par interaction sur "Mon espace" : rerun complet vs part de chaque fragment.
+#
+#   python benchmarks/bench_mon_espace.py --keystrokes 30
+#
+# Comparaison interne à un même rerun, pas avec la page d'avant les fragments : AppTest ne
+# sait pas relancer un fragment seul, donc chaque saisie simulée relance la page actuelle en
+# entier, et components/perf.py mesure dans ce rerun le temps total et celui de chaque
+# fragment. Le temps d'un fragment estime le coût d'une saisie en production, où seule son
+# étape est relancée ; il ne mesure pas l'ancienne page.
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from components.perf import summary  # noqa: E402
+
+# Champ saisi -> fragment qui le contient
+INTERACTIONS = {
+    "ambition_courte": "fragment:etape1",
+    "why3": "fragment:etape1",
+    "sous_objectif_1": "fragment:etape2",
+}
+
+
+def run(keystrokes: int) -> dict:
+    os.chdir(ROOT)
+    at = AppTest.from_file(os.path.join(ROOT, "accueil.py"), default_timeout=60)
+    at.run()
+    at.switch_page("pages/01_Mon_espace.py")
+    at.run()
+
+    for key in INTERACTIONS:
+        texte = ""
+        for i in range(keystrokes):
+            texte += "abcdefghij"[i % 10]
+            at.text_input(key=key).input(texte).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return summary(at.session_state)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Temps serveur par interaction sur Mon espace.")
+    parser.add_argument("--keystrokes", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    stats = run(args.keystrokes)
+    page = stats["page"]
+    print("Mesures prises dans les mêmes reruns (page actuelle) : la page complète inclut le fragment.")
+    print(f"{'interaction':<36}{'page complète p50':>18}{'dont fragment p50':>24}")
+    for key, section in INTERACTIONS.items():
+        frag = stats[section]
+        print(f"{key + ' -> ' + section:<36}{page['p50_ms']:>15.2f} ms{frag['p50_ms']:>21.2f} ms")
+    print()
+    for section, s in sorted(stats.items()):
+        print(f"{section:<22} n={s['n']:<4} p50={s['p50_ms']:.2f} ms  max={s['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
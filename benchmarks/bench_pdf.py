@@ -0,0 +1,175 @@
+# benchmarks/bench_pdf.py
+# Construction de la synthèse PDF : version d'origine (radar via fichier temporaire, tout remis
+# en page) vs components/pdf_report (image en mémoire décodée une fois, bloc statique rejoué).
+#
+#   python benchmarks/bench_pdf.py --batch 200
+#
+# "unitaire" : un PDF après un premier appel (caches chauds pour sa combinaison) ;
+# "lot" : N apprenants aux scores aléatoires, radars tirés parmi quelques variantes ;
+# "radar jamais vu" : cache d'images vidé avant chaque PDF.
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+from fpdf import FPDF  # noqa: E402
+
+from components import pdf_report  # noqa: E402
+from components.disc_texts import DIM_DEV, DIM_EXCESS, DIM_LABELS, DIM_NATURAL_STRENGTHS, DIMS  # noqa: E402
+from components.pdf_report import build_pdf, sanitize  # noqa: E402
+
+
+def legacy_build_pdf(email, scores, ordered_dims, situation_success, situation_difficult, radar_png=None):
+    """build_pdf tel qu'il était dans la page de résultats."""
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, sanitize("Profil DISC - Synthese personnelle"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    pdf.cell(0, 8, sanitize(f"Email : {email}"), ln=True)
+    pdf.ln(2)
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Scores detaillees :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    pdf.cell(0, 8, sanitize(f"D : {scores['D']}, I : {scores['I']}, S : {scores['S']}, C : {scores['C']}"), ln=True)
+    pdf.ln(4)
+    top = [ordered_dims[0][0], ordered_dims[1][0]]
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Vos points forts naturels :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    for dim in top:
+        pdf.multi_cell(0, 6, sanitize(f"- {DIM_LABELS[dim][0]} ({dim}) : {DIM_NATURAL_STRENGTHS[dim]}"))
+    pdf.ln(2)
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Axes de reflexion pour progresser :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    pdf.multi_cell(0, 6, sanitize("Utiliser vos forces sans tomber dans leurs exces :"))
+    for dim in top:
+        pdf.multi_cell(0, 6, sanitize(f"- {DIM_LABELS[dim][0]} ({dim}) : {DIM_EXCESS[dim]}"))
+    pdf.ln(1)
+    pdf.multi_cell(0, 6, sanitize("Developper davantage vos energies moins naturelles :"))
+    for dim in DIMS:
+        if dim not in top:
+            pdf.multi_cell(0, 6, sanitize(f"- {DIM_LABELS[dim][0]} ({dim}) : {DIM_DEV[dim]}"))
+    pdf.ln(2)
+    if radar_png:
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 14)
+        pdf.cell(0, 8, sanitize("Votre profil DISC (radar)"), ln=True)
+        pdf.ln(4)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
+            tmp.write(radar_png)
+            tmp_path = tmp.name
+        pdf.image(tmp_path, x=25, y=None, w=160)
+        os.remove(tmp_path)
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Plan d'action - Situation reussie :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    pdf.multi_cell(0, 6, sanitize(situation_success or "(non renseigne)"))
+    pdf.ln(1)
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Plan d'action - Situation difficile :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    pdf.multi_cell(0, 6, sanitize(situation_difficult or "(non renseigne)"))
+    return pdf.output(dest="S").encode("latin-1", "ignore")
+
+
+def radar_png(scores, seed) -> bytes:
+    """Radar RGBA comparable à celui de la page (matplotlib, 150 dpi)."""
+    fig = plt.figure(figsize=(6, 6))
+    ax = fig.add_subplot(projection="polar")
+    angles = [i * 3.14159 / 2 for i in range(4)] + [0]
+    values = [scores[d] / 10 for d in DIMS] + [scores["D"] / 10]
+    ax.fill(angles, values, alpha=0.4 + 0.05 * seed)
+    ax.plot(angles, values)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def make_items(n: int, radar_variants: int, seed: int = 0):
+    rng = random.Random(seed)
+    radars = []
+    for i in range(radar_variants):
+        scores = {d: rng.randint(0, 10) for d in DIMS}
+        radars.append(radar_png(scores, i))
+    items = []
+    for i in range(n):
+        scores = {d: rng.randint(0, 10) for d in DIMS}
+        items.append(
+            {
+                "email": f"apprenant{i}@example.com",
+                "scores": scores,
+                "ordered_dims": sorted(scores.items(), key=lambda kv: kv[1], reverse=True),
+                "situation_success": "Lancement d'un projet : " + "j'ai fixé le cap. " * rng.randint(1, 20),
+                "situation_difficult": "Réunion tendue : " + "j'ai trop parlé. " * rng.randint(1, 20),
+                "radar_png": radars[i % radar_variants],
+            }
+        )
+    return items
+
+
+def _time(fn, items):
+    durations = []
+    for item in items:
+        t0 = time.perf_counter()
+        fn(**item)
+        durations.append(time.perf_counter() - t0)
+    return durations
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Construction de la synthèse PDF : avant / après.")
+    parser.add_argument("--single", type=int, default=20, help="répétitions du PDF unitaire")
+    parser.add_argument("--batch", type=int, default=100, help="apprenants du lot")
+    parser.add_argument("--radars", type=int, default=8, help="radars distincts dans le lot")
+    args = parser.parse_args(argv)
+
+    single = make_items(1, 1)[0]
+    batch = make_items(args.batch, args.radars, seed=1)
+
+    print(f"{'cas':<28}{'avant p50':>12}{'après p50':>12}{'gain':>8}")
+    for label, fn_items in (
+        ("unitaire (même apprenant)", [single] * args.single),
+        (f"lot ({args.batch} apprenants)", batch),
+    ):
+        build_pdf(**fn_items[0])  # premier appel hors mesure (import des polices)
+        before = statistics.median(_time(legacy_build_pdf, fn_items)) * 1000
+        after = statistics.median(_time(build_pdf, fn_items)) * 1000
+        print(f"{label:<28}{before:>9.2f} ms{after:>9.2f} ms{before / after:>7.1f}x")
+
+    def build_cold(**item):
+        pdf_report._image_infos.clear()  # radar jamais vu : décodage PNG compris
+        return build_pdf(**item)
+
+    before = statistics.median(_time(legacy_build_pdf, batch[: args.single])) * 1000
+    after = statistics.median(_time(build_cold, batch[: args.single])) * 1000
+    print(f"{'radar jamais vu':<28}{before:>9.2f} ms{after:>9.2f} ms{before / after:>7.1f}x")
+
+    t0 = time.perf_counter()
+    for item in batch:
+        legacy_build_pdf(**item)
+    total_before = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for item in batch:
+        build_pdf(**item)
+    total_after = time.perf_counter() - t0
+    print(f"\nlot complet : avant {total_before:.2f} s, après {total_after:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
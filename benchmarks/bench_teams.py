@@ -0,0 +1,64 @@
+# benchmarks/bench_teams.py
+# Constitution de groupes équilibrés (components/team_builder) sur des cohortes synthétiques.
+#
+#   python benchmarks/bench_teams.py --sizes 500 1000 2000 5000 --group 5
+#
+# Compare le coût (écart des groupes au mélange D/I/S/C de la cohorte, 0 = parfait) d'une
+# répartition aléatoire, du placement glouton seul et du glouton + recherche locale.
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from components import team_builder  # noqa: E402
+from components.disc_texts import DIMS  # noqa: E402
+
+
+def make_cohort(n: int, seed: int = 0, missing_every: int = 20):
+    """Scores sur 25 questions, préférences individuelles marquées ; 1 apprenant sur 20 sans résultat."""
+    rng = np.random.default_rng(seed)
+    prefs = rng.dirichlet(np.full(len(DIMS), 0.7), size=n)
+    emails = [f"apprenant{i}@example.com" for i in range(n)]
+    scores = {
+        email: {dim: int(c) for dim, c in zip(DIMS, rng.multinomial(25, prefs[i]))}
+        for i, email in enumerate(emails)
+        if i % missing_every
+    }
+    return emails, scores
+
+
+def random_cost(emails, scores, group_size: int, seed: int = 0) -> float:
+    n = len(emails)
+    m = -(-n // group_size)
+    groups = np.random.default_rng(seed).permutation(np.arange(n) % m)
+    y = team_builder._deviations(emails, scores)
+    dev_sums = np.zeros((m, y.shape[1]))
+    np.add.at(dev_sums, groups, y)
+    return team_builder._cost(dev_sums, np.bincount(groups, minlength=m))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Constitution de groupes : temps et qualité.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 5000])
+    parser.add_argument("--group", type=int, default=5, help="taille des groupes")
+    args = parser.parse_args(argv)
+
+    print(f"{'apprenants':>10}{'groupes':>9}{'aléatoire':>11}{'glouton':>10}{'+ local':>10}{'échanges':>10}{'temps':>9}")
+    for n in args.sizes:
+        emails, scores = make_cohort(n)
+        t0 = time.perf_counter()
+        plan = team_builder.form_teams(emails, scores, args.group)
+        elapsed = time.perf_counter() - t0
+        print(
+            f"{n:>10}{plan.n_groups:>9}{random_cost(emails, scores, args.group):>11.3f}"
+            f"{plan.greedy_cost:>10.3f}{plan.cost:>10.3f}{plan.swaps:>10}{elapsed:>7.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+# benchmarks/load_harness.py
+# Test de charge multi-sessions des pages avec AppTest, services externes remplacés par des stubs.
+#
+#   python benchmarks/load_harness.py --sessions 40 --workers 4
+#   python benchmarks/load_harness.py --sessions 200 --workers 8 --ai-delay 0.3 --json report.json
+#
+# Chaque session simulée parcourt : accueil (jeton + profil) -> Mon espace (saisie, IA, sauvegarde)
+# -> coach carrière (envoi d'un message) -> résultats DISC (PDF + e-mail), et une session sur
+# --coach-every ouvre la boîte de réception coach.
+#
+# AppTest n'est pas utilisable depuis plusieurs threads d'un même process : les sessions
+# concurrentes tournent dans --workers process, qui partagent les fichiers Data/ (SQLite, JSONL),
+# le cache partagé et les serveurs stub, comme plusieurs workers Streamlit sur une machine.
+#
+# Stubs : webhook d'accès / journal (serveur HTTP local), OpenAI (tests/stub_model_server.py,
+# via OPENAI_BASE_URL), Google Sheets (classeur en mémoire par worker), SMTP (smtplib.SMTP factice).
+import argparse
+import json
+import logging
+import os
+import resource
+import shutil
+import smtplib
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from stub_model_server import StubModelServer  # noqa: E402
+
+ACCUEIL = os.path.join(ROOT, "accueil.py")
+RESULTS_PAGE = os.path.join(ROOT, "archives_cachees", "03_Mes-Resultats_et_Plan_action.py")
+COACH_EMAIL = "coach@everboarding.fr"
+TIMEOUT_S = 120
+
+# ============================================================
+# STUBS
+# ============================================================
+
+
+class StubWebhookServer:
+    """Webhook Apps Script : validate_token (jeton "tok-<email>" -> approuvé) et journal d'événements."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.events = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if payload.get("action") == "validate_token":
+                    token = str(payload.get("token", ""))
+                    if token.startswith("tok-"):
+                        resp = {"ok": True, "status": "approved", "email": token[4:]}
+                    else:
+                        resp = {"ok": False, "status": "denied"}
+                else:
+                    with server._lock:
+                        server.events += 1
+                    resp = {"ok": True}
+                body = json.dumps(resp).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/exec"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeWorksheet:
+    def __init__(self, title: str):
+        self.title = title
+        self.rows: List[List] = []
+        self._lock = threading.Lock()
+
+    def get_all_records(self):
+        with self._lock:
+            if not self.rows:
+                return []
+            header = self.rows[0]
+            return [dict(zip(header, r + [""] * (len(header) - len(r)))) for r in self.rows[1:]]
+
+    def get_all_values(self):
+        with self._lock:
+            return [list(r) for r in self.rows]
+
+    def col_values(self, col: int):
+        with self._lock:
+            return [r[col - 1] if len(r) >= col else "" for r in self.rows]
+
+    def append_row(self, row, **kwargs):
+        with self._lock:
+            self.rows.append(list(row))
+            n = len(self.rows)
+        return {"updates": {"updatedRange": f"{self.title}!A{n}:F{n}"}}
+
+    def update(self, values=None, range_name=None, **kwargs):
+        row = int("".join(ch for ch in range_name if ch.isdigit()))
+        with self._lock:
+            self.rows[row - 1] = list(values[0])
+
+    def update_cell(self, row: int, col: int, value):
+        with self._lock:
+            r = self.rows[row - 1]
+            r.extend([""] * (col - len(r)))
+            r[col - 1] = value
+
+    def batch_update(self, data, **kwargs):
+        for item in data:
+            rng = item["range"].split("!")[-1]
+            row = int("".join(ch for ch in rng if ch.isdigit()))
+            col = ord(rng[0].upper()) - ord("A") + 1
+            self.update_cell(row, col, item["values"][0][0])
+
+
+class FakeSpreadsheet:
+    def __init__(self):
+        self.sheets: Dict[str, FakeWorksheet] = {}
+
+    def worksheet(self, title: str):
+        from gspread.exceptions import WorksheetNotFound
+
+        if title not in self.sheets:
+            raise WorksheetNotFound(title)
+        return self.sheets[title]
+
+    def add_worksheet(self, title: str, rows: int = 0, cols: int = 0):
+        self.sheets[title] = FakeWorksheet(title)
+        return self.sheets[title]
+
+
+class FakeSMTP:
+    sent = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def starttls(self, *args, **kwargs):
+        pass
+
+    def login(self, *args, **kwargs):
+        pass
+
+    def send_message(self, msg):
+        FakeSMTP.sent += 1
+
+
+# ============================================================
+# SESSIONS SIMULÉES
+# ============================================================
+
+
+def _secrets(webhook_url: str) -> Dict:
+    return {
+        "ACCESS_WEBHOOK_URL": webhook_url,
+        "ACCESS_WEBHOOK_SECRET": "stub",
+        "OPENAI_API_KEY": "stub",
+        "COACH_EMAILS": [COACH_EMAIL],
+        "email": {
+            "smtp_host": "smtp.stub",
+            "smtp_port": 587,
+            "smtp_username": "stub",
+            "smtp_password": "stub",
+            "from_email": "noreply@stub",
+        },
+    }
+
+
+class Session:
+    """Une session navigateur simulée ; chaque interaction est chronométrée."""
+
+    def __init__(self, secrets: Dict, samples: List[Tuple[str, str, float]]):
+        self.secrets = secrets
+        self.samples = samples
+        self.errors: List[str] = []
+        self.at = None
+
+    def _new(self, path: str, token: Optional[str] = None):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(path, default_timeout=TIMEOUT_S)
+        for k, v in self.secrets.items():
+            at.secrets[k] = v
+        if token:
+            at.query_params["token"] = token
+        return at
+
+    def step(self, page: str, interaction: str, action) -> None:
+        t0 = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            self.errors.append(f"{page}:{interaction}: {e!r}")
+            return
+        self.samples.append((page, interaction, time.perf_counter() - t0))
+        if self.at is not None:
+            for el in list(self.at.exception) + list(self.at.error):
+                self.errors.append(f"{page}:{interaction}: {el.value}")
+
+
+def run_session(n: int, secrets: Dict, samples: List, coach: bool) -> List[str]:
+    email = f"apprenant{n}@cohorte.fr"
+    s = Session(secrets, samples)
+
+    # --- accueil ---
+    s.at = s._new(ACCUEIL, token=f"tok-{email}")
+    s.step("accueil", "open", lambda: s.at.run())
+    s.step("accueil", "save_profile", lambda: (
+        s.at.text_input[0].input(f"Prénom{n}"),
+        s.at.text_input[1].input(f"Nom{n}"),
+        s.at.button[0].click().run(),
+    ))
+
+    # --- Mon espace ---
+    s.step("mon_espace", "open", lambda: (s.at.switch_page("pages/01_Mon_espace.py"), s.at.run()))
+    s.step("mon_espace", "type_ambition", lambda: s.at.text_input(key="ambition_courte").input("devenir chef de projet").run())
+    for i in range(1, 6):
+        s.step("mon_espace", "type_why", lambda i=i: s.at.text_input(key=f"why{i}").input(f"raison {i} de {n}").run())
+    s.step("mon_espace", "motivation_ia", lambda: _click(s.at, "motivation profonde").run())
+    s.step("mon_espace", "type_objectif", lambda: s.at.text_input(key="objectif_principal").input("piloter un projet").run())
+    s.step("mon_espace", "kpi_ia", lambda: _click(s.at, "KPI").run())
+    s.step("mon_espace", "save", lambda: _click(s.at, "Sauvegarder").run())
+
+    # --- coach carrière ---
+    def _open_coach():
+        s.at.session_state["user_id"] = email
+        s.at.switch_page("pages/20_Mon_coach_carriere.py")
+        s.at.run()
+
+    s.step("coach", "open", _open_coach)
+    s.step("coach", "send_message", lambda: (
+        s.at.text_area[0].input(f"Question de la session {n}"),
+        s.at.button[0].click().run(),
+    ))
+
+    # --- résultats DISC (page archivée, ouverte directement) ---
+    results = s._new(RESULTS_PAGE)
+    results.session_state["email"] = email
+    s.at = results
+    s.step("resultats", "open", lambda: results.run())
+    s.step("resultats", "pdf_email", lambda: _click(results, "PDF").run())
+
+    # --- boîte de réception coach ---
+    if coach:
+        s.at = s._new(os.path.join(ROOT, "pages", "21_Boite_de_reception_coach.py"), token=f"tok-{COACH_EMAIL}")
+        s.step("coach_inbox", "open", lambda: s.at.run())
+    return s.errors
+
+
+def _click(at, label_part: str):
+    for b in at.button:
+        if label_part.lower() in (b.label or "").lower():
+            return b.click()
+    raise LookupError(f"bouton « {label_part} » introuvable")
+
+
+def seed_data(workdir: str, sessions: int) -> None:
+    """Data/ de travail isolé : copie des fichiers du dépôt + une session DISC par apprenant simulé."""
+    shutil.copytree(os.path.join(ROOT, "Data"), os.path.join(workdir, "Data"),
+                    ignore=shutil.ignore_patterns("*.sqlite3*", "photos"))
+    log_path = os.path.join(workdir, "Data", "logs", "disc_forced_sessions.jsonl")
+    with open(log_path, "a", encoding="utf-8") as f:
+        for n in range(sessions):
+            scores = {"D": 4 + n % 5, "I": 6, "S": 5 + n % 3, "C": 5}
+            top = sorted(scores, key=scores.get, reverse=True)[:2]
+            f.write(json.dumps({
+                "ts": "2026-01-01T00:00:00Z",
+                "user": f"apprenant{n}@cohorte.fr",
+                "scores": scores,
+                "style": "".join(top),
+                "top_dims": top,
+                "choices": [],
+            }) + "\n")
+    os.makedirs(os.path.join(workdir, ".streamlit"), exist_ok=True)
+    shutil.copy(os.path.join(ROOT, ".streamlit", "config.toml"), os.path.join(workdir, ".streamlit", "config.toml"))
+
+
+def worker(args: Tuple[List[int], str, str, str, int]) -> Dict:
+    """Process worker : exécute ses sessions l'une après l'autre et retourne mesures + RSS max."""
+    session_ids, workdir, webhook_url, openai_url, coach_every = args
+    os.chdir(workdir)
+    os.environ["OPENAI_BASE_URL"] = openai_url
+    from streamlit import logger as st_logger
+
+    st_logger.set_log_level(logging.ERROR)
+
+    from components import sheets_client
+
+    spreadsheet = FakeSpreadsheet()
+    sheets_client.get_spreadsheet = lambda: spreadsheet
+    smtplib.SMTP = FakeSMTP
+
+    samples: List[Tuple[str, str, float]] = []
+    errors: List[str] = []
+    secrets = _secrets(webhook_url)
+    for n in session_ids:
+        errors.extend(run_session(n, secrets, samples, coach=coach_every > 0 and n % coach_every == 0))
+    return {
+        "samples": samples,
+        "errors": errors,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "emails_sent": FakeSMTP.sent,
+    }
+
+
+# ============================================================
+# RAPPORT
+# ============================================================
+
+
+def _pct(values: List[float], p: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def summarize(samples: List[Tuple[str, str, float]]) -> List[Dict]:
+    groups: Dict[Tuple[str, str], List[float]] = {}
+    for page, interaction, seconds in samples:
+        groups.setdefault((page, interaction), []).append(seconds)
+    rows = []
+    for (page, interaction), values in groups.items():
+        values.sort()
+        rows.append({
+            "page": page,
+            "interaction": interaction,
+            "n": len(values),
+            "p50_ms": round(_pct(values, 0.50) * 1000, 1),
+            "p95_ms": round(_pct(values, 0.95) * 1000, 1),
+            "p99_ms": round(_pct(values, 0.99) * 1000, 1),
+            "max_ms": round(values[-1] * 1000, 1),
+        })
+    return rows
+
+
+def run(sessions: int, workers: int, ai_delay_s: float = 0.0, coach_every: int = 10) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="everinsight_load_")
+    seed_data(workdir, sessions)
+    chunks = [list(range(i, sessions, workers)) for i in range(workers)]
+    t0 = time.perf_counter()
+    with StubWebhookServer() as webhook, StubModelServer(delay_s=ai_delay_s) as model:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                worker, [(c, workdir, webhook.url, model.base_url, coach_every) for c in chunks if c]
+            ))
+        ai_calls, events = len(model.requests), webhook.events
+    elapsed = time.perf_counter() - t0
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    samples = [s for r in results for s in r["samples"]]
+    return {
+        "sessions": sessions,
+        "workers": workers,
+        "elapsed_s": round(elapsed, 2),
+        "interactions": summarize(samples),
+        "peak_rss_mb": max(r["peak_rss_kb"] for r in results) / 1024,
+        "peak_rss_mb_per_worker": [round(r["peak_rss_kb"] / 1024, 1) for r in results],
+        "ai_calls": ai_calls,
+        "webhook_events": events,
+        "emails_sent": sum(r["emails_sent"] for r in results),
+        "errors": [e for r in results for e in r["errors"]],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Test de charge multi-sessions (AppTest + stubs).")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ai-delay", type=float, default=0.0, help="latence simulée de l'API OpenAI (s)")
+    parser.add_argument("--coach-every", type=int, default=10, help="une session sur N ouvre la boîte coach (0 : jamais)")
+    parser.add_argument("--json", metavar="PATH", help="écrit aussi le rapport complet en JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.sessions, max(1, args.workers), args.ai_delay, args.coach_every)
+
+    print(f"{report['sessions']} sessions, {report['workers']} workers, {report['elapsed_s']} s")
+    print(f"{'page':<14}{'interaction':<16}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for r in report["interactions"]:
+        print(f"{r['page']:<14}{r['interaction']:<16}{r['n']:>6}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['max_ms']:>10}")
+    print(f"RSS max : {report['peak_rss_mb']:.1f} Mo (par worker : {report['peak_rss_mb_per_worker']})")
+    print(f"Appels IA : {report['ai_calls']}  événements webhook : {report['webhook_events']}  e-mails : {report['emails_sent']}")
+    if report["errors"]:
+        print(f"{len(report['errors'])} erreur(s), par ex. :")
+        for e in report["errors"][:10]:
+            print("  -", e)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
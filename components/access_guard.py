@@ -1,3 +1,4 @@
+import hashlib
 import json
 import urllib.request
 import urllib.error
@@ -5,6 +6,13 @@ from typing import Optional, Dict, Any, Tuple
 
 import streamlit as st
 
+from components.cache import get_shared_cache
+from components.event_sink import record_event
+
+# Approved validations are reused by every worker for this long
+# (a revoked link therefore keeps working for at most TOKEN_CACHE_TTL_S seconds)
+TOKEN_CACHE_TTL_S = 600
+
 
 def _post_json(url: str, payload: Dict[str, Any], timeout: int = 12) -> Tuple[bool, Dict[str, Any]]:
     try:
@@ -70,7 +78,34 @@ def validate_token_via_webhook(token: str) -> Tuple[bool, Dict[str, Any]]:
     return False, resp
 
 
+def validate_token_cached(token: str) -> Tuple[bool, Dict[str, Any]]:
+    """
+    validate_token_via_webhook behind the cross-process cache.
+    Only approvals are cached: a rejected link is checked again on every load.
+    The cache key is a hash of the token, never the token itself.
+    """
+    key = "token:" + hashlib.sha256(token.encode("utf-8")).hexdigest()
+    try:
+        cache = get_shared_cache()
+        cached = cache.get(key)
+    except Exception:
+        cache, cached = None, None
+    if cached is not None:
+        return True, cached
+
+    ok, resp = validate_token_via_webhook(token)
+    if ok and cache is not None:
+        try:
+            cache.set(key, resp, ttl_s=TOKEN_CACHE_TTL_S)
+        except Exception:
+            pass
+    return ok, resp
+
+
 def log_event_via_webhook(email: str, event: str, page: str = "", payload: Optional[Dict[str, Any]] = None) -> None:
+    # Local copy first (date-partitioned JSONL, read by components/event_rollup)
+    record_event(email, event, page, payload)
+
     url = (st.secrets.get("ACCESS_WEBHOOK_URL") or "").strip()
     if not url:
         return
@@ -93,6 +128,25 @@ def log_event_via_webhook(email: str, event: str, page: str = "", payload: Optio
     )
 
 
+def log_page_open(email: str, page_name: str = "", payload: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Logs `app_open` once per session per page (also for pages that don't call enforce_access).
+    Nothing is logged (nor marked as logged) until the email is known: the rollups drop anonymous
+    opens, so the page is logged on the first run that has the email.
+    """
+    if not (email or "").strip():
+        return
+    key = f"logged_open__{page_name or 'unknown'}"
+    if key not in st.session_state:
+        log_event_via_webhook(
+            email=email,
+            event="app_open",
+            page=page_name or "",
+            payload=payload or {},
+        )
+        st.session_state[key] = True
+
+
 def enforce_access(portal_url: str, page_name: str = "") -> Dict[str, str]:
     """
     HARD RULE:
@@ -109,9 +163,9 @@ def enforce_access(portal_url: str, page_name: str = "") -> Dict[str, str]:
             msg="Pour tester l’application, l’accès se fait via EVERBOARDING (invitation / freemium).",
         )
 
-    # Always validate on each page load (simple & safe)
+    # Validated on each page load; approvals are shared by all workers for TOKEN_CACHE_TTL_S
     with st.spinner("Vérification de l’accès..."):
-        ok, resp = validate_token_via_webhook(token)
+        ok, resp = validate_token_cached(token)
 
     if not ok:
         deny_access(
@@ -121,16 +175,27 @@ def enforce_access(portal_url: str, page_name: str = "") -> Dict[str, str]:
         )
 
     email = (resp.get("email") or "").strip().lower()
-
-    # Log once per session per page
-    key = f"logged_open__{page_name or 'unknown'}"
-    if key not in st.session_state:
-        log_event_via_webhook(
-            email=email,
-            event="app_open",
-            page=page_name or "",
-            payload={"token_present": True},
-        )
-        st.session_state[key] = True
+    log_page_open(email, page_name, payload={"token_present": True})
 
     return {"email": email}
+
+
+def admin_emails() -> set:
+    return {str(e).strip().lower() for e in (st.secrets.get("ADMIN_EMAILS") or [])}
+
+
+def is_admin(email: Optional[str]) -> bool:
+    email = (email or "").strip().lower()
+    return bool(email) and email in admin_emails()
+
+
+def require_admin(portal_url: str, page_name: str = "") -> Dict[str, str]:
+    """
+    enforce_access, then stops the page unless the approved email is in the ADMIN_EMAILS secret.
+    Returns: {"email": "..."} (admin email)
+    """
+    access = enforce_access(portal_url=portal_url, page_name=page_name)
+    if not is_admin(access.get("email")):
+        st.warning("🔒 Cette page est réservée aux administrateurs.")
+        st.stop()
+    return access
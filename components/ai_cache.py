@@ -0,0 +1,172 @@
+# components/ai_cache.py
+# Cache disque des textes générés par l'IA ; les appels identiques simultanés sont regroupés (SingleFlight)
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from components.concurrency import SingleFlight, process_singleton
+from components.sqlite_db import DATA_DIR, connect
+
+AI_CACHE_DB_PATH = os.path.join(DATA_DIR, "ai_cache.sqlite3")
+
+DEFAULT_TTL_S = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key          TEXT PRIMARY KEY,
+    value        TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    created_at   REAL NOT NULL,
+    last_access  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+"""
+
+
+def normalize_inputs(inputs: Dict[str, Any]) -> Dict[str, str]:
+    """Espaces superflus retirés, None -> "" : deux saisies équivalentes donnent la même clé."""
+    return {k: " ".join(str(v if v is not None else "").split()) for k, v in sorted(inputs.items())}
+
+
+def make_key(model: str, template_version: str, inputs: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"model": model, "template": template_version, "inputs": normalize_inputs(inputs)},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Textes générés, persistés dans SQLite (partagé entre process),
+    avec expiration (TTL) et éviction LRU bornée en nombre d'entrées et en octets.
+    """
+
+    def __init__(
+        self,
+        path: str = AI_CACHE_DB_PATH,
+        ttl_s: float = DEFAULT_TTL_S,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._flight = SingleFlight()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row["created_at"] > self.ttl_s:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        return row["value"]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_s,))
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Les moins récemment utilisées d'abord
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access"
+        ).fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> Tuple[str, bool]:
+        """
+        Retourne (texte, depuis_le_cache).
+        Un seul appel à `compute` par clé à la fois dans le process ; les erreurs ne sont pas mises en cache.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        computed = []
+
+        def _leader() -> str:
+            # Un autre process a pu remplir le cache entre-temps
+            again = self.get(key)
+            if again is not None:
+                return again
+            value = compute()
+            computed.append(True)
+            self.set(key, value)
+            return value
+
+        value, _shared = self._flight.do(key, _leader)
+        return value, not computed
+
+    def stream_or_compute(self, key: str, stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """
+        Version streaming de get_or_compute : un hit est rendu en un seul morceau,
+        sinon les morceaux sont relayés au fil de l'eau puis le texte complet est mis en cache.
+        Les appels identiques concurrents attendent le texte complet du premier.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        call, leader = self._flight.acquire(key)
+        if not leader:
+            yield SingleFlight.wait(call)
+            return
+
+        parts = []
+        try:
+            for chunk in stream():
+                parts.append(chunk)
+                yield chunk
+        except GeneratorExit:
+            # Abandon côté appelant (navigation, rerun) : rien n'est mis en cache
+            self._flight.release(key, call, error=RuntimeError("génération interrompue"))
+            raise
+        except BaseException as e:
+            self._flight.release(key, call, error=e)
+            raise
+        value = "".join(parts).strip()
+        if value:
+            self.set(key, value)
+        self._flight.release(key, call, result=value)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+
+@process_singleton
+def get_cache() -> ResponseCache:
+    return ResponseCache()
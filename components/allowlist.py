@@ -0,0 +1,153 @@
+# components/allowlist.py
+# Liste des apprenants autorisés (CSV de cohortes) : index en mémoire, rechargé quand un fichier change
+import csv
+import glob
+import itertools
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from components.concurrency import process_singleton
+from components.profile_store import normalize_email
+from components.sqlite_db import DATA_DIR
+
+DEFAULT_SOURCES = (
+    os.path.join(DATA_DIR, "profils_etudiants.csv"),
+    os.path.join(DATA_DIR, "cohortes", "*.csv"),
+)
+CHECK_INTERVAL_S = 2.0  # fréquence max des stat() sur les fichiers sources
+
+_snapshot_versions = itertools.count(1)
+
+
+def read_emails(csv_path: str) -> List[str]:
+    """Emails normalisés d'un CSV (colonne "email", sinon la première colonne)."""
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return []
+    header = [h.strip().lower() for h in rows[0]]
+    if "email" in header:
+        col, body = header.index("email"), rows[1:]
+    else:
+        col, body = 0, rows
+    emails = []
+    for row in body:
+        email = normalize_email(row[col]) if len(row) > col else ""
+        if email:
+            emails.append(email)
+    return emails
+
+
+def cohort_name(csv_path: str) -> str:
+    return os.path.splitext(os.path.basename(csv_path))[0]
+
+
+class _Snapshot:
+    """Index figé : les lecteurs l'utilisent sans verrou, un rechargement en publie un nouveau."""
+
+    def __init__(self, mtimes: Dict[str, float], cohort_by_email: Dict[str, str], counts: Dict[str, int]):
+        self.mtimes = mtimes
+        self.cohort_by_email = cohort_by_email
+        self.counts = counts
+        self.emails: FrozenSet[str] = frozenset(cohort_by_email)
+        self.version = next(_snapshot_versions)
+
+
+class Allowlist:
+    """
+    Emails autorisés, indexés par cohorte (une cohorte = un fichier CSV).
+    Un email présent dans plusieurs fichiers est rattaché au premier (ordre alphabétique des chemins).
+    """
+
+    def __init__(self, sources: Iterable[str] = DEFAULT_SOURCES, check_interval_s: float = CHECK_INTERVAL_S):
+        self.sources = list(sources)
+        self.check_interval_s = check_interval_s
+        self._reload_lock = threading.Lock()
+        self._next_check = 0.0
+        self._snapshot = self._build(self._stat())
+
+    def _paths(self) -> List[str]:
+        paths = set()
+        for src in self.sources:
+            paths.update(glob.glob(src) if glob.has_magic(src) else [src])
+        return sorted(p for p in paths if os.path.isfile(p))
+
+    def _stat(self) -> Dict[str, float]:
+        mtimes = {}
+        for path in self._paths():
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return mtimes
+
+    @staticmethod
+    def _build(mtimes: Dict[str, float]) -> _Snapshot:
+        cohort_by_email: Dict[str, str] = {}
+        counts: Dict[str, int] = {}
+        for path in sorted(mtimes):
+            cohort = cohort_name(path)
+            try:
+                emails = read_emails(path)
+            except (OSError, UnicodeDecodeError, csv.Error):
+                continue
+            for email in emails:
+                if email not in cohort_by_email:
+                    cohort_by_email[email] = cohort
+                    counts[cohort] = counts.get(cohort, 0) + 1
+        return _Snapshot(mtimes, cohort_by_email, counts)
+
+    def _current(self) -> _Snapshot:
+        """
+        Snapshot à jour. Un seul thread vérifie / recharge à la fois ; pendant ce temps
+        les autres lecteurs continuent avec le snapshot précédent au lieu d'attendre.
+        """
+        now = time.monotonic()
+        if now >= self._next_check and self._reload_lock.acquire(blocking=False):
+            try:
+                self._next_check = now + self.check_interval_s
+                mtimes = self._stat()
+                if mtimes != self._snapshot.mtimes:
+                    self._snapshot = self._build(mtimes)
+            finally:
+                self._reload_lock.release()
+        return self._snapshot
+
+    def reload(self) -> None:
+        """Rechargement immédiat (sans attendre l'intervalle de vérification)."""
+        with self._reload_lock:
+            self._snapshot = self._build(self._stat())
+            self._next_check = time.monotonic() + self.check_interval_s
+
+    @property
+    def version(self) -> int:
+        """Change à chaque rechargement : les index dérivés des cohortes savent quand se reconstruire."""
+        return self._current().version
+
+    def lookup(self, email: Optional[str]) -> bool:
+        return normalize_email(email) in self._current().emails
+
+    __contains__ = lookup
+
+    def cohort_of(self, email: Optional[str]) -> Optional[str]:
+        return self._current().cohort_by_email.get(normalize_email(email))
+
+    def count(self, cohort: Optional[str] = None) -> int:
+        snap = self._current()
+        if cohort is None:
+            return len(snap.emails)
+        return snap.counts.get(cohort, 0)
+
+    def cohorts(self) -> List[Tuple[str, int]]:
+        return sorted(self._current().counts.items())
+
+    def members(self, cohort: str) -> List[str]:
+        """Emails de la cohorte, triés."""
+        return sorted(e for e, c in self._current().cohort_by_email.items() if c == cohort)
+
+
+@process_singleton
+def get_allowlist() -> Allowlist:
+    return Allowlist()
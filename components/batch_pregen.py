@@ -0,0 +1,208 @@
+# components/batch_pregen.py
+# Pré-génération des textes du coach IA pour une cohorte, avant la session live.
+#
+#   python -m components.batch_pregen --cohort Data/profils_etudiants.csv --parallel 4
+#   python -m components.batch_pregen --export-batch batch.jsonl      # API Batch d'OpenAI
+#   python -m components.batch_pregen --import-batch batch_output.jsonl
+#
+# Les textes sont écrits dans le cache de génération (Data/ai_cache.sqlite3) : quand
+# l'apprenant clique sur le bouton, le texte est servi immédiatement depuis le cache.
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from components import coach_ia
+from components.ai_cache import ResponseCache, get_cache, make_key
+from components.allowlist import read_emails
+from components.espace_store import EspaceState, EspaceStore, get_store
+from components.openai_gateway import CALL_TIMEOUT_S, OpenAIGateway
+
+DEFAULT_PARALLELISM = 4
+
+
+@dataclass
+class PregenJob:
+    email: str
+    kind: str  # "motivation" | "kpi"
+    key: str
+    prompt: str
+
+
+def jobs_for_entry(email: str, data: Dict) -> List[PregenJob]:
+    """Mêmes entrées et mêmes prompts que les boutons de la page Mon espace (via EspaceState)."""
+    jobs = []
+    etat = EspaceState.from_session(data)
+    if etat.ambition_courte and etat.why5:
+        donnees = coach_ia.motivation_inputs(etat.ambition_courte, *etat.whys)
+        jobs.append(
+            PregenJob(
+                email,
+                "motivation",
+                make_key(coach_ia.MODEL, coach_ia.MOTIVATION_TEMPLATE_VERSION, donnees),
+                coach_ia.build_motivation_prompt(donnees),
+            )
+        )
+    if etat.objectif_principal:
+        donnees = coach_ia.kpi_inputs(
+            etat.ambition_courte,
+            etat.objectif_principal,
+            etat.sous_objectif_1,
+            etat.sous_objectif_2,
+            etat.horizon_mois,
+            etat.horizon_annee_txt,
+        )
+        jobs.append(
+            PregenJob(
+                email,
+                "kpi",
+                make_key(coach_ia.MODEL, coach_ia.KPI_TEMPLATE_VERSION, donnees),
+                coach_ia.build_kpi_prompt(donnees),
+            )
+        )
+    return jobs
+
+
+def collect_jobs(store: EspaceStore, emails: Optional[Iterable[str]] = None) -> List[PregenJob]:
+    jobs = []
+    for email in (emails if emails is not None else store.emails()):
+        jobs.extend(jobs_for_entry(email, store.load(email)))
+    return jobs
+
+
+def run_jobs(
+    jobs: List[PregenJob],
+    client,
+    cache: ResponseCache,
+    parallelism: int = DEFAULT_PARALLELISM,
+) -> Dict[str, int]:
+    """Soumet les jobs absents du cache, `parallelism` appels au plus en même temps."""
+    gateway = OpenAIGateway(max_concurrent=parallelism, queue_timeout_s=3600)
+    report = {"jobs": len(jobs), "generated": 0, "cached": 0, "failed": 0}
+
+    def _run(job: PregenJob) -> bool:
+        _texte, from_cache = cache.get_or_compute(
+            job.key, lambda: coach_ia._call_model(client, job.prompt, gateway=gateway)
+        )
+        return from_cache
+
+    with ThreadPoolExecutor(max_workers=parallelism) as pool:
+        futures = {pool.submit(_run, job): job for job in jobs}
+        for fut in as_completed(futures):
+            try:
+                report["cached" if fut.result() else "generated"] += 1
+            except Exception:
+                report["failed"] += 1
+    return report
+
+
+# ============================================================
+# Variante API Batch (fichier JSONL soumis puis relu)
+# ============================================================
+
+def export_batch_file(jobs: List[PregenJob], path: str, cache: ResponseCache) -> int:
+    """Écrit les requêtes absentes du cache au format d'entrée de l'API Batch (/v1/responses)."""
+    n = 0
+    seen = set()
+    with open(path, "w", encoding="utf-8") as f:
+        for job in jobs:
+            if job.key in seen or cache.get(job.key) is not None:
+                continue
+            seen.add(job.key)
+            line = {
+                "custom_id": job.key,
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": {
+                    "model": coach_ia.MODEL,
+                    "input": job.prompt,
+                    "max_output_tokens": coach_ia.MAX_OUTPUT_TOKENS,
+                },
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            n += 1
+    return n
+
+
+def _output_text(body: Dict) -> str:
+    for item in body.get("output") or []:
+        for content in item.get("content") or []:
+            if content.get("type") == "output_text" and content.get("text"):
+                return content["text"]
+    return ""
+
+
+def import_batch_results(path: str, cache: ResponseCache) -> Dict[str, int]:
+    """Relit le fichier de sortie de l'API Batch et remplit le cache (custom_id = clé de cache)."""
+    report = {"imported": 0, "failed": 0}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+                texte = _output_text(((rec.get("response") or {}).get("body")) or {}).strip()
+            except (ValueError, AttributeError):
+                texte = ""
+                rec = {}
+            if rec.get("custom_id") and texte:
+                cache.set(rec["custom_id"], texte)
+                report["imported"] += 1
+            else:
+                report["failed"] += 1
+    return report
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def _make_client(base_url: Optional[str], api_key: Optional[str]):
+    if coach_ia.OpenAI is None:
+        raise SystemExit("Le module openai n'est pas installé (pip install openai).")
+    api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    if not base_url and not api_key:
+        client = coach_ia.get_openai_client()
+        if client is None:
+            raise SystemExit("OPENAI_API_KEY introuvable (variable d'environnement ou secrets.toml).")
+        return client
+    return coach_ia.OpenAI(
+        api_key=api_key or "stub",
+        base_url=base_url,
+        timeout=CALL_TIMEOUT_S,
+        max_retries=0,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pré-génère les textes du coach IA pour une cohorte.")
+    parser.add_argument("--cohort", help="CSV avec une colonne email (ex : Data/profils_etudiants.csv)")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLELISM)
+    parser.add_argument("--base-url", help="URL d'un serveur compatible OpenAI (ex : stub local)")
+    parser.add_argument("--api-key")
+    parser.add_argument("--export-batch", metavar="JSONL", help="écrit le fichier d'entrée de l'API Batch")
+    parser.add_argument("--import-batch", metavar="JSONL", help="importe le fichier de sortie de l'API Batch")
+    args = parser.parse_args(argv)
+
+    cache = get_cache()
+    if args.import_batch:
+        print(import_batch_results(args.import_batch, cache))
+        return
+
+    emails = read_emails(args.cohort) if args.cohort else None
+    jobs = collect_jobs(get_store(), emails)
+
+    if args.export_batch:
+        n = export_batch_file(jobs, args.export_batch, cache)
+        print({"jobs": len(jobs), "exported": n})
+        return
+
+    client = _make_client(args.base_url, args.api_key)
+    print(run_jobs(jobs, client, cache, parallelism=max(1, args.parallel)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# components/blob_store.py
+# Gros contenus binaires (PNG, PDF…) sur disque, rangés par empreinte :
+# la session ne garde qu'une petite référence (BlobRef) au lieu de mégaoctets de bytes
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, MutableMapping, Optional
+
+import streamlit as st
+
+from components.concurrency import process_singleton
+from components.sqlite_db import DATA_DIR
+
+BLOBS_DIR = os.path.join(DATA_DIR, "blobs")
+BLOBS_MAX_BYTES = 512 * 1024 * 1024
+BLOB_TTL_S = 24 * 3600.0  # au-delà, un blob non relu est supprimé (sessions expirées)
+GC_INTERVAL_S = 300.0
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    """Référence stockée dans st.session_state à la place des bytes."""
+
+    digest: str
+    size: int
+    mime: str = "application/octet-stream"
+
+
+class BlobStore:
+    """
+    Fichiers immuables adressés par sha256 : deux sessions qui produisent le même PDF
+    partagent un seul fichier, et l'écriture est atomique (tmp + os.replace).
+    Taille totale bornée : les blobs les moins récemment lus sont supprimés en premier.
+    """
+
+    def __init__(self, root: str = BLOBS_DIR, max_bytes: int = BLOBS_MAX_BYTES, ttl_s: float = BLOB_TTL_S):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._next_gc = 0.0
+
+    def path(self, ref: BlobRef) -> str:
+        return os.path.join(self.root, ref.digest[:2], ref.digest)
+
+    def put(self, data: bytes, mime: str = "application/octet-stream") -> BlobRef:
+        ref = BlobRef(hashlib.sha256(data).hexdigest(), len(data), mime)
+        path = self.path(ref)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self._maybe_gc()
+        return ref
+
+    def get(self, ref: Optional[BlobRef]) -> Optional[bytes]:
+        """Contenu du blob, ou None s'il a été supprimé entre-temps."""
+        if ref is None:
+            return None
+        path = self.path(ref)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # mtime = dernier accès, utilisé par gc()
+        except OSError:
+            return None
+        return data
+
+    def _maybe_gc(self) -> None:
+        now = time.monotonic()
+        if now >= self._next_gc and self._lock.acquire(blocking=False):
+            try:
+                self._next_gc = now + GC_INTERVAL_S
+                self.gc()
+            finally:
+                self._lock.release()
+
+    def gc(self) -> int:
+        """Supprime les blobs expirés puis les plus anciens au-delà de max_bytes ; retourne le nombre supprimé."""
+        entries = []
+        for folder, _dirs, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(folder, name)
+                try:
+                    st_ = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st_.st_mtime, st_.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - self.ttl_s
+        removed = 0
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+@process_singleton
+def get_blob_store() -> BlobStore:
+    return BlobStore()
+
+
+def put_session_blob(
+    key: str,
+    data: bytes,
+    mime: str = "application/octet-stream",
+    state: Optional[MutableMapping[str, Any]] = None,
+) -> BlobRef:
+    """Écrit `data` dans le blob store et range sa référence sous `key` dans la session."""
+    state = state if state is not None else st.session_state
+    ref = get_blob_store().put(data, mime)
+    state[key] = ref
+    return ref
+
+
+def get_session_blob(key: str, state: Optional[MutableMapping[str, Any]] = None) -> Optional[bytes]:
+    """Bytes référencés par `key` dans la session (None si absent ou purgé)."""
+    state = state if state is not None else st.session_state
+    value = state.get(key)
+    if isinstance(value, (bytes, bytearray)):  # anciennes sessions : bytes encore en mémoire
+        return bytes(value)
+    if isinstance(value, BlobRef):
+        return get_blob_store().get(value)
+    return None
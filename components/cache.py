@@ -0,0 +1,215 @@
+# components/cache.py
+# Caches clé -> valeur avec expiration (TTL) et éviction LRU :
+# - MemoryCache : propre au process
+# - SharedCache : même API, partagé par les process Streamlit d'une machine (SQLite)
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from components.concurrency import SingleFlight, process_singleton
+from components.sqlite_db import DATA_DIR, connect
+
+DEFAULT_TTL_S = 300.0
+DEFAULT_MAX_ENTRIES = 2048
+
+SHARED_CACHE_DB_PATH = os.path.join(DATA_DIR, "shared_cache.sqlite3")
+SHARED_CACHE_MAX_BYTES = 64 * 1024 * 1024
+TOUCH_INTERVAL_S = 5.0  # last_access n'est réécrit qu'au plus toutes les N s (moins d'écritures)
+
+_MISSING = object()
+
+
+class MemoryCache:
+    """
+    Cache en mémoire, partagé par les sessions du process.
+    get / set / delete / delete_prefix / clear / get_or_set ; ttl_s=None : pas d'expiration.
+    """
+
+    def __init__(self, ttl_s: Optional[float] = DEFAULT_TTL_S, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data: OrderedDict[str, Tuple[Optional[float], Any]] = OrderedDict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_s: Optional[float] = None) -> None:
+        ttl = ttl_s if ttl_s is not None else self.ttl_s
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [k for k in self._data if k.startswith(prefix)]
+            for k in keys:
+                del self._data[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], ttl_s: Optional[float] = None) -> Any:
+        """Valeur en cache, sinon calculée puis mise en cache (None n'est pas mis en cache)."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = compute()
+        if value is not None:
+            self.set(key, value, ttl_s)
+        return value
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key          TEXT PRIMARY KEY,
+    value        BLOB NOT NULL,
+    size         INTEGER NOT NULL,
+    expires_at   REAL,
+    last_access  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache(last_access);
+CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache(expires_at);
+"""
+
+
+class SharedCache:
+    """
+    Même API que MemoryCache, stockée dans SQLite (WAL) : tous les process d'une machine
+    voient les mêmes entrées et les mêmes invalidations.
+    Les valeurs sont sérialisées avec pickle (fichier local à l'app uniquement).
+    Horloge murale (time.time) : les échéances sont comparables d'un process à l'autre.
+    """
+
+    def __init__(
+        self,
+        path: str = SHARED_CACHE_DB_PATH,
+        ttl_s: Optional[float] = DEFAULT_TTL_S,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = SHARED_CACHE_MAX_BYTES,
+    ):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._flight = SingleFlight()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, last_access FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return default
+            if row["expires_at"] is not None and now >= row["expires_at"]:
+                with self._conn:
+                    self._conn.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, now))
+                return default
+            if now - row["last_access"] >= TOUCH_INTERVAL_S:
+                with self._conn:
+                    self._conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+            blob = row["value"]
+        try:
+            return pickle.loads(blob)
+        except Exception:
+            # Entrée illisible (version de code différente) : considérée absente
+            self.delete(key)
+            return default
+
+    def set(self, key: str, value: Any, ttl_s: Optional[float] = None) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        ttl = ttl_s if ttl_s is not None else self.ttl_s
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl if ttl is not None else None, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Les moins récemment utilisées d'abord
+        for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY last_access").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str) -> int:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM cache WHERE key LIKE ? ESCAPE '\\'", (escaped + "%",))
+        return cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], ttl_s: Optional[float] = None) -> Any:
+        """
+        Valeur en cache, sinon calculée puis mise en cache (None n'est pas mis en cache).
+        Un seul calcul par clé à la fois dans le process ; les autres process profitent du résultat.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def _leader() -> Any:
+            again = self.get(key, _MISSING)
+            if again is not _MISSING:
+                return again
+            result = compute()
+            if result is not None:
+                self.set(key, result, ttl_s)
+            return result
+
+        value, _shared = self._flight.do(key, _leader)
+        return value
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0])
+
+
+@process_singleton
+def get_shared_cache() -> SharedCache:
+    """Les autres process voient les mêmes entrées, via le fichier."""
+    return SharedCache()
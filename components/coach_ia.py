@@ -0,0 +1,304 @@
+# components/coach_ia.py
+# Coach IA de "Mon espace" : prompts, appels OpenAI (avec cache) et fallbacks sans IA
+import threading
+from typing import Callable, Iterator, Optional, Tuple
+
+import streamlit as st
+
+from components.ai_cache import ResponseCache, get_cache, make_key
+from components.openai_gateway import CALL_TIMEOUT_S, OpenAIGateway, get_gateway, make_client
+
+# Essayez d'importer OpenAI, sans faire planter l'app si le module n'est pas installé
+try:
+    from openai import OpenAI
+except ImportError:
+    OpenAI = None
+
+MODEL = "gpt-4.1-mini"
+MAX_OUTPUT_TOKENS = 300
+
+# À incrémenter à chaque modification d'un prompt : invalide les réponses en cache
+MOTIVATION_TEMPLATE_VERSION = "motivation-v1"
+KPI_TEMPLATE_VERSION = "kpi-v1"
+
+# ============================================================
+# OUTILS IA
+# ============================================================
+
+_client_lock = threading.Lock()
+_client = None
+_client_api_key = None
+
+
+def get_openai_client():
+    """
+    Retourne le client OpenAI partagé par le process (pool de connexions),
+    construit à partir de st.secrets, ou None si non dispo.
+    """
+    global _client, _client_api_key
+    if OpenAI is None:
+        return None
+
+    api_key = st.secrets.get("OPENAI_API_KEY", None)
+    if not api_key:
+        return None
+
+    with _client_lock:
+        if _client is None or _client_api_key != api_key:
+            try:
+                _client = make_client(OpenAI, api_key)
+                _client_api_key = api_key
+            except Exception:
+                return None
+        return _client
+
+
+def motivation_inputs(ambition, why1, why2, why3, why4, why5) -> dict:
+    return {
+        "ambition": ambition or "",
+        "pourquoi_1": why1 or "",
+        "pourquoi_2": why2 or "",
+        "pourquoi_3": why3 or "",
+        "pourquoi_4": why4 or "",
+        "pourquoi_5": why5 or "",
+    }
+
+
+def build_motivation_prompt(donnees: dict) -> str:
+    return f"""
+Tu es un coach carrière qui écrit en français simple, fluide et positif.
+
+Je te donne l'ambition d'une personne et jusqu'à 5 réponses successives à la question
+"Pourquoi ?". Les réponses peuvent contenir des fautes ou être mal structurées.
+
+Ta mission :
+- corriger les fautes,
+- reformuler pour que ce soit fluide,
+- écrire un seul paragraphe de 4 à 6 phrases,
+- garder le sens global,
+- finir par une phrase du type : "C'est pour toutes ces raisons que je souhaite <ambition>."
+
+Ne fais pas de liste, pas de titres, pas de guillemets, pas de commentaire.
+
+Données :
+{donnees}
+"""
+
+
+def kpi_inputs(ambition, objectif, sous1, sous2, horizon_mois, horizon_annee) -> dict:
+    horizon_txt = ""
+    if horizon_mois or horizon_annee:
+        horizon_txt = f"{horizon_mois} {horizon_annee}".strip()
+
+    return {
+        "ambition": ambition or "",
+        "objectif_principal": objectif or "",
+        "sous_objectif_1": sous1 or "",
+        "sous_objectif_2": sous2 or "",
+        "horizon": horizon_txt,
+    }
+
+
+def build_kpi_prompt(donnees: dict) -> str:
+    return f"""
+Tu es un coach professionnel spécialisé en objectifs et en suivi de progrès.
+
+Je te donne l'ambition et l'objectif d'une personne, éventuellement des sous-objectifs,
+et un horizon de temps (mois/année).
+
+Ta mission :
+- proposer 3 à 5 critères de succès concrets (KPI ou indicateurs),
+- adaptés à l'objectif,
+- formulés en français simple,
+- au format texte libre (pas de puces markdown, pas de numérotation, pas de tableau),
+- dans un seul paragraphe ou plusieurs phrases courtes séparées par des points.
+
+Données :
+{donnees}
+"""
+
+
+def _call_model(client, prompt: str, gateway: Optional[OpenAIGateway] = None) -> str:
+    gateway = gateway if gateway is not None else get_gateway()
+    response = gateway.call(
+        lambda: client.responses.create(
+            model=MODEL,
+            input=prompt,
+            max_output_tokens=MAX_OUTPUT_TOKENS,
+            timeout=CALL_TIMEOUT_S,
+        )
+    )
+
+    texte = response.output[0].content[0].text
+    return texte.strip()
+
+
+def _generate(template_version: str, donnees: dict, prompt: str, client, cache: Optional[ResponseCache]) -> str:
+    cache = cache if cache is not None else get_cache()
+    key = make_key(MODEL, template_version, donnees)
+
+    def _compute() -> str:
+        c = client or get_openai_client()
+        if c is None:
+            raise RuntimeError("Client OpenAI non disponible")
+        return _call_model(c, prompt)
+
+    texte, _from_cache = cache.get_or_compute(key, _compute)
+    return texte
+
+
+def _stream_model(client, prompt: str, gateway: Optional[OpenAIGateway] = None) -> Iterator[str]:
+    """Morceaux de texte de l'API Responses en mode stream (événements output_text.delta)."""
+    gateway = gateway if gateway is not None else get_gateway()
+    opened = []
+
+    def _open():
+        stream = client.responses.create(
+            model=MODEL,
+            input=prompt,
+            max_output_tokens=MAX_OUTPUT_TOKENS,
+            stream=True,
+            timeout=CALL_TIMEOUT_S,
+        )
+        opened.append(stream)
+        return stream
+
+    events = gateway.stream(_open)
+    try:
+        for event in events:
+            event_type = getattr(event, "type", "")
+            if event_type == "response.output_text.delta":
+                yield event.delta
+            elif event_type in ("response.failed", "response.incomplete", "error"):
+                raise RuntimeError(f"Génération interrompue par l'API ({event_type})")
+    finally:
+        # Libère la place et ferme la connexion HTTP si l'appelant abandonne en cours de route
+        events.close()
+        for stream in opened:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+
+def _stream(template_version: str, donnees: dict, prompt: str, client, cache: Optional[ResponseCache]) -> Iterator[str]:
+    cache = cache if cache is not None else get_cache()
+    key = make_key(MODEL, template_version, donnees)
+
+    def _open() -> Iterator[str]:
+        c = client or get_openai_client()
+        if c is None:
+            raise RuntimeError("Client OpenAI non disponible")
+        return _stream_model(c, prompt)
+
+    return cache.stream_or_compute(key, _open)
+
+
+def stream_motivation_ia(ambition, why1, why2, why3, why4, why5, client=None, cache: Optional[ResponseCache] = None) -> Iterator[str]:
+    donnees = motivation_inputs(ambition, why1, why2, why3, why4, why5)
+    return _stream(MOTIVATION_TEMPLATE_VERSION, donnees, build_motivation_prompt(donnees), client, cache)
+
+
+def stream_kpi_ia(ambition, objectif, sous1, sous2, horizon_mois, horizon_annee, client=None, cache: Optional[ResponseCache] = None) -> Iterator[str]:
+    donnees = kpi_inputs(ambition, objectif, sous1, sous2, horizon_mois, horizon_annee)
+    return _stream(KPI_TEMPLATE_VERSION, donnees, build_kpi_prompt(donnees), client, cache)
+
+
+def render_stream(placeholder, chunks: Iterator[str], fallback: Callable[[], str], render: str = "markdown") -> Tuple[str, bool]:
+    """
+    Affiche le texte dans `placeholder` au fur et à mesure de son arrivée.
+    En cas d'échec (avant ou pendant le stream), remplace le texte partiel par le fallback.
+    Retourne (texte final, généré par l'IA).
+    """
+    show = getattr(placeholder, render)
+    texte = ""
+    try:
+        for chunk in chunks:
+            texte += chunk
+            show(texte + " ▌")
+    except Exception:
+        texte = fallback()
+        show(texte)
+        return texte, False
+    finally:
+        # Rerun / navigation : Streamlit interrompt le script ici, on ferme le stream
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    texte = texte.strip()
+    show(texte)
+    return texte, True
+
+
+def generer_motivation_ia(ambition, why1, why2, why3, why4, why5, client=None, cache: Optional[ResponseCache] = None):
+    donnees = motivation_inputs(ambition, why1, why2, why3, why4, why5)
+    return _generate(MOTIVATION_TEMPLATE_VERSION, donnees, build_motivation_prompt(donnees), client, cache)
+
+
+def generer_kpi_ia(ambition, objectif, sous1, sous2, horizon_mois, horizon_annee, client=None, cache: Optional[ResponseCache] = None):
+    donnees = kpi_inputs(ambition, objectif, sous1, sous2, horizon_mois, horizon_annee)
+    return _generate(KPI_TEMPLATE_VERSION, donnees, build_kpi_prompt(donnees), client, cache)
+
+# ============================================================
+# FALLBACKS SANS IA
+# ============================================================
+
+def motivation_fallback(ambition, why1, why2, why3, why4, why5):
+    ambition_txt = (ambition or "").strip()
+    if ambition_txt.endswith("."):
+        ambition_txt = ambition_txt[:-1]
+    ambition_txt = ambition_txt.strip()
+
+    parts = []
+
+    if ambition_txt and why5:
+        parts.append(f"En visant à {ambition_txt.lower()}, je veux {why5.strip().rstrip('.')}.")
+    elif ambition_txt:
+        parts.append(f"Je souhaite {ambition_txt.lower()}.")
+
+    if why4:
+        parts.append(f"Pour y parvenir, il est important pour moi de {why4.strip().rstrip('.')}.")
+    if why3:
+        parts.append(f"Cela suppose notamment de {why3.strip().rstrip('.')}.")
+    if why2:
+        parts.append(f"Grâce à cela, je pourrai {why2.strip().rstrip('.')}.")
+    if why1:
+        parts.append(f"C'est important pour moi car {why1.strip().rstrip('.')}.")
+    if ambition_txt:
+        parts.append(f"C'est pour toutes ces raisons que je souhaite {ambition_txt.lower()}.")
+
+    return " ".join(parts).strip()
+
+
+def kpi_fallback(ambition, objectif, sous1, sous2, horizon_mois, horizon_annee):
+    ambition_txt = ambition or "ton ambition"
+    obj_txt = objectif or ambition_txt
+    horizon_txt = ""
+    if horizon_mois and horizon_annee:
+        horizon_txt = f"d'ici {horizon_mois} {horizon_annee}"
+    elif horizon_annee:
+        horizon_txt = f"d'ici {horizon_annee}"
+
+    lignes = []
+
+    lignes.append(
+        f"Atteindre l'objectif « {obj_txt} » {horizon_txt} en ayant un retour positif "
+        "de la part de ton manager ou de tes clients."
+    )
+
+    if sous1:
+        lignes.append(
+            f"Progresser sur le sous-objectif « {sous1} » avec des résultats visibles "
+            "dans les missions ou projets confiés."
+        )
+
+    if sous2:
+        lignes.append(
+            f"Consolider le sous-objectif « {sous2} » en gagnant en autonomie et en responsabilité."
+        )
+
+    lignes.append(
+        "Être capable d'illustrer ta progression avec au moins 2 ou 3 exemples concrets "
+        "sur lesquels tu as fait la différence."
+    )
+
+    return " ".join(lignes)
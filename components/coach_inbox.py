@@ -0,0 +1,246 @@
+# components/coach_inbox.py
+# Index local des messages apprenants -> coach (miroir de l'onglet MESSAGES)
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from components.concurrency import process_singleton
+from components.sqlite_db import DATA_DIR, connect
+
+INBOX_DB_PATH = os.path.join(DATA_DIR, "coach_inbox.sqlite3")
+
+STATUS_NEW = "new"
+STATUS_READ = "read"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    msg_id      TEXT PRIMARY KEY,
+    user_id     TEXT NOT NULL,
+    email       TEXT NOT NULL DEFAULT '',
+    sender      TEXT NOT NULL,
+    message     TEXT NOT NULL,
+    created_at  TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    sheet_row   INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_messages_status_created
+    ON messages(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_messages_user_created
+    ON messages(user_id, created_at);
+CREATE TABLE IF NOT EXISTS unread_counters (
+    user_id         TEXT PRIMARY KEY,
+    email           TEXT NOT NULL DEFAULT '',
+    unread          INTEGER NOT NULL,
+    last_created_at TEXT NOT NULL
+);
+"""
+
+
+def parse_sheet_row(append_response: Any) -> Optional[int]:
+    """Extrait le n° de ligne de la réponse de ws.append_row ('MESSAGES!A12:F12' -> 12)."""
+    try:
+        updated = append_response["updates"]["updatedRange"]
+    except (TypeError, KeyError):
+        return None
+    m = re.search(r"![A-Z]+(\d+)", str(updated))
+    return int(m.group(1)) if m else None
+
+
+def current_sheet_rows(messages: Iterable[Dict[str, Any]], msg_id_column: List[Any]) -> List[int]:
+    """
+    Lignes Sheets actuelles des messages, d'après la colonne msg_id (ws.col_values, en-tête compris).
+    La ligne mémorisée à l'envoi (sheet_row) n'est gardée que si elle porte encore ce msg_id :
+    après un tri, un filtre ou une suppression dans l'onglet, le message est cherché par msg_id,
+    et ignoré s'il a disparu.
+    """
+    column = [str(v) for v in msg_id_column]
+    row_of = {msg_id: i + 1 for i, msg_id in enumerate(column) if i > 0 and msg_id}
+    rows = []
+    for m in messages:
+        msg_id, row = str(m.get("msg_id") or ""), m.get("sheet_row")
+        if row and 1 < row <= len(column) and column[row - 1] == msg_id:
+            rows.append(row)
+        elif msg_id in row_of:
+            rows.append(row_of[msg_id])
+    return rows
+
+
+def _is_unread(sender: str, status: str) -> bool:
+    return sender == "user" and status == STATUS_NEW
+
+
+class CoachInbox:
+    """
+    Boîte de réception coach : messages non lus indexés sur (status, created_at),
+    compteurs par apprenant maintenus à chaque écriture (pas de scan global).
+    """
+
+    def __init__(self, path: str = INBOX_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    # -----------------------------
+    # Écritures (compteurs incrémentaux)
+    # -----------------------------
+    def record_message(
+        self,
+        msg_id: str,
+        user_id: str,
+        sender: str,
+        message: str,
+        created_at: str,
+        status: str = STATUS_NEW,
+        email: str = "",
+        sheet_row: Optional[int] = None,
+    ) -> bool:
+        """Ajoute un message à l'index. Retourne False s'il était déjà connu."""
+        user_id = str(user_id).strip()
+        email = (email or "").strip().lower()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO messages "
+                "(msg_id, user_id, email, sender, message, created_at, status, sheet_row) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (msg_id, user_id, email, sender, message, created_at, status, sheet_row),
+            )
+            if cur.rowcount == 0:
+                return False
+            if _is_unread(sender, status):
+                self._conn.execute(
+                    "INSERT INTO unread_counters (user_id, email, unread, last_created_at) "
+                    "VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET "
+                    "  unread = unread + 1, "
+                    "  email = CASE WHEN excluded.email != '' THEN excluded.email ELSE email END, "
+                    "  last_created_at = MAX(last_created_at, excluded.last_created_at)",
+                    (user_id, email, created_at),
+                )
+        return True
+
+    def mark_read(self, msg_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Passe les messages en 'read' et décrémente les compteurs.
+        Retourne les messages effectivement modifiés (avec sheet_row pour la synchro Sheets).
+        """
+        ids = [m for m in msg_ids if m]
+        if not ids:
+            return []
+        placeholders = ",".join("?" for _ in ids)
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT msg_id, user_id, sheet_row FROM messages "
+                f"WHERE status = ? AND sender = 'user' AND msg_id IN ({placeholders})",
+                [STATUS_NEW, *ids],
+            ).fetchall()
+            if not rows:
+                return []
+            changed = [r["msg_id"] for r in rows]
+            self._conn.execute(
+                f"UPDATE messages SET status = ? WHERE msg_id IN ({','.join('?' for _ in changed)})",
+                [STATUS_READ, *changed],
+            )
+            per_user: Dict[str, int] = {}
+            for r in rows:
+                per_user[r["user_id"]] = per_user.get(r["user_id"], 0) + 1
+            for user_id, n in per_user.items():
+                self._conn.execute(
+                    "UPDATE unread_counters SET unread = unread - ? WHERE user_id = ?",
+                    (n, user_id),
+                )
+            self._conn.execute("DELETE FROM unread_counters WHERE unread <= 0")
+        return [dict(r) for r in rows]
+
+    def rebuild(self, records: List[Dict[str, Any]], first_row: int = 2) -> int:
+        """
+        Reconstruit l'index depuis ws.get_all_records() (resynchronisation ponctuelle).
+        first_row : n° de ligne Sheets du premier enregistrement (2 = sous l'en-tête).
+        """
+        with self._lock, self._conn:
+            # Les emails ne sont pas dans l'onglet MESSAGES : on conserve ceux déjà connus
+            known_emails = dict(
+                self._conn.execute(
+                    "SELECT user_id, MAX(email) FROM messages WHERE email != '' GROUP BY user_id"
+                ).fetchall()
+            )
+            self._conn.execute("DELETE FROM messages")
+            self._conn.execute("DELETE FROM unread_counters")
+            for i, m in enumerate(records):
+                msg_id = str(m.get("msg_id", "")).strip()
+                if not msg_id:
+                    continue
+                user_id = str(m.get("user_id", "")).strip()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO messages "
+                    "(msg_id, user_id, email, sender, message, created_at, status, sheet_row) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        msg_id,
+                        user_id,
+                        known_emails.get(user_id, ""),
+                        str(m.get("sender", "")).strip(),
+                        str(m.get("message", "")),
+                        str(m.get("created_at", "")),
+                        str(m.get("status", "")).strip(),
+                        first_row + i,
+                    ),
+                )
+            self._conn.execute(
+                "INSERT INTO unread_counters (user_id, email, unread, last_created_at) "
+                "SELECT user_id, MAX(email), COUNT(*), MAX(created_at) FROM messages "
+                "WHERE status = ? AND sender = 'user' GROUP BY user_id",
+                (STATUS_NEW,),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        return int(count)
+
+    # -----------------------------
+    # Lectures
+    # -----------------------------
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, tuple(params)).fetchall()]
+
+    def total_unread(self) -> int:
+        rows = self._query("SELECT COALESCE(SUM(unread), 0) AS n FROM unread_counters")
+        return int(rows[0]["n"])
+
+    def unread_counts(self) -> List[Dict[str, Any]]:
+        """Apprenants ayant des messages non lus, le plus récent en premier."""
+        return self._query(
+            "SELECT user_id, email, unread, last_created_at FROM unread_counters "
+            "ORDER BY last_created_at DESC"
+        )
+
+    def unread_messages(self, user_id: Optional[str] = None, limit: int = 200) -> List[Dict[str, Any]]:
+        """Messages non lus (index status, created_at), éventuellement filtrés sur un apprenant."""
+        if user_id is None:
+            return self._query(
+                "SELECT * FROM messages WHERE status = ? AND sender = 'user' "
+                "ORDER BY created_at LIMIT ?",
+                (STATUS_NEW, limit),
+            )
+        return self._query(
+            "SELECT * FROM messages WHERE user_id = ? AND status = ? AND sender = 'user' "
+            "ORDER BY created_at LIMIT ?",
+            (str(user_id), STATUS_NEW, limit),
+        )
+
+    def inbox(self, per_learner: int = 20) -> List[Dict[str, Any]]:
+        """Vue coach : non lus groupés par apprenant."""
+        groups = []
+        for counter in self.unread_counts():
+            groups.append(
+                {
+                    **counter,
+                    "messages": self.unread_messages(counter["user_id"], limit=per_learner),
+                }
+            )
+        return groups
+
+
+@process_singleton
+def get_inbox() -> CoachInbox:
+    return CoachInbox()
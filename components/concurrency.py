@@ -0,0 +1,82 @@
+# components/concurrency.py
+# Outils de concurrence partagés par les composants (un process Streamlit sert plusieurs scripts en parallèle)
+import functools
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def process_singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """
+    Décorateur : la fonction décorée retourne une instance unique par process, partagée par
+    tous les scripts (sessions) qu'il sert. La fabrique est appelée au premier appel, sous
+    verrou, et n'est rappelée qu'après getter.reset() (tests).
+    """
+    lock = threading.Lock()
+    instance: List[T] = []
+
+    @functools.wraps(factory)
+    def getter() -> T:
+        with lock:
+            if not instance:
+                instance.append(factory())
+            return instance[0]
+
+    def reset() -> None:
+        with lock:
+            instance.clear()
+
+    getter.reset = reset  # type: ignore[attr-defined]
+    return getter
+
+
+class SingleFlight:
+    """Un seul calcul en cours par clé : les appels concurrents attendent son résultat."""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, "SingleFlight._Call"] = {}
+
+    def acquire(self, key: str) -> Tuple["SingleFlight._Call", bool]:
+        """Retourne (appel en cours, leader) ; le leader doit appeler release()."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = SingleFlight._Call()
+            return call, True
+
+    def release(self, key: str, call: "SingleFlight._Call", result: Any = None, error: Optional[BaseException] = None) -> None:
+        call.result = result
+        call.error = error
+        with self._lock:
+            self._calls.pop(key, None)
+        call.done.set()
+
+    @staticmethod
+    def wait(call: "SingleFlight._Call") -> Any:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Retourne (résultat, partagé) ; partagé=True si le calcul venait d'un autre appel."""
+        call, leader = self.acquire(key)
+        if not leader:
+            return self.wait(call), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.release(key, call, error=e)
+            raise
+        self.release(key, call, result=result)
+        return result, False
@@ -0,0 +1,152 @@
+# components/disc_log.py
+# Lecture incrémentale du journal des sessions DISC (JSONL, une session par ligne, ajout en fin de fichier)
+# Les index dérivés (percentiles, partenaires…) ne relisent que les lignes ajoutées depuis leur dernier passage.
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from components.allowlist import Allowlist, get_allowlist
+from components.profile_store import normalize_email
+from components.repository import DISC_LOG_PATH
+
+ALL_COHORTS = "__all__"  # tous les apprenants, quelle que soit leur cohorte
+CHECK_INTERVAL_S = 2.0
+
+
+class LogTail:
+    """
+    Position de lecture dans le journal. read_new() retourne les sessions ajoutées depuis
+    l'appel précédent ; si le fichier a été remplacé ou tronqué, il est relu depuis le début
+    et `reset` vaut True (l'appelant repart alors de zéro).
+    Une ligne incomplète (écriture en cours) est laissée pour l'appel suivant.
+    """
+
+    def __init__(self, path: str = DISC_LOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._inode = None
+        self._offset = 0
+
+    @property
+    def version(self) -> Tuple[Any, int]:
+        """(inode, octets lus) : change dès qu'une session a été lue."""
+        return self._inode, self._offset
+
+    def resume(self, inode: Any, offset: int) -> None:
+        """Reprend la lecture à une position enregistrée (ex. instantané d'un index sur disque)."""
+        with self._lock:
+            self._inode, self._offset = inode, int(offset)
+
+    def read_new(self) -> Tuple[bool, List[Dict[str, Any]]]:
+        with self._lock:
+            try:
+                st_ = os.stat(self.path)
+            except OSError:
+                reset = self._offset > 0
+                self._inode, self._offset = None, 0
+                return reset, []
+
+            reset = False
+            if st_.st_ino != self._inode or st_.st_size < self._offset:
+                reset = self._inode is not None or self._offset > 0
+                self._inode, self._offset = st_.st_ino, 0
+            if st_.st_size == self._offset:
+                return reset, []
+
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read(st_.st_size - self._offset)
+            end = chunk.rfind(b"\n") + 1
+            self._offset += end
+
+            records = []
+            for line in chunk[:end].splitlines():
+                try:
+                    rec = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    continue
+                if isinstance(rec, dict):
+                    records.append(rec)
+            return reset, records
+
+
+class LogIndex(ABC):
+    """
+    Base des index dérivés du journal et des cohortes : possède la position de lecture, la
+    version des cohortes et refresh(). Les sous-classes implémentent _reset() (état vide) et
+    add_sessions() ; elles lisent sous self._lock.
+    """
+
+    def __init__(self, tail: Optional[LogTail] = None, allowlist: Optional[Allowlist] = None,
+                 check_interval_s: float = CHECK_INTERVAL_S):
+        self.tail = tail or LogTail()
+        self.allowlist = allowlist or get_allowlist()
+        self.check_interval_s = check_interval_s
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._next_check = 0.0
+        self._cohorts_version = self.allowlist.version
+        self._reset()
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Remet l'index à vide (appelé sous self._lock, sauf à la construction)."""
+
+    @abstractmethod
+    def add_sessions(self, records: List[Dict[str, Any]]) -> int:
+        """Prend en compte des sessions dans l'ordre du journal ; retourne le nombre retenu."""
+
+    def add_session(self, record: Dict[str, Any]) -> bool:
+        """Prend en compte une session (dict du journal) ; False si elle est inexploitable."""
+        return self.add_sessions([record]) == 1
+
+    def _groups(self, cohort: Optional[str]) -> Tuple[str, ...]:
+        """Groupes où compte un apprenant : tous les apprenants, et sa cohorte s'il en a une."""
+        return (ALL_COHORTS, cohort) if cohort else (ALL_COHORTS,)
+
+    def _cohorts_changed(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        CSV de cohortes rechargés : par défaut, index vidé et journal relu en entier avec les
+        nouvelles cohortes. Retourne les sessions à ajouter.
+        """
+        with self._lock:
+            self._reset()
+        self.tail = LogTail(self.tail.path)
+        return self.tail.read_new()[1]
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Lit les sessions ajoutées au journal (au plus toutes les check_interval_s secondes).
+        Un seul thread lit à la fois ; les autres interrogent l'index tel quel sans attendre.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = now + self.check_interval_s
+            reset, records = self.tail.read_new()
+            cohorts_version = self.allowlist.version
+            if reset:
+                with self._lock:
+                    self._reset()
+            elif cohorts_version != self._cohorts_version:
+                records = self._cohorts_changed(records)
+            self._cohorts_version = cohorts_version
+            self.add_sessions(records)
+        finally:
+            self._refresh_lock.release()
+
+
+def latest_sessions(path: str = DISC_LOG_PATH) -> Dict[str, Dict[str, Any]]:
+    """Dernière session de chaque apprenant (email normalisé -> session), en une lecture du journal."""
+    latest: Dict[str, Dict[str, Any]] = {}
+    for rec in LogTail(path).read_new()[1]:
+        email = normalize_email(rec.get("user") or rec.get("email"))
+        if email:
+            latest[email] = rec
+    return latest
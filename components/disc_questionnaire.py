@@ -0,0 +1,204 @@
+# components/disc_questionnaire.py
+# Questionnaire DISC à choix forcé : banque de questions chargée une fois par process,
+# calcul des scores en mémoire, enregistrement par le dépôt dans la collection DISC_SESSIONS (par défaut
+# le journal disc_forced_sessions.jsonl, via l'appender à group commit). Une même soumission (même
+# submission_id) n'est enregistrée qu'une fois.
+#
+#   python -m components.disc_questionnaire --draft Data/disc_questions.draft.json
+#   (ébauche de banque reconstituée à partir des réponses déjà présentes dans le journal)
+import argparse
+import hashlib
+import json
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from components.disc_log import LogTail
+from components.disc_texts import DIMS
+from components.profile_store import normalize_email
+from components.repository import DISC_LOG_PATH, DiscSession, Repository, get_repository
+from components.sqlite_db import DATA_DIR
+
+QUESTION_BANK_PATH = os.path.join(DATA_DIR, "disc_questions.json")
+
+
+@dataclass(frozen=True)
+class Option:
+    text: str
+    dim: str
+
+
+@dataclass(frozen=True)
+class Question:
+    qid: int
+    prompt: str
+    options: Tuple[Option, ...]
+
+
+@dataclass(frozen=True)
+class QuestionBank:
+    questions: Tuple[Question, ...]
+    version: str  # empreinte du fichier : change si la banque est modifiée
+
+    def get(self, qid: int) -> Optional[Question]:
+        for q in self.questions:
+            if q.qid == qid:
+                return q
+        return None
+
+
+# ---------------------------------------------------------
+# Banque de questions
+# ---------------------------------------------------------
+
+def load_question_bank(path: str = QUESTION_BANK_PATH) -> QuestionBank:
+    """
+    Lit et valide la banque : [{"qid": 1, "prompt": "...", "options": [{"text": "...", "dim": "D"}, ...]}, ...]
+    (ou {"questions": [...]}). ValueError si elle est incohérente.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw.decode("utf-8"))
+    items = data.get("questions") if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        raise ValueError("banque de questions vide")
+
+    questions, seen = [], set()
+    for item in items:
+        qid = int(item["qid"])
+        if qid in seen:
+            raise ValueError(f"question {qid} en double")
+        seen.add(qid)
+        options = tuple(Option(str(o["text"]), str(o["dim"]).upper()) for o in item.get("options") or [])
+        if len(options) < 2:
+            raise ValueError(f"question {qid} : au moins deux propositions attendues")
+        unknown = [o.dim for o in options if o.dim not in DIMS]
+        if unknown:
+            raise ValueError(f"question {qid} : dimension inconnue {unknown[0]!r}")
+        questions.append(Question(qid, str(item.get("prompt") or ""), options))
+    return QuestionBank(tuple(questions), hashlib.sha1(raw).hexdigest()[:12])
+
+
+_bank_lock = threading.Lock()
+_bank: Optional[QuestionBank] = None
+
+
+def get_question_bank() -> QuestionBank:
+    """Banque partagée par tous les scripts du process (lue une seule fois)."""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = load_question_bank()
+        return _bank
+
+
+# ---------------------------------------------------------
+# Scores et enregistrement
+# ---------------------------------------------------------
+
+def new_submission_id() -> str:
+    """Identifiant d'une tentative : créé à l'ouverture du questionnaire, réutilisé en cas de double envoi."""
+    return uuid.uuid4().hex
+
+
+def score_answers(bank: QuestionBank, answers: Dict[int, int]) -> Tuple[Dict[str, int], List[Dict]]:
+    """
+    answers : qid -> index de la proposition choisie. Retourne (scores D/I/S/C, choix au format
+    du journal). ValueError si une question est sans réponse ou une réponse hors banque.
+    """
+    scores = {dim: 0 for dim in DIMS}
+    choices = []
+    for q in bank.questions:
+        index = answers.get(q.qid)
+        if index is None:
+            raise ValueError(f"question {q.qid} sans réponse")
+        if not 0 <= int(index) < len(q.options):
+            raise ValueError(f"question {q.qid} : réponse {index} inconnue")
+        option = q.options[int(index)]
+        scores[option.dim] += 1
+        choices.append({"qid": q.qid, "choice": option.text, "dim": option.dim})
+    return scores, choices
+
+
+def build_session(email: str, bank: QuestionBank, answers: Dict[int, int], submission_id: str,
+                  now: Optional[datetime] = None) -> Dict:
+    """Enregistrement au format de disc_forced_sessions.jsonl (+ submission_id, version de la banque)."""
+    email = normalize_email(email)
+    if not email:
+        raise ValueError("email requis pour enregistrer une session DISC")
+    scores, choices = score_answers(bank, answers)
+    top_dims = [dim for dim, _ in sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:2]]
+    now = now or datetime.now(timezone.utc)
+    return {
+        "ts": now.astimezone(timezone.utc).replace(tzinfo=None).isoformat() + "Z",
+        "user": email,
+        "scores": scores,
+        "style": "".join(top_dims),
+        "top_dims": top_dims,
+        "choices": choices,
+        "submission_id": submission_id,
+        "bank_version": bank.version,
+    }
+
+
+def submit(email: str, answers: Dict[int, int], submission_id: str, bank: Optional[QuestionBank] = None,
+           repository: Optional[Repository] = None) -> Tuple[Dict, bool]:
+    """
+    Calcule et enregistre la session ; (session, True si elle vient d'être enregistrée).
+    Double envoi (même submission_id) : la session déjà enregistrée est retournée, rien n'est réécrit.
+    """
+    bank = bank or get_question_bank()
+    repository = repository or get_repository()
+    session = DiscSession.from_record(build_session(email, bank, answers, submission_id))
+    return repository.add_disc_session(session)
+
+
+# ---------------------------------------------------------
+# Ébauche de banque à partir du journal
+# ---------------------------------------------------------
+
+def draft_bank_from_log(log_path: str = DISC_LOG_PATH) -> List[Dict]:
+    """
+    Propositions déjà choisies dans le journal, regroupées par question (intitulés à compléter) :
+    point de départ pour reconstituer Data/disc_questions.json.
+    """
+    options: Dict[int, Dict[str, str]] = {}
+    for rec in LogTail(log_path).read_new()[1]:
+        for choice in rec.get("choices") or []:
+            try:
+                qid, dim, text = int(choice["qid"]), str(choice["dim"]), str(choice["choice"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            options.setdefault(qid, {}).setdefault(dim, text)
+    return [
+        {
+            "qid": qid,
+            "prompt": "",
+            "options": [{"text": options[qid][dim], "dim": dim} for dim in DIMS if dim in options[qid]],
+        }
+        for qid in sorted(options)
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Banque de questions DISC.")
+    parser.add_argument("--draft", metavar="OUT", help="écrit une ébauche de banque reconstituée depuis le journal")
+    parser.add_argument("--check", default=QUESTION_BANK_PATH, help="valide une banque existante")
+    args = parser.parse_args(argv)
+
+    if args.draft:
+        draft = draft_bank_from_log()
+        with open(args.draft, "w", encoding="utf-8") as f:
+            json.dump({"questions": draft}, f, ensure_ascii=False, indent=2)
+        incomplete = sum(1 for q in draft if len(q["options"]) < len(DIMS))
+        print(f"{len(draft)} questions écrites dans {args.draft} ({incomplete} avec des propositions manquantes)")
+        return
+    bank = load_question_bank(args.check)
+    print(f"{len(bank.questions)} questions valides (version {bank.version})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# components/disc_texts.py
+# Textes DISC partagés par la page de résultats et la synthèse PDF (components/pdf_report.py)
+
+DIMS = ("D", "I", "S", "C")
+
+# Libelles des dimensions
+DIM_LABELS = {
+    "D": ("Dominance", "Resultats / decision / vitesse"),
+    "I": ("Influence", "Relation / energie / inspiration"),
+    "S": ("Stabilite", "Cooperation / patience / fiabilite"),
+    "C": ("Conformite", "Qualite / precision / normes"),
+}
+
+# Lecture "forces naturelles"
+DIM_NATURAL_STRENGTHS = {
+    "D": "Vous aimez relever des defis, aller vite et orienter les decisions.",
+    "I": "Vous mettez facilement de l’energie et du lien dans le groupe.",
+    "S": "Vous favorisez la cooperation, l’ecoute et un climat stable.",
+    "C": "Vous apportez de la rigueur, de la precision et le sens des normes.",
+}
+
+# Risques d'exces pour les energies fortes (affichage ecran + PDF)
+DIM_EXCESS = {
+    "D": "En exces, vous pouvez aller trop vite, imposer vos vues ou prendre peu de temps pour ecouter.",
+    "I": "En exces, vous pouvez beaucoup parler, vous disperser ou perdre de vue l’objectif.",
+    "S": "En exces, vous pouvez eviter les conflits, trop vous adapter ou avoir du mal a dire non.",
+    "C": "En exces, vous pouvez sur-structurer, rechercher trop de details ou avoir du mal a decider.",
+}
+
+# Axes de developpement pour les energies moins naturelles
+GROWTH_TEXT = {
+    "D": "Developper davantage la Dominance (D) vous aiderait a prendre plus facilement des decisions, tenir vos positions et oser vous affirmer dans les moments cles.",
+    "I": "Developper davantage l’Influence (I) vous aiderait a partager vos idees, creer plus de lien et embarquer plus facilement les autres.",
+    "S": "Developper davantage la Stabilite (S) vous aiderait a mieux reflechir aux consequences de vos actions, prendre en compte l’ensemble des acteurs et installer un climat de confiance.",
+    "C": "Developper davantage la Conformite (C) vous aiderait a structurer vos demarches, securiser les points de detail importants et fiabiliser vos decisions.",
+}
+
+# Pour le PDF : textes axes de dev (formulation un peu plus courte)
+DIM_DEV = {
+    "D": "Vous pourriez gagner a ecouter davantage, poser des questions et partager la decision quand c’est utile.",
+    "I": "Vous pourriez gagner a structurer davantage vos messages, prioriser et conclure plus clairement.",
+    "S": "Vous pourriez gagner a exprimer vos desaccords, poser des limites et oser dire non.",
+    "C": "Vous pourriez gagner a simplifier, aller a l’essentiel et accepter une part d’incertitude.",
+}
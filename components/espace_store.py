@@ -0,0 +1,146 @@
+# components/espace_store.py
+# Stockage "Mon espace" par apprenant (clé = email), un enregistrement par champ
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from components.concurrency import process_singleton
+from components.sqlite_db import DATA_DIR, connect, immediate
+
+ESPACE_DB_PATH = os.path.join(DATA_DIR, "mon_espace.sqlite3")
+
+
+@dataclass
+class EspaceState:
+    """Modèle typé de la page Mon espace, partagé par ses fragments via st.session_state."""
+
+    ambition_courte: str = ""
+    why1: str = ""
+    why2: str = ""
+    why3: str = ""
+    why4: str = ""
+    why5: str = ""
+    ambition_validee: bool = False
+    motivation_profonde: str = ""
+    objectif_principal: str = ""
+    sous_objectif_1: str = ""
+    sous_objectif_2: str = ""
+    horizon_mois: str = ""
+    horizon_annee: Optional[int] = None
+    kpi_user: str = ""
+    kpi_suggestions: str = ""
+
+    @classmethod
+    def from_session(cls, state: Mapping[str, Any]) -> "EspaceState":
+        values = {}
+        for f in fields(cls):
+            v = state.get(f.name)
+            if v is not None:
+                values[f.name] = v
+        return cls(**values)
+
+    @property
+    def whys(self) -> List[str]:
+        return [self.why1, self.why2, self.why3, self.why4, self.why5]
+
+    @property
+    def horizon_annee_txt(self) -> str:
+        return str(self.horizon_annee) if self.horizon_annee else ""
+
+
+# Champs persistés de la page Mon espace
+ESPACE_FIELDS = [f.name for f in fields(EspaceState)]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS espace_fields (
+    email       TEXT NOT NULL,
+    field       TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (email, field)
+);
+"""
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def diff_fields(current: Dict[str, Any], saved: Dict[str, Any], fields: Iterable[str] = ESPACE_FIELDS) -> Dict[str, Any]:
+    """Champs dont la valeur courante diffère de la dernière version sauvegardée."""
+    changed = {}
+    for k in fields:
+        if k not in current:
+            continue
+        if k not in saved or _encode(current[k]) != _encode(saved[k]):
+            changed[k] = current[k]
+    return changed
+
+
+class EspaceStore:
+    """
+    Un enregistrement par (email, champ) : deux apprenants ne se marchent plus dessus,
+    et une sauvegarde ne réécrit que les champs modifiés (transaction SQLite).
+    """
+
+    def __init__(self, path: str = ESPACE_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def load(self, email: str) -> Dict[str, Any]:
+        email = (email or "").strip().lower()
+        if not email:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT field, value FROM espace_fields WHERE email = ?", (email,)
+            ).fetchall()
+        data = {}
+        for r in rows:
+            try:
+                data[r["field"]] = json.loads(r["value"])
+            except ValueError:
+                continue
+        return data
+
+    def save(self, email: str, data: Dict[str, Any]) -> List[str]:
+        """
+        Sauvegarde les champs de `data` pour cet email.
+        Les champs identiques à la version stockée sont ignorés ; retourne les champs écrits.
+        """
+        email = (email or "").strip().lower()
+        if not email:
+            raise ValueError("email requis pour sauvegarder Mon espace")
+        encoded = {k: _encode(v) for k, v in data.items() if k in ESPACE_FIELDS}
+        if not encoded:
+            return []
+
+        with self._lock, immediate(self._conn):
+            stored = dict(
+                self._conn.execute(
+                    "SELECT field, value FROM espace_fields WHERE email = ?", (email,)
+                ).fetchall()
+            )
+            changed = [k for k, v in encoded.items() if stored.get(k) != v]
+            now = time.time()
+            self._conn.executemany(
+                "INSERT INTO espace_fields (email, field, value, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(email, field) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                [(email, k, encoded[k], now) for k in changed],
+            )
+        return changed
+
+    def emails(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT email FROM espace_fields ORDER BY email").fetchall()
+        return [r["email"] for r in rows]
+
+
+@process_singleton
+def get_store() -> EspaceStore:
+    return EspaceStore()
@@ -0,0 +1,179 @@
+# components/event_rollup.py
+# Agrégats quotidiens des événements locaux (components/event_sink.py), calculés avec pandas :
+# ouvertures par page, apprenants uniques, entonnoir accueil -> Mon espace -> coach -> résultats DISC.
+# Le tableau de bord admin ne lit que ces agrégats, jamais les événements bruts.
+#   python -m components.event_rollup [--force]
+import argparse
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from components.event_sink import EVENTS_DIR, partition_days, partition_files, read_events
+from components.sqlite_db import DATA_DIR
+
+ROLLUPS_DIR = os.path.join(DATA_DIR, "logs", "rollups")
+FUNNEL = ("accueil", "mon_espace", "coach", "resultats")
+# Étapes dont aucune page routée ne journalise l'ouverture : "resultats" n'est enregistrée que par
+# archives_cachees/03_Mes-Resultats_et_Plan_action.py, que Streamlit ne sert pas (reste à 0)
+UNWIRED_STAGES = frozenset({"resultats"})
+
+ROLLUP_COLUMNS = {
+    "daily": ["date", "events", "learners", "profiles_saved"],
+    "daily_pages": ["date", "page", "opens", "learners"],
+    "daily_funnel": ["date", "step", "stage", "learners", "conversion_prev", "conversion_start"],
+}
+_STATE_FILE = "state.json"
+
+
+def events_frame(records: Iterable[Dict]) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(list(records), columns=["ts", "email", "event", "page"])
+    df["ts"] = pd.to_datetime(df["ts"], errors="coerce")
+    for col in ("email", "event", "page"):
+        df[col] = df[col].fillna("").astype(str)
+    return df.dropna(subset=["ts"])
+
+
+def funnel_counts(df: pd.DataFrame, stages=FUNNEL) -> pd.DataFrame:
+    """
+    Apprenants ayant franchi chaque étape : page ouverte, après toutes les étapes précédentes
+    (ordre des premières ouvertures). Calcul vectorisé sur les apprenants, une colonne par étape.
+    """
+    opens = df[(df["event"] == "app_open") & df["page"].isin(stages) & (df["email"] != "")]
+    # Horodatages en entiers : une étape jamais ouverte donne NaN (comparaisons toujours fausses)
+    first = (
+        opens.assign(t=opens["ts"].astype("int64"))
+        .groupby(["email", "page"])["t"]
+        .min()
+        .unstack("page")
+        .reindex(columns=list(stages))
+    )
+
+    reached = pd.DataFrame(index=first.index)
+    previous = None
+    for stage in stages:
+        ok = first[stage].notna()
+        if previous is not None:
+            ok &= reached[previous] & (first[stage] >= first[previous])
+        reached[stage] = ok
+        previous = stage
+
+    learners = reached.sum().to_numpy(dtype=int)
+    prev = np.concatenate([learners[:1], learners[:-1]])
+    out = pd.DataFrame({"step": range(1, len(stages) + 1), "stage": list(stages), "learners": learners})
+    out["conversion_prev"] = np.where(prev > 0, learners / np.maximum(prev, 1), 0.0).round(4)
+    out["conversion_start"] = np.where(learners[0] > 0, learners / max(learners[0], 1), 0.0).round(4)
+    return out
+
+
+def rollup_day(df: pd.DataFrame, day: str) -> Dict[str, pd.DataFrame]:
+    """Agrégats d'un jour à partir de ses événements."""
+    known = df[df["email"] != ""]
+    opens = df[df["event"] == "app_open"]
+
+    daily = pd.DataFrame(
+        [
+            {
+                "date": day,
+                "events": len(df),
+                "learners": known["email"].nunique(),
+                "profiles_saved": int((df["event"] == "profile_saved").sum()),
+            }
+        ]
+    )
+    pages = (
+        opens.groupby("page")
+        .agg(opens=("event", "size"), learners=("email", lambda s: s[s != ""].nunique()))
+        .reset_index()
+    )
+    pages.insert(0, "date", day)
+    funnel = funnel_counts(df)
+    funnel.insert(0, "date", day)
+    return {"daily": daily, "daily_pages": pages, "daily_funnel": funnel}
+
+
+def _signature(day: str, events_root: str) -> List:
+    sig = []
+    for path in partition_files(day, events_root):
+        try:
+            st_ = os.stat(path)
+        except OSError:
+            continue
+        sig.append([os.path.basename(path), st_.st_size, st_.st_mtime_ns])
+    return sig
+
+
+def _csv_path(name: str, rollups_dir: str) -> str:
+    return os.path.join(rollups_dir, f"{name}.csv")
+
+
+def _write_csv(df: pd.DataFrame, path: str) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def load_rollups(rollups_dir: str = ROLLUPS_DIR) -> Dict[str, pd.DataFrame]:
+    """Agrégats calculés (tables vides si le job n'a jamais tourné)."""
+    out = {}
+    for name, columns in ROLLUP_COLUMNS.items():
+        try:
+            df = pd.read_csv(_csv_path(name, rollups_dir), dtype={"date": str})
+        except (OSError, pd.errors.EmptyDataError):
+            df = pd.DataFrame(columns=columns)
+        out[name] = df
+    return out
+
+
+def rollup_state(rollups_dir: str = ROLLUPS_DIR) -> Dict:
+    try:
+        with open(os.path.join(rollups_dir, _STATE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"days": {}}
+
+
+def run_rollup(events_root: str = EVENTS_DIR, rollups_dir: str = ROLLUPS_DIR, force: bool = False) -> Dict:
+    """
+    Recalcule uniquement les jours dont les fichiers d'événements ont changé depuis le dernier passage
+    (tous si force=True), puis réécrit les tables d'agrégats.
+    """
+    os.makedirs(rollups_dir, exist_ok=True)
+    state = {"days": {}} if force else rollup_state(rollups_dir)
+    days = partition_days(events_root)
+    signatures = {day: _signature(day, events_root) for day in days}
+    todo = [day for day in days if state["days"].get(day) != signatures[day]]
+
+    tables = load_rollups(rollups_dir) if not force else {n: pd.DataFrame(columns=c) for n, c in ROLLUP_COLUMNS.items()}
+    fresh: Dict[str, List[pd.DataFrame]] = {name: [] for name in ROLLUP_COLUMNS}
+    for day in todo:
+        for name, df in rollup_day(events_frame(read_events(day, events_root)), day).items():
+            fresh[name].append(df)
+
+    for name, columns in ROLLUP_COLUMNS.items():
+        kept = tables[name][~tables[name]["date"].astype(str).isin(todo)]
+        merged = pd.concat([kept, *fresh[name]], ignore_index=True) if fresh[name] else kept
+        merged = merged.reindex(columns=columns).sort_values(columns[:2]).reset_index(drop=True)
+        _write_csv(merged, _csv_path(name, rollups_dir))
+
+    state = {"days": signatures, "updated_at": pd.Timestamp.now().isoformat(timespec="seconds")}
+    tmp = os.path.join(rollups_dir, _STATE_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, os.path.join(rollups_dir, _STATE_FILE))
+    return {"days_recomputed": todo, "days_total": len(days)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Calcule les agrégats quotidiens des événements locaux.")
+    parser.add_argument("--events", default=EVENTS_DIR)
+    parser.add_argument("--out", default=ROLLUPS_DIR)
+    parser.add_argument("--force", action="store_true", help="recalcule tous les jours")
+    args = parser.parse_args(argv)
+    print(run_rollup(args.events, args.out, force=args.force))
+
+
+if __name__ == "__main__":
+    main()
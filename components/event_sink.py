@@ -0,0 +1,128 @@
+# components/event_sink.py
+# Copie locale de chaque événement envoyé au webhook (app_open, profile_saved…)
+# Data/logs/events/date=AAAA-MM-JJ/events-<pid>.jsonl.gz : une partition par jour, un fichier par process
+import atexit
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from components.concurrency import process_singleton
+from components.sqlite_db import DATA_DIR
+
+EVENTS_DIR = os.path.join(DATA_DIR, "logs", "events")
+FLUSH_EVERY = 50  # événements en mémoire avant écriture
+FLUSH_INTERVAL_S = 5.0  # délai max avant écriture d'un événement isolé
+
+
+def partition_dir(day: str, root: str = EVENTS_DIR) -> str:
+    return os.path.join(root, f"date={day}")
+
+
+def partition_days(root: str = EVENTS_DIR) -> List[str]:
+    """Jours (AAAA-MM-JJ) pour lesquels des événements existent, triés."""
+    return sorted(os.path.basename(p)[len("date=") :] for p in glob.glob(os.path.join(root, "date=*")))
+
+
+def partition_files(day: str, root: str = EVENTS_DIR) -> List[str]:
+    return sorted(glob.glob(os.path.join(partition_dir(day, root), "*.jsonl.gz")))
+
+
+class EventSink:
+    """
+    Tampon d'événements écrit par blocs : chaque écriture ajoute un membre gzip au fichier
+    du jour de ce process (gzip.open relit tous les membres à la suite).
+    Un fichier par process : pas d'écrivains concurrents sur un même fichier.
+    """
+
+    def __init__(self, root: str = EVENTS_DIR, flush_every: int = FLUSH_EVERY, flush_interval_s: float = FLUSH_INTERVAL_S):
+        self.root = root
+        self.flush_every = flush_every
+        self.flush_interval_s = flush_interval_s
+        self._lock = threading.Lock()
+        self._buffer: Dict[str, List[str]] = {}  # jour -> lignes JSON
+        self._pending = 0
+        self._timer: Optional[threading.Timer] = None
+
+    def record(
+        self,
+        email: str,
+        event: str,
+        page: str = "",
+        payload: Optional[Dict[str, Any]] = None,
+        ts: Optional[float] = None,
+    ) -> None:
+        ts = time.time() if ts is None else ts
+        when = datetime.fromtimestamp(ts)
+        line = json.dumps(
+            {
+                "ts": when.isoformat(timespec="milliseconds"),
+                "email": (email or "").strip().lower(),
+                "event": event,
+                "page": page or "",
+                "payload": payload or {},
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._buffer.setdefault(when.strftime("%Y-%m-%d"), []).append(line)
+            self._pending += 1
+            full = self._pending >= self.flush_every
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval_s, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Écrit les événements en attente ; retourne leur nombre."""
+        with self._lock:
+            buffer, self._buffer, self._pending = self._buffer, {}, 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            written = 0
+            for day, lines in buffer.items():
+                folder = partition_dir(day, self.root)
+                os.makedirs(folder, exist_ok=True)
+                path = os.path.join(folder, f"events-{os.getpid()}.jsonl.gz")
+                with open(path, "ab") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                    gz.write(("\n".join(lines) + "\n").encode("utf-8"))
+                written += len(lines)
+            return written
+
+
+def read_events(day: str, root: str = EVENTS_DIR) -> Iterator[Dict[str, Any]]:
+    """Événements bruts d'un jour (pour le job de rollup uniquement)."""
+    for path in partition_files(day, root):
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except (OSError, EOFError):
+            # Membre gzip tronqué (process arrêté en pleine écriture) : on garde ce qui a été lu
+            continue
+
+
+@process_singleton
+def get_sink() -> EventSink:
+    """Les événements encore en mémoire sont écrits à l'arrêt du process."""
+    sink = EventSink()
+    atexit.register(sink.flush)
+    return sink
+
+
+def record_event(email: str, event: str, page: str = "", payload: Optional[Dict[str, Any]] = None) -> None:
+    """Best effort : une erreur disque ne doit jamais bloquer une page."""
+    try:
+        get_sink().record(email, event, page, payload)
+    except Exception:
+        pass
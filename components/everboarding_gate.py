@@ -6,6 +6,8 @@ from typing import Optional, Dict, Any, Tuple
 
 import streamlit as st
 
+from components.event_sink import record_event
+
 
 # =============================
 # Helpers HTTP
@@ -110,7 +112,10 @@ def log_event_via_webhook(
 
     Expects secret:
       - ACCESS_WEBHOOK_URL  (Apps Script /exec URL)
+    Every event is also mirrored locally (components/event_sink).
     """
+    record_event(email, event, page, payload)
+
     url = (st.secrets.get("ACCESS_WEBHOOK_URL") or "").strip()
     if not url:
         return
@@ -0,0 +1,180 @@
+# components/history_index.py
+# Historique DISC de chaque apprenant (une entrée par passation, dans l'ordre du journal) :
+# trajectoire des scores, écart entre la première et la dernière passation, et "qui a le plus
+# évolué" dans une cohorte. Écarts rangés dans des listes triées par (cohorte, critère), mises à
+# jour à chaque nouvelle session : une requête lit seulement les k premiers éléments.
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from components.concurrency import process_singleton
+from components.disc_log import ALL_COHORTS, LogIndex
+from components.disc_texts import DIMS
+from components.profile_store import normalize_email
+
+MOVEMENT = "movement"  # somme des |écarts| sur D, I, S, C
+UP, DOWN = "up", "down"
+
+
+class HistoryIndex(LogIndex):
+    """
+    Passations de chaque apprenant, lues au fil du journal (jamais relu en entier sauf s'il est
+    réécrit). Seuls les apprenants ayant au moins deux passations ont un écart et figurent dans
+    movers(). Un rechargement des CSV de cohortes reclasse les écarts sans relire le journal.
+    """
+
+    def _reset(self) -> None:
+        self._history: Dict[str, List[Tuple[str, Tuple[int, ...]]]] = {}  # email -> [(ts, scores)]
+        self._cohort: Dict[str, Optional[str]] = {}
+        self._deltas: Dict[str, Dict[str, int]] = {}  # email -> écarts classés (MOVEMENT et chaque dim)
+        self._sorted: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}  # (cohorte, critère) -> (écart, email)
+
+    # ---------------------------------------------------------
+    # Mise à jour
+    # ---------------------------------------------------------
+
+    def _unlink(self, email: str) -> None:
+        deltas = self._deltas.pop(email, None)
+        if not deltas:
+            return
+        for group in self._groups(self._cohort.get(email)):
+            for key, value in deltas.items():
+                values = self._sorted[(group, key)]
+                del values[bisect_left(values, (value, email))]
+
+    def _compute(self, email: str) -> Optional[Dict[str, int]]:
+        sessions = self._history[email]
+        if len(sessions) < 2:
+            return None
+        first, latest = sessions[0][1], sessions[-1][1]
+        deltas = {dim: latest[j] - first[j] for j, dim in enumerate(DIMS)}
+        deltas[MOVEMENT] = sum(abs(v) for v in deltas.values())
+        return deltas
+
+    def _link(self, email: str) -> None:
+        deltas = self._compute(email)
+        if deltas is None:
+            return
+        self._deltas[email] = deltas
+        for group in self._groups(self._cohort.get(email)):
+            for key, value in deltas.items():
+                insort(self._sorted.setdefault((group, key), []), (value, email))
+
+    def _rebuild(self) -> None:
+        # Classements recalculés en bloc (un tri par liste) : chargement initial, gros lots, cohortes
+        self._deltas, self._sorted = {}, {}
+        for email in self._history:
+            deltas = self._compute(email)
+            if deltas is None:
+                continue
+            self._deltas[email] = deltas
+            for group in self._groups(self._cohort.get(email)):
+                for key, value in deltas.items():
+                    self._sorted.setdefault((group, key), []).append((value, email))
+        for values in self._sorted.values():
+            values.sort()
+
+    def add_sessions(self, records: List[Dict]) -> int:
+        """Ajoute des passations (dicts du journal) à l'historique ; retourne le nombre retenu."""
+        parsed = []
+        for record in records:
+            email = normalize_email(record.get("user") or record.get("email"))
+            raw = record.get("scores") or {}
+            try:
+                scores = tuple(int(raw.get(dim, 0)) for dim in DIMS)
+            except (TypeError, ValueError):
+                continue
+            if email:
+                parsed.append((email, str(record.get("ts") or ""), scores))
+        if not parsed:
+            return 0
+
+        with self._lock:
+            touched = set()
+            for email, ts, scores in parsed:
+                if email not in self._history:
+                    self._history[email] = []
+                    self._cohort[email] = self.allowlist.cohort_of(email)
+                self._history[email].append((ts, scores))
+                touched.add(email)
+            if 8 * len(touched) > len(self._deltas):
+                self._rebuild()
+            else:
+                # Quelques apprenants : leurs écarts sont déplacés un à un dans les listes triées
+                for email in touched:
+                    self._unlink(email)
+                    self._link(email)
+        return len(parsed)
+
+    def _cohorts_changed(self, records: List[Dict]) -> List[Dict]:
+        # L'historique ne dépend pas des cohortes : seuls les classements sont recalculés
+        with self._lock:
+            self._cohort = {email: self.allowlist.cohort_of(email) for email in self._history}
+            self._rebuild()
+        return records
+
+    # ---------------------------------------------------------
+    # Requêtes
+    # ---------------------------------------------------------
+
+    def trajectory(self, email: str) -> List[Dict]:
+        """Passations de l'apprenant dans l'ordre : [{"ts", "D", "I", "S", "C"}, ...]."""
+        self.refresh()
+        with self._lock:
+            sessions = list(self._history.get(normalize_email(email)) or [])
+        return [{"ts": ts, **dict(zip(DIMS, scores))} for ts, scores in sessions]
+
+    def delta(self, email: str) -> Optional[Dict]:
+        """
+        Écart entre la première et la dernière passation : {"email", "n_sessions", "first_ts",
+        "latest_ts", "first", "latest", "D", "I", "S", "C", "movement"} ; None avant la 2e passation.
+        """
+        self.refresh()
+        email = normalize_email(email)
+        with self._lock:
+            return self._delta(email)
+
+    def _delta(self, email: str) -> Optional[Dict]:
+        deltas = self._deltas.get(email)
+        if deltas is None:
+            return None
+        sessions = self._history[email]
+        return {
+            "email": email,
+            "n_sessions": len(sessions),
+            "first_ts": sessions[0][0],
+            "latest_ts": sessions[-1][0],
+            "first": dict(zip(DIMS, sessions[0][1])),
+            "latest": dict(zip(DIMS, sessions[-1][1])),
+            **deltas,
+        }
+
+    def movers(self, cohort: Optional[str] = None, k: int = 10, dim: Optional[str] = None,
+               direction: str = UP) -> List[Dict]:
+        """
+        Les k apprenants de la cohorte qui ont le plus évolué (format de delta()) : plus grande
+        ampleur totale (dim=None), ou plus forte hausse (UP) / baisse (DOWN) sur une dimension.
+        Les apprenants sans évolution dans le sens demandé sont omis.
+        """
+        if dim is not None and dim not in DIMS:
+            raise ValueError(f"dimension inconnue : {dim!r}")
+        if direction not in (UP, DOWN):
+            raise ValueError(f"direction inconnue : {direction!r}")
+        self.refresh()
+        with self._lock:
+            values = self._sorted.get((cohort or ALL_COHORTS, dim or MOVEMENT)) or []
+            if dim and direction == DOWN:
+                picked = [(-v, e) for v, e in values[:k]]
+            else:
+                picked = values[max(len(values) - k, 0):][::-1]
+            return [self._delta(email) for v, email in picked if v > 0]
+
+    def count(self, cohort: Optional[str] = None) -> int:
+        """Nombre d'apprenants de la cohorte ayant au moins deux passations."""
+        self.refresh()
+        with self._lock:
+            return len(self._sorted.get((cohort or ALL_COHORTS, MOVEMENT)) or [])
+
+
+@process_singleton
+def get_history_index() -> HistoryIndex:
+    return HistoryIndex()
@@ -0,0 +1,299 @@
+# components/item_analysis.py
+# Analyse psychométrique des items du questionnaire DISC, sur toutes les sessions du journal :
+# taux de sélection de chaque proposition, cohérence interne par dimension (KR-20 / alpha de
+# Cronbach) et corrélations item-total corrigées. Calculs NumPy sur une matrice sessions x questions
+# alimentée par la fin du journal ; résultats mis en cache par version du journal, export CSV.
+#
+#   python -m components.item_analysis --out Data/analyses
+#
+# Réserve : le questionnaire est à choix forcé (scores ipsatifs, total constant), ce qui tire
+# l'alpha et les corrélations item-total vers le bas ; à lire en relatif, question par question.
+import argparse
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from components.cache import get_shared_cache
+from components.disc_log import LogTail
+from components.disc_texts import DIMS
+from components.repository import DISC_LOG_PATH
+from components.sqlite_db import DATA_DIR
+
+ANALYSES_DIR = os.path.join(DATA_DIR, "analyses")
+MATRIX_SNAPSHOT_PATH = os.path.join(ANALYSES_DIR, "item_matrix.npz")
+RESULTS_TTL_S = 7 * 24 * 3600.0
+_DIM_CODES = {dim: code for code, dim in enumerate(DIMS)}
+
+
+@dataclass
+class ItemAnalysis:
+    n_sessions: int
+    n_complete: int  # sessions ayant répondu à toutes les questions (base des indices de cohérence)
+    options: pd.DataFrame  # qid, dim, choice, n, rate, item_total_r
+    dimensions: pd.DataFrame  # dim, n_items, alpha, mean, sd
+    log_version: str
+
+
+class ItemMatrix:
+    """
+    Réponses de toutes les sessions : matrice int8 (sessions x questions), code de l'énergie
+    choisie (0..3 pour D/I/S/C) ou -1 sans réponse. Lignes ajoutées par blocs à chaque refresh().
+    Avec snapshot_path, la matrice et la position de lecture sont enregistrées sur disque : un
+    nouveau process ne relit que les sessions ajoutées depuis (la lecture JSON domine le coût).
+    """
+
+    def __init__(self, tail: Optional[LogTail] = None, snapshot_path: Optional[str] = None):
+        self.tail = tail or LogTail()
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        self._reset()
+        if snapshot_path:
+            self._load_snapshot()
+
+    def _reset(self) -> None:
+        self._rows = np.full((0, 0), -1, dtype=np.int8)
+        self._n = 0
+        self.qids: List[int] = []
+        self._slot: Dict[int, int] = {}
+        self.texts: Dict[Tuple[int, str], str] = {}  # (qid, dim) -> libellé de la proposition
+
+    def refresh(self) -> bool:
+        """Lit les sessions ajoutées au journal ; True si la matrice a changé."""
+        with self._lock:
+            reset, records = self.tail.read_new()
+            if reset:
+                self._reset()
+            if records:
+                self._append(records)
+                if self.snapshot_path:
+                    self._save_snapshot()
+            return bool(reset or records)
+
+    def _append(self, records: List[Dict]) -> None:
+        # Une compréhension par session (qid, énergie) ; correspondances et libellés en NumPy
+        counts, flat_qids, flat_dims = [], [], []
+        for rec in records:
+            choices = rec.get("choices") or ()
+            try:
+                qids = [int(c["qid"]) for c in choices]
+                dims = [_DIM_CODES[c["dim"]] for c in choices]
+            except (KeyError, TypeError, ValueError):
+                qids, dims = [], []
+                for c in choices:
+                    try:
+                        qid, code = int(c["qid"]), _DIM_CODES[c["dim"]]
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    qids.append(qid)
+                    dims.append(code)
+            counts.append(len(qids))
+            flat_qids.extend(qids)
+            flat_dims.extend(dims)
+
+        qids_arr = np.array(flat_qids, dtype=np.int64)
+        codes = np.array(flat_dims, dtype=np.int8)
+        uniq, inverse = np.unique(qids_arr, return_inverse=True)
+        for qid in uniq.tolist():
+            if qid not in self._slot:
+                self._slot[qid] = len(self.qids)
+                self.qids.append(qid)
+        slots = np.array([self._slot[q] for q in uniq.tolist()], dtype=np.int64)[inverse]
+
+        # Libellé de chaque proposition jamais vue : première occurrence de (question, énergie)
+        combos, first = np.unique(slots * len(DIMS) + codes, return_index=True)
+        starts = np.cumsum([0] + counts[:-1])
+        for combo, idx in zip(combos.tolist(), first.tolist()):
+            qid, dim = self.qids[combo // len(DIMS)], DIMS[combo % len(DIMS)]
+            if (qid, dim) not in self.texts:
+                rec_i = int(np.searchsorted(starts, idx, side="right") - 1)
+                for c in records[rec_i].get("choices") or ():
+                    if isinstance(c, dict) and str(c.get("qid")) == str(qid) and c.get("dim") == dim:
+                        self.texts[(qid, dim)] = str(c.get("choice") or "")
+                        break
+
+        needed = self._n + len(records)
+        if needed > self._rows.shape[0] or len(self.qids) > self._rows.shape[1]:
+            grown = np.full((max(needed, 2 * self._rows.shape[0]), len(self.qids)), -1, dtype=np.int8)
+            grown[: self._n, : self._rows.shape[1]] = self._rows[: self._n]
+            self._rows = grown
+        rows = self._n + np.repeat(np.arange(len(records)), counts)
+        self._rows[self._n : needed] = -1
+        self._rows[rows, slots] = codes
+        self._n = needed
+
+    def _save_snapshot(self) -> None:
+        folder = os.path.dirname(self.snapshot_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        inode, offset = self.tail.version
+        meta = {"inode": inode, "offset": offset, "qids": self.qids,
+                "texts": [[q, d, t] for (q, d), t in self.texts.items()]}
+        tmp = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, rows=self._rows[: self._n], meta=np.array(json.dumps(meta, ensure_ascii=False)))
+        os.replace(tmp, self.snapshot_path)
+
+    def _load_snapshot(self) -> None:
+        try:
+            with np.load(self.snapshot_path) as data:
+                rows = data["rows"]
+                meta = json.loads(str(data["meta"]))
+        except (OSError, ValueError, KeyError):
+            return
+        self._rows, self._n = rows.astype(np.int8), len(rows)
+        self.qids = [int(q) for q in meta["qids"]]
+        self._slot = {q: s for s, q in enumerate(self.qids)}
+        self.texts = {(int(q), d): t for q, d, t in meta["texts"]}
+        self.tail.resume(meta["inode"], meta["offset"])
+
+    def matrix(self) -> np.ndarray:
+        """Copie de la matrice (sessions x questions), colonnes dans l'ordre de self.qids."""
+        with self._lock:
+            return self._rows[: self._n].copy()
+
+
+# ---------------------------------------------------------
+# Indicateurs
+# ---------------------------------------------------------
+
+def _kr20(items: np.ndarray) -> float:
+    """Alpha de Cronbach (= KR-20 pour des items 0/1) ; NaN si moins de deux items ou variance nulle."""
+    k = items.shape[1]
+    if k < 2 or items.shape[0] < 2:
+        return float("nan")
+    total_var = items.sum(axis=1).var(ddof=1)
+    if total_var <= 0:
+        return float("nan")
+    return float(k / (k - 1) * (1 - items.var(axis=0, ddof=1).sum() / total_var))
+
+
+def _item_total(items: np.ndarray) -> np.ndarray:
+    """Corrélation de chaque item avec le total des autres items de la même dimension."""
+    rest = items.sum(axis=1, keepdims=True) - items
+    xc = items - items.mean(axis=0)
+    rc = rest - rest.mean(axis=0)
+    denom = np.sqrt((xc ** 2).sum(axis=0) * (rc ** 2).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denom > 0, (xc * rc).sum(axis=0) / denom, np.nan)
+
+
+def analyze_matrix(m: np.ndarray, qids: List[int], texts: Dict[Tuple[int, str], str],
+                   log_version: str = "") -> ItemAnalysis:
+    n, n_q = m.shape
+    answered = (m >= 0).sum(axis=0)
+    complete = m[(m >= 0).all(axis=1)] if n_q else m
+
+    option_rows, dim_rows = [], []
+    for code, dim in enumerate(DIMS):
+        counts = (m == code).sum(axis=0)
+        offered = np.array([(qid, dim) in texts for qid in qids], dtype=bool)
+        items = (complete[:, offered] == code).astype(np.float64)
+        r = _item_total(items) if items.size else np.zeros(0)
+        r_by_slot = dict(zip(np.flatnonzero(offered), r))
+
+        for s in np.flatnonzero(offered):
+            option_rows.append(
+                {
+                    "qid": qids[s],
+                    "dim": dim,
+                    "choice": texts[(qids[s], dim)],
+                    "n": int(counts[s]),
+                    "rate": counts[s] / answered[s] if answered[s] else np.nan,
+                    "item_total_r": r_by_slot.get(s, np.nan),
+                }
+            )
+        totals = items.sum(axis=1)
+        dim_rows.append(
+            {
+                "dim": dim,
+                "n_items": int(offered.sum()),
+                "alpha": _kr20(items),
+                "mean": float(totals.mean()) if len(totals) else np.nan,
+                "sd": float(totals.std(ddof=1)) if len(totals) > 1 else np.nan,
+            }
+        )
+
+    options = pd.DataFrame(option_rows, columns=["qid", "dim", "choice", "n", "rate", "item_total_r"])
+    options = options.sort_values(["qid", "dim"]).reset_index(drop=True)
+    return ItemAnalysis(
+        n_sessions=n,
+        n_complete=len(complete),
+        options=options,
+        dimensions=pd.DataFrame(dim_rows, columns=["dim", "n_items", "alpha", "mean", "sd"]),
+        log_version=log_version,
+    )
+
+
+# ---------------------------------------------------------
+# Cache par version du journal
+# ---------------------------------------------------------
+
+def log_version(path: str = DISC_LOG_PATH) -> str:
+    """(inode, taille, mtime) du journal : change à chaque ajout, sans lire le fichier."""
+    try:
+        st_ = os.stat(path)
+    except OSError:
+        return "absent"
+    return f"{st_.st_ino}:{st_.st_size}:{st_.st_mtime_ns}"
+
+
+_matrices_lock = threading.Lock()
+_matrices: Dict[str, ItemMatrix] = {}
+
+
+def get_item_analysis(path: str = DISC_LOG_PATH, cache=None, snapshot_path: Optional[str] = None) -> ItemAnalysis:
+    """
+    Analyse à jour du journal. Même version du journal : résultat du cache partagé (aucune
+    lecture) ; sinon seules les lignes ajoutées sont lues avant de recalculer. La matrice du
+    journal de l'application est enregistrée dans MATRIX_SNAPSHOT_PATH (sauf snapshot_path).
+    """
+    cache = cache if cache is not None else get_shared_cache()
+    version = log_version(path)
+    key = f"items:{os.path.abspath(path)}:{version}"
+
+    def _compute() -> ItemAnalysis:
+        with _matrices_lock:
+            matrix = _matrices.get(os.path.abspath(path))
+            if matrix is None:
+                snapshot = snapshot_path
+                if snapshot is None and os.path.abspath(path) == os.path.abspath(DISC_LOG_PATH):
+                    snapshot = MATRIX_SNAPSHOT_PATH
+                matrix = _matrices[os.path.abspath(path)] = ItemMatrix(LogTail(path), snapshot_path=snapshot)
+        matrix.refresh()
+        return analyze_matrix(matrix.matrix(), list(matrix.qids), dict(matrix.texts), version)
+
+    return cache.get_or_set(key, _compute, ttl_s=RESULTS_TTL_S)
+
+
+def export_csv(analysis: ItemAnalysis, out_dir: str) -> List[str]:
+    """Écrit item_options.csv et item_dimensions.csv ; retourne les chemins."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, "item_options.csv"), os.path.join(out_dir, "item_dimensions.csv")]
+    analysis.options.to_csv(paths[0], index=False)
+    analysis.dimensions.to_csv(paths[1], index=False)
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Analyse des items du questionnaire DISC.")
+    parser.add_argument("--log", default=DISC_LOG_PATH)
+    parser.add_argument("--out", help="dossier des CSV (sinon affichage)")
+    args = parser.parse_args(argv)
+
+    analysis = get_item_analysis(args.log)
+    n_questions = analysis.options["qid"].nunique()
+    print(f"{analysis.n_sessions} sessions ({analysis.n_complete} complètes), {n_questions} questions")
+    if args.out:
+        for path in export_csv(analysis, args.out):
+            print(path)
+    else:
+        print(analysis.dimensions.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
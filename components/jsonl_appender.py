@@ -0,0 +1,201 @@
+# components/jsonl_appender.py
+# Ajouts concurrents dans un journal JSONL (ex. sessions DISC), sûrs entre threads et entre process :
+# - verrou fichier (flock) autour de chaque écriture : les lignes ne s'entremêlent jamais
+# - group commit : les soumissions simultanées d'un process partent en une écriture + un fsync
+# - idempotence : un enregistrement dont l'identifiant est déjà dans le journal n'est pas réécrit
+#   (en mémoire : identifiant -> position de la ligne ; la ligne n'est relue qu'en cas de doublon)
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows (poste de dev, un seul process) : verrou de thread uniquement
+    fcntl = None
+
+GROUP_COMMIT_WINDOW_S = 0.002  # attente du premier écrivain pour regrouper les soumissions simultanées
+MAX_BATCH = 256
+ID_FIELD = "submission_id"
+SCAN_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+class _Pending:
+    __slots__ = ("record", "done", "result", "error")
+
+    def __init__(self, record: Dict[str, Any]):
+        self.record = record
+        self.done = threading.Event()
+        self.result: Optional[Tuple[Dict[str, Any], bool]] = None
+        self.error: Optional[BaseException] = None
+
+
+class JsonlAppender:
+    """
+    append(record) -> (enregistrement du journal, True s'il vient d'être écrit).
+    Le premier thread qui soumet devient écrivain : il attend window_s, prend toutes les
+    soumissions en attente, puis, sous le verrou fichier, relit la fin du journal (lignes
+    écrites par les autres process), écarte les doublons et écrit le lot d'un seul bloc.
+    Les identifiants sont repérés sans décoder les lignes ; le gros du journal est parcouru
+    avant de prendre le verrou, qui ne couvre que les dernières lignes.
+    """
+
+    def __init__(self, path: str, id_field: str = ID_FIELD, window_s: float = GROUP_COMMIT_WINDOW_S,
+                 fsync: bool = True):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.id_field = id_field
+        self.window_s = window_s
+        self.fsync = fsync
+        self._cond = threading.Lock()
+        self._queue: List[_Pending] = []
+        self._writing = False
+        self._id_pattern = re.compile(rb'"' + re.escape(id_field.encode("utf-8")) + rb'":\s*"((?:[^"\\]|\\.)*)"')
+        self._inode: Any = None
+        self._offset = 0  # octets du journal déjà parcourus
+        self._known: Dict[str, int] = {}  # identifiant -> position de sa ligne dans le journal
+        self.batches = 0  # nombre d'écritures (statistique, tests)
+
+    def append(self, record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        item = _Pending(record)
+        with self._cond:
+            self._queue.append(item)
+            leader = not self._writing
+            self._writing = True
+        if leader:
+            if self.window_s:
+                time.sleep(self.window_s)
+            self._drain()
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def _drain(self) -> None:
+        while True:
+            with self._cond:
+                batch, self._queue = self._queue[:MAX_BATCH], self._queue[MAX_BATCH:]
+                if not batch:
+                    self._writing = False
+                    return
+            try:
+                results = self._write_batch([p.record for p in batch])
+            except BaseException as exc:  # noqa: BLE001 - transmis à chaque soumission du lot
+                for p in batch:
+                    p.error = exc
+                    p.done.set()
+                continue
+            for p, result in zip(batch, results):
+                p.result = result
+                p.done.set()
+
+    def _sync_known(self) -> None:
+        """Repère les identifiants des lignes ajoutées depuis le dernier passage (journal réécrit : tout est relu)."""
+        try:
+            st_ = os.stat(self.path)
+        except OSError:
+            self._inode, self._offset = None, 0
+            self._known.clear()
+            return
+        if st_.st_ino != self._inode or st_.st_size < self._offset:
+            self._inode, self._offset = st_.st_ino, 0
+            self._known.clear()
+        if st_.st_size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            while True:
+                chunk = f.read(SCAN_CHUNK_BYTES)
+                end = chunk.rfind(b"\n") + 1
+                if not end:
+                    if len(chunk) < SCAN_CHUNK_BYTES:
+                        break  # ligne en cours d'écriture : relue au prochain passage
+                    # Ligne plus longue qu'un bloc : elle est parcourue en entier d'une traite
+                    chunk += f.readline()
+                    end = chunk.rfind(b"\n") + 1
+                    if not end:
+                        break
+                for m in self._id_pattern.finditer(chunk, 0, end):
+                    raw = m.group(1)
+                    try:
+                        rid = json.loads(b'"' + raw + b'"') if b"\\" in raw else raw.decode("utf-8")
+                    except ValueError:
+                        continue
+                    line_start = chunk.rfind(b"\n", 0, m.start()) + 1
+                    self._known.setdefault(str(rid), self._offset + line_start)
+                self._offset += end
+                f.seek(self._offset)
+
+    def _read_known(self, rid: str) -> Optional[Dict[str, Any]]:
+        """Enregistrement du journal portant cet identifiant (une seule ligne relue)."""
+        with open(self.path, "rb") as f:
+            f.seek(self._known[rid])
+            try:
+                rec = json.loads(f.readline())
+            except ValueError:
+                return None
+        return rec if isinstance(rec, dict) and str(rec.get(self.id_field)) == rid else None
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], bool]]:
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._sync_known()  # hors verrou : rattrapage du journal (premier appel : fichier entier)
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._sync_known()
+                results, lines = [], []
+                in_batch: Dict[str, Dict[str, Any]] = {}
+                for rec in records:
+                    rid = rec.get(self.id_field)
+                    rid = str(rid) if rid else None
+                    if rid in in_batch:
+                        results.append((in_batch[rid], False))
+                        continue
+                    if rid and rid in self._known:
+                        existing = self._read_known(rid)
+                        if existing is not None:
+                            results.append((existing, False))
+                            continue
+                    if rid:
+                        in_batch[rid] = rec
+                    results.append((rec, True))
+                    lines.append(json.dumps(rec, ensure_ascii=False) + "\n")
+                if lines:
+                    self._write_lines(lines)
+                    self.batches += 1
+                    self._sync_known()  # positions des lignes qui viennent d'être écrites
+                return results
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write_lines(self, lines: List[str]) -> None:
+        with open(self.path, "ab") as f:
+            # Ligne incomplète laissée par un écrivain interrompu : on la termine plutôt que de la prolonger
+            if f.tell() > 0:
+                with open(self.path, "rb") as r:
+                    r.seek(-1, os.SEEK_END)
+                    if r.read(1) != b"\n":
+                        lines.insert(0, "\n")
+            f.write("".join(lines).encode("utf-8"))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+
+_appenders_lock = threading.Lock()
+_appenders: Dict[str, JsonlAppender] = {}
+
+
+def get_appender(path: str) -> JsonlAppender:
+    """Un appender par fichier et par process (le group commit n'a de sens que partagé)."""
+    path = os.path.abspath(path)
+    with _appenders_lock:
+        if path not in _appenders:
+            _appenders[path] = JsonlAppender(path)
+        return _appenders[path]
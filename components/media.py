@@ -0,0 +1,103 @@
+# components/media.py
+# Médias servis par URL (static serving Streamlit) plutôt qu'inlinés en base64
+import html
+import os
+import shutil
+import subprocess
+from typing import Optional
+
+import streamlit as st
+
+# Dossier servi par Streamlit quand server.enableStaticServing = true (.streamlit/config.toml)
+STATIC_DIR = "static"
+STATIC_URL_PREFIX = "app/static"
+ASSETS_DIR = "assets"
+
+
+def static_serving_enabled() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def static_url(filename: str) -> Optional[str]:
+    """URL relative d'un fichier de ./static, ou None s'il n'est pas servi."""
+    if not static_serving_enabled():
+        return None
+    if not os.path.isfile(os.path.join(STATIC_DIR, filename)):
+        return None
+    return f"{STATIC_URL_PREFIX}/{filename}"
+
+
+def poster_filename(video_filename: str) -> str:
+    return os.path.splitext(video_filename)[0] + ".jpg"
+
+
+def precompute_poster(video_path: str, poster_path: Optional[str] = None, at_seconds: float = 1.0) -> Optional[str]:
+    """
+    Extrait une image de la vidéo (ffmpeg) pour servir de vignette.
+    Ne refait rien si la vignette est plus récente que la vidéo. Retourne le chemin, ou None.
+    """
+    poster_path = poster_path or poster_filename(video_path)
+    if not os.path.isfile(video_path):
+        return None
+    if os.path.isfile(poster_path) and os.path.getmtime(poster_path) >= os.path.getmtime(video_path):
+        return poster_path
+    if shutil.which("ffmpeg") is None:
+        return None
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-ss", str(at_seconds), "-i", video_path,
+                "-frames:v", "1", "-vf", "scale=520:-2",
+                poster_path,
+            ],
+            check=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return poster_path if os.path.isfile(poster_path) else None
+
+
+def render_video(filename: str, width: int = 260, missing_msg: str = "") -> None:
+    """
+    Affiche une vidéo sans la relire ni la réencoder à chaque rerun :
+    - fichier dans ./static : balise <video> pointant sur l'URL statique
+      (requêtes Range + ETag/Last-Modified gérés par le serveur, cache navigateur)
+    - sinon : st.video, servi par le media file manager de Streamlit
+    """
+    url = static_url(filename)
+    if url:
+        poster = static_url(poster_filename(filename))
+        poster_attr = f' poster="{html.escape(poster)}"' if poster else ""
+        st.markdown(
+            f"""
+        <video width="{int(width)}" controls preload="metadata"{poster_attr}>
+            <source src="{html.escape(url)}" type="video/mp4">
+            Votre navigateur ne supporte pas la lecture vidéo.
+        </video>
+        """,
+            unsafe_allow_html=True,
+        )
+        return
+
+    for folder in (STATIC_DIR, ASSETS_DIR):
+        path = os.path.join(folder, filename)
+        if os.path.isfile(path):
+            st.video(path)
+            return
+
+    if missing_msg:
+        st.info(missing_msg)
+
+
+if __name__ == "__main__":
+    # Pré-calcul des vignettes : python -m components.media
+    if os.path.isdir(STATIC_DIR):
+        for name in sorted(os.listdir(STATIC_DIR)):
+            if name.lower().endswith((".mp4", ".webm", ".mov")):
+                out = precompute_poster(os.path.join(STATIC_DIR, name))
+                print(f"{name}: {out or 'vignette non générée (ffmpeg absent ?)'}")
@@ -0,0 +1,173 @@
+# components/openai_gateway.py
+# Accès OpenAI partagé par le process : un client (pool de connexions), un nombre
+# borné d'appels simultanés, des délais maximum et des métriques pour le fallback.
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from components.concurrency import process_singleton
+
+MAX_CONCURRENT_CALLS = 8
+QUEUE_TIMEOUT_S = 2.0      # attente max d'une place avant de passer au fallback
+CALL_TIMEOUT_S = 20.0      # délai max d'un appel (non streaming) / entre deux événements
+STREAM_DEADLINE_S = 45.0   # durée totale max d'une génération en streaming
+
+# Décision de fallback à partir des appels récents
+METRICS_WINDOW_S = 120.0
+MIN_SAMPLES = 4
+MAX_ERROR_RATE = 0.5
+MAX_P50_LATENCY_S = 15.0
+
+
+class GatewayBusy(RuntimeError):
+    """Pas de place libre dans le délai imparti : le fallback local prend le relais."""
+
+
+class DeadlineExceeded(RuntimeError):
+    """La génération a dépassé son délai maximum."""
+
+
+def make_client(openai_cls, api_key: str, timeout_s: float = CALL_TIMEOUT_S):
+    """
+    Client OpenAI à partager dans le process : il garde son pool de connexions HTTP
+    (keep-alive) ; le nombre de sockets ouverts est borné par le sémaphore de la passerelle.
+    """
+    return openai_cls(api_key=api_key, timeout=timeout_s, max_retries=0)
+
+
+class GatewayMetrics:
+    """
+    Attente en file et latence des derniers appels (fenêtre glissante). Les demandes refusées
+    faute de place sont comptées à part (rejected) : elles ne disent rien de la santé de l'API
+    et n'entrent ni dans le taux d'erreur ni dans les latences.
+    """
+
+    def __init__(self, window_s: float = METRICS_WINDOW_S):
+        self.window_s = window_s
+        self._lock = threading.Lock()
+        self._calls: Deque[Tuple[float, float, float, bool]] = deque()  # (fin, attente, latence, ok)
+        self._rejected: Deque[float] = deque()  # instants des refus
+        self.waiting = 0
+        self.in_flight = 0
+
+    def record(self, queue_wait_s: float, latency_s: float, ok: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._calls.append((now, queue_wait_s, latency_s, ok))
+            self._trim(now)
+
+    def reject(self) -> None:
+        """Demande refusée : aucune place libre dans le délai d'attente."""
+        now = time.monotonic()
+        with self._lock:
+            self._rejected.append(now)
+            self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window_s:
+            self._calls.popleft()
+        while self._rejected and now - self._rejected[0] > self.window_s:
+            self._rejected.popleft()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(time.monotonic())
+            calls = list(self._calls)
+            rejected = len(self._rejected)
+            waiting, in_flight = self.waiting, self.in_flight
+        latencies = sorted(c[2] for c in calls)
+        waits = sorted(c[1] for c in calls)
+        n = len(calls)
+        return {
+            "calls": n,
+            "errors": sum(1 for c in calls if not c[3]),
+            "error_rate": (sum(1 for c in calls if not c[3]) / n) if n else 0.0,
+            "p50_latency_s": latencies[n // 2] if n else 0.0,
+            "p95_latency_s": latencies[min(n - 1, int(n * 0.95))] if n else 0.0,
+            "p95_queue_wait_s": waits[min(n - 1, int(n * 0.95))] if n else 0.0,
+            "rejected": rejected,
+            "waiting": waiting,
+            "in_flight": in_flight,
+        }
+
+
+class OpenAIGateway:
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_CALLS,
+        queue_timeout_s: float = QUEUE_TIMEOUT_S,
+        metrics: Optional[GatewayMetrics] = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self.queue_timeout_s = queue_timeout_s
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self.metrics = metrics or GatewayMetrics()
+
+    def should_fallback(self) -> Optional[str]:
+        """Raison de passer directement au fallback local, ou None si l'IA est utilisable."""
+        snap = self.metrics.snapshot()
+        if snap["waiting"] >= self.max_concurrent:
+            return "file d'attente pleine"
+        if snap["calls"] >= MIN_SAMPLES:
+            if snap["error_rate"] > MAX_ERROR_RATE:
+                return "trop d'erreurs récentes"
+            if snap["p50_latency_s"] > MAX_P50_LATENCY_S:
+                return "latence trop élevée"
+        return None
+
+    @contextmanager
+    def slot(self) -> Iterator[float]:
+        """Réserve une place d'appel ; lève GatewayBusy si l'attente dépasse queue_timeout_s."""
+        reason = self.should_fallback()
+        if reason:
+            raise GatewayBusy(reason)
+
+        t0 = time.monotonic()
+        with self.metrics._lock:
+            self.metrics.waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=self.queue_timeout_s)
+        finally:
+            with self.metrics._lock:
+                self.metrics.waiting -= 1
+        queue_wait = time.monotonic() - t0
+        if not acquired:
+            self.metrics.reject()
+            raise GatewayBusy("aucune place libre")
+
+        with self.metrics._lock:
+            self.metrics.in_flight += 1
+        start = time.monotonic()
+        ok = False
+        try:
+            yield queue_wait
+            ok = True
+        except GeneratorExit:
+            # Abandon côté appelant (rerun, navigation) : pas une erreur de l'API
+            ok = True
+            raise
+        finally:
+            with self.metrics._lock:
+                self.metrics.in_flight -= 1
+            self._slots.release()
+            self.metrics.record(queue_wait, time.monotonic() - start, ok)
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        with self.slot():
+            return fn()
+
+    def stream(self, open_stream: Callable[[], Iterator[Any]], deadline_s: float = STREAM_DEADLINE_S) -> Iterator[Any]:
+        """Relaye un stream en gardant sa place jusqu'à la fin, avec un délai total maximum."""
+        with self.slot():
+            started = time.monotonic()
+            for item in open_stream():
+                if time.monotonic() - started > deadline_s:
+                    raise DeadlineExceeded(f"génération > {deadline_s:.0f}s")
+                yield item
+
+
+@process_singleton
+def get_gateway() -> OpenAIGateway:
+    return OpenAIGateway()
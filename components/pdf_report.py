@@ -0,0 +1,287 @@
+# components/pdf_report.py
+# Synthèse DISC en PDF, construite entièrement en mémoire :
+# - images (radar) embarquées depuis des bytes, sans fichier temporaire, décodées une seule fois
+# - bloc de textes statiques (forces / axes) mis en page une fois par combinaison (top1, top2)
+# - PDF complets mis en cache par empreinte de leurs entrées (get_or_build_pdf)
+import hashlib
+import io
+import json
+import struct
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fpdf import FPDF
+from PIL import Image
+
+from components.blob_store import BlobRef, get_blob_store
+from components.cache import MemoryCache, get_shared_cache
+from components.disc_texts import DIM_DEV, DIM_EXCESS, DIM_LABELS, DIM_NATURAL_STRENGTHS, DIMS
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# À incrémenter à chaque changement de mise en page : invalide les PDF déjà en cache
+TEMPLATE_VERSION = 1
+PDF_CACHE_TTL_S = 7 * 24 * 3600.0
+
+# Images décodées par empreinte, blocs statiques par (top1, top2) : 4 x 3 = 12 combinaisons
+_image_infos = MemoryCache(ttl_s=None, max_entries=64)
+_static_blocks = MemoryCache(ttl_s=None, max_entries=32)
+
+
+def sanitize(text: str) -> str:
+    """Convertit tout texte en latin-1 compatible pour FPDF."""
+    if text is None:
+        return ""
+    return text.encode("latin-1", "ignore").decode("latin-1")
+
+
+# ---------------------------------------------------------
+# Images en mémoire
+# ---------------------------------------------------------
+
+def _png_rgb_info(data: bytes) -> Dict:
+    """
+    Infos d'image au format attendu par FPDF (1.7.x) pour un PNG quelconque.
+    L'image est aplatie en RVB sur fond blanc : FPDF sépare la couche alpha pixel par pixel
+    en Python (très lent) ; sans alpha, les données IDAT sont reprises telles quelles.
+    """
+    img = Image.open(io.BytesIO(data))
+    if img.mode != "RGB":
+        rgba = img.convert("RGBA")
+        img = Image.new("RGB", rgba.size, (255, 255, 255))
+        img.paste(rgba, mask=rgba.getchannel("A"))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    png = buf.getvalue()
+
+    idat = []
+    pos = len(PNG_SIGNATURE)
+    while pos < len(png):
+        (length,) = struct.unpack(">I", png[pos : pos + 4])
+        kind = png[pos + 4 : pos + 8]
+        if kind == b"IDAT":
+            idat.append(png[pos + 8 : pos + 8 + length])
+        elif kind == b"IEND":
+            break
+        pos += 12 + length
+
+    w, h = img.size
+    return {
+        "w": w,
+        "h": h,
+        "cs": "DeviceRGB",
+        "bpc": 8,
+        "f": "FlateDecode",
+        "dp": f"/Predictor 15 /Colors 3 /BitsPerComponent 8 /Columns {w}",
+        "pal": "",
+        "trns": "",
+        "data": b"".join(idat),
+    }
+
+
+class ReportPDF(FPDF):
+    """FPDF qui accepte des images en bytes (image_bytes) en plus des chemins de fichiers."""
+
+    def image_bytes(self, data: bytes, x=None, y=None, w=0, h=0, link=""):
+        digest = hashlib.sha1(data).hexdigest()
+        name = f"mem:{digest}.png"
+        if name not in self.images:
+            info = _image_infos.get_or_set(digest, lambda: _png_rgb_info(data))
+            # Copie : FPDF retire "data" de l'info une fois le document écrit
+            self.images[name] = dict(info, i=len(self.images) + 1)
+        self.image(name, x=x, y=y, w=w, h=h, link=link)
+
+
+# ---------------------------------------------------------
+# Mise en page
+# ---------------------------------------------------------
+
+def _top_dims(ordered_dims: Sequence) -> Tuple[str, str]:
+    return ordered_dims[0][0], ordered_dims[1][0]
+
+
+def _new_pdf() -> ReportPDF:
+    pdf = ReportPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    return pdf
+
+
+def _header(pdf: FPDF, email: str, scores: Dict) -> None:
+    """En-tête : hauteur fixe (cellules sur une ligne), le bloc statique commence toujours au même y."""
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, sanitize("Profil DISC - Synthese personnelle"), ln=True)
+
+    pdf.set_font("Arial", "", 11)
+    pdf.cell(0, 8, sanitize(f"Email : {email}"), ln=True)
+    pdf.ln(2)
+
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Scores detaillees :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    scores_line = f"D : {scores['D']}, I : {scores['I']}, S : {scores['S']}, C : {scores['C']}"
+    pdf.cell(0, 8, sanitize(scores_line), ln=True)
+    pdf.ln(4)
+
+
+def _static_block(pdf: FPDF, top: Tuple[str, str]) -> None:
+    """Points forts + axes de réflexion : ne dépend que des deux dimensions dominantes."""
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Vos points forts naturels :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    for dim in top:
+        pdf.multi_cell(0, 6, sanitize(f"- {DIM_LABELS[dim][0]} ({dim}) : {DIM_NATURAL_STRENGTHS[dim]}"))
+    pdf.ln(2)
+
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Axes de reflexion pour progresser :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    pdf.multi_cell(0, 6, sanitize("Utiliser vos forces sans tomber dans leurs exces :"))
+    for dim in top:
+        pdf.multi_cell(0, 6, sanitize(f"- {DIM_LABELS[dim][0]} ({dim}) : {DIM_EXCESS[dim]}"))
+    pdf.ln(1)
+    pdf.multi_cell(0, 6, sanitize("Developper davantage vos energies moins naturelles :"))
+    for dim in DIMS:
+        if dim not in top:
+            pdf.multi_cell(0, 6, sanitize(f"- {DIM_LABELS[dim][0]} ({dim}) : {DIM_DEV[dim]}"))
+    pdf.ln(2)
+
+
+# État du curseur et de la police restauré après rejeu du bloc statique
+_CURSOR_ATTRS = (
+    "x", "y", "lasth", "ws", "underline", "font_family", "font_style", "font_size_pt", "font_size", "unifontsubset",
+)
+
+
+def _position(pdf: FPDF) -> Tuple:
+    return pdf.page, round(pdf.y, 6), tuple(pdf.fonts)
+
+
+def _render_static_block(top: Tuple[str, str]) -> Dict:
+    """
+    Met en page le bloc statique une fois, après un en-tête identique, et enregistre
+    les opérateurs PDF produits + l'état final du curseur ({} si le bloc déborde de la page).
+    """
+    pdf = _new_pdf()
+    _header(pdf, email="", scores={d: 0 for d in DIMS})
+    at, offset = _position(pdf), len(pdf.pages[pdf.page])
+    _static_block(pdf, top)
+    if pdf.page != at[0]:
+        return {}
+    return {
+        "at": at,
+        "ops": pdf.pages[pdf.page][offset:],
+        "state": {attr: getattr(pdf, attr) for attr in _CURSOR_ATTRS},
+        "fontkey": next(k for k, f in pdf.fonts.items() if f is pdf.current_font),
+    }
+
+
+def _replay_static_block(pdf: FPDF, top: Tuple[str, str]) -> None:
+    block = _static_blocks.get_or_set(top, lambda: _render_static_block(top))
+    # Garde-fou : même page, même position et mêmes polices que lors de l'enregistrement
+    if not block or _position(pdf) != block["at"]:
+        _static_block(pdf, top)
+        return
+    pdf.pages[pdf.page] += block["ops"]
+    for attr, value in block["state"].items():
+        setattr(pdf, attr, value)
+    pdf.current_font = pdf.fonts[block["fontkey"]]
+
+
+def build_pdf(
+    email: str,
+    scores: dict,
+    ordered_dims,
+    situation_success: str,
+    situation_difficult: str,
+    radar_png: Optional[bytes] = None,
+) -> bytes:
+    """Synthèse DISC (en-tête + bloc statique mis en cache + radar + plan d'action), en bytes."""
+    pdf = _new_pdf()
+    _header(pdf, email, scores)
+    _replay_static_block(pdf, _top_dims(ordered_dims))
+
+    # Page radar
+    if radar_png:
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 14)
+        pdf.cell(0, 8, sanitize("Votre profil DISC (radar)"), ln=True)
+        pdf.ln(4)
+        pdf.image_bytes(radar_png, x=25, y=None, w=160)
+
+    # Page plan d'action
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Plan d'action - Situation reussie :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    pdf.multi_cell(0, 6, sanitize(situation_success or "(non renseigne)"))
+    pdf.ln(1)
+
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, sanitize("Plan d'action - Situation difficile :"), ln=True)
+    pdf.set_font("Arial", "", 11)
+    pdf.multi_cell(0, 6, sanitize(situation_difficult or "(non renseigne)"))
+
+    return pdf.output(dest="S").encode("latin-1", "ignore")
+
+
+def build_pdfs(items: Iterable[Dict]) -> List[bytes]:
+    """Construction en lot (mêmes arguments que build_pdf, un dict par apprenant)."""
+    return [build_pdf(**item) for item in items]
+
+
+# ---------------------------------------------------------
+# Cache des PDF complets
+# ---------------------------------------------------------
+
+def pdf_cache_key(
+    email: str,
+    scores: dict,
+    ordered_dims,
+    situation_success: str,
+    situation_difficult: str,
+    radar_png: Optional[bytes] = None,
+) -> str:
+    """Empreinte des entrées du PDF (et de la version du gabarit) : mêmes entrées, même clé."""
+    canonical = json.dumps(
+        {
+            "template": TEMPLATE_VERSION,
+            "email": (email or "").strip().lower(),
+            "scores": {d: scores.get(d) for d in DIMS},
+            "dims": [d for d, _ in ordered_dims],
+            "success": situation_success or "",
+            "difficult": situation_difficult or "",
+            "radar": hashlib.sha256(radar_png).hexdigest() if radar_png else None,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_or_build_pdf(**inputs) -> Tuple[bytes, str]:
+    """
+    (pdf_bytes, clé) : le PDF déjà généré pour ces entrées (tous process confondus), sinon
+    construit et rangé dans le blob store ; le cache partagé ne garde que la référence.
+    """
+    key = pdf_cache_key(**inputs)
+    cache_key = "pdf:" + key
+    cache, blobs = get_shared_cache(), get_blob_store()
+
+    ref = cache.get(cache_key)
+    if isinstance(ref, BlobRef):
+        data = blobs.get(ref)
+        if data is not None:
+            return data, key
+        cache.delete(cache_key)  # blob purgé entre-temps
+
+    built: Dict[str, bytes] = {}
+
+    def _build() -> BlobRef:
+        built["pdf"] = build_pdf(**inputs)
+        return blobs.put(built["pdf"], mime="application/pdf")
+
+    ref = cache.get_or_set(cache_key, _build, ttl_s=PDF_CACHE_TTL_S)
+    data = built.get("pdf") or blobs.get(ref)
+    if data is None:  # très improbable : purgé juste après une construction concurrente
+        data = build_pdf(**inputs)
+    return data, key
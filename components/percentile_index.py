@@ -0,0 +1,108 @@
+# components/percentile_index.py
+# Position d'un score DISC dans sa cohorte ("votre D est au 80e percentile") :
+# tableaux de scores triés par (cohorte, dimension), mis à jour à chaque nouvelle session,
+# interrogés par recherche dichotomique (bisect) : quelques microsecondes par requête.
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from components.concurrency import process_singleton
+from components.disc_log import ALL_COHORTS, LogIndex
+from components.disc_texts import DIMS
+from components.profile_store import normalize_email
+
+
+class PercentileIndex(LogIndex):
+    """
+    Une seule entrée par apprenant : sa dernière session (refaire le questionnaire remplace
+    ses scores au lieu de les compter deux fois). Les apprenants hors liste sont comptés
+    uniquement dans ALL_COHORTS. Un rechargement des CSV de cohortes reconstruit l'index.
+    """
+
+    def _reset(self) -> None:
+        self._latest: Dict[str, Tuple[Optional[str], Dict[str, int]]] = {}  # email -> (cohorte, scores)
+        self._sorted: Dict[Tuple[str, str], List[int]] = {}  # (cohorte, dim) -> scores triés
+
+    # ---------------------------------------------------------
+    # Mise à jour
+    # ---------------------------------------------------------
+
+    def _remove(self, email: str) -> None:
+        cohort, scores = self._latest.pop(email)
+        for group in self._groups(cohort):
+            for dim in DIMS:
+                values = self._sorted[(group, dim)]
+                del values[bisect_left(values, scores[dim])]
+
+    def _add(self, email: str, scores: Dict[str, int]) -> None:
+        cohort = self.allowlist.cohort_of(email)
+        self._latest[email] = (cohort, scores)
+        for group in self._groups(cohort):
+            for dim in DIMS:
+                insort(self._sorted.setdefault((group, dim), []), scores[dim])
+
+    def add_sessions(self, records: List[Dict]) -> int:
+        """Prend en compte des sessions (dicts du journal) ; retourne le nombre retenu."""
+        added = 0
+        for record in records:
+            email = normalize_email(record.get("user") or record.get("email"))
+            raw = record.get("scores") or {}
+            try:
+                scores = {dim: int(raw.get(dim, 0)) for dim in DIMS}
+            except (TypeError, ValueError):
+                continue
+            if not email:
+                continue
+            with self._lock:
+                if email in self._latest:
+                    self._remove(email)
+                self._add(email, scores)
+            added += 1
+        return added
+
+    # ---------------------------------------------------------
+    # Requêtes
+    # ---------------------------------------------------------
+
+    def rank(self, dim: str, score: float, cohort: Optional[str] = None) -> Tuple[int, int, int]:
+        """(nombre de scores strictement inférieurs, égaux, total) dans la cohorte."""
+        self.refresh()
+        with self._lock:
+            values = self._sorted.get((cohort or ALL_COHORTS, dim)) or []
+            below = bisect_left(values, score)
+            return below, bisect_right(values, score) - below, len(values)
+
+    def percentile(self, dim: str, score: float, cohort: Optional[str] = None) -> Optional[float]:
+        """Rang centile (0-100, ex æquo comptés pour moitié) ; None si la cohorte est vide."""
+        below, equal, total = self.rank(dim, score, cohort)
+        if not total:
+            return None
+        return 100.0 * (below + 0.5 * equal) / total
+
+    def learner_percentiles(self, email: str, cohort: Optional[str] = None) -> Optional[Dict]:
+        """
+        Percentiles de la dernière session de l'apprenant dans sa cohorte (ou `cohort`) :
+        {"cohort", "n", "D": ..., "I": ..., "S": ..., "C": ...} ; None si l'apprenant est inconnu.
+        """
+        self.refresh()
+        email = normalize_email(email)
+        with self._lock:
+            entry = self._latest.get(email)
+        if entry is None:
+            return None
+        own_cohort, scores = entry
+        group = cohort or own_cohort or ALL_COHORTS
+        out = {"cohort": group, "n": self.count(group)}
+        for dim in DIMS:
+            out[dim] = self.percentile(dim, scores[dim], group)
+        return out
+
+    def count(self, cohort: Optional[str] = None) -> int:
+        """Nombre d'apprenants (dernière session de chacun) dans la cohorte."""
+        self.refresh()
+        with self._lock:
+            return len(self._sorted.get((cohort or ALL_COHORTS, DIMS[0])) or [])
+
+
+@process_singleton
+def get_percentile_index() -> PercentileIndex:
+    return PercentileIndex()
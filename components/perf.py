@@ -0,0 +1,45 @@
+# components/perf.py
+# Mesure du temps serveur par section de page (rerun complet vs rerun d'un fragment)
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, MutableMapping, Optional
+
+import streamlit as st
+
+PERF_STATE_KEY = "_perf_timings"
+MAX_SAMPLES = 50
+
+
+def record(section: str, seconds: float, state: Optional[MutableMapping[str, Any]] = None) -> None:
+    """Ajoute une mesure (en secondes) pour cette section dans la session."""
+    state = state if state is not None else st.session_state
+    timings = state.get(PERF_STATE_KEY)
+    if timings is None:
+        timings = state[PERF_STATE_KEY] = {}
+    timings.setdefault(section, deque(maxlen=MAX_SAMPLES)).append(seconds)
+
+
+@contextmanager
+def timed(section: str, state: Optional[MutableMapping[str, Any]] = None) -> Iterator[None]:
+    """Chronomètre le bloc ; les interruptions (st.rerun, st.stop) ne sont pas comptées."""
+    t0 = time.perf_counter()
+    yield
+    record(section, time.perf_counter() - t0, state)
+
+
+def summary(state: Optional[MutableMapping[str, Any]] = None) -> Dict[str, Dict[str, float]]:
+    """{section: {n, last_ms, p50_ms, max_ms}} pour les mesures de la session."""
+    state = state if state is not None else st.session_state
+    out = {}
+    for section, samples in (state.get(PERF_STATE_KEY) or {}).items():
+        values = sorted(samples)
+        if not values:
+            continue
+        out[section] = {
+            "n": len(values),
+            "last_ms": round(samples[-1] * 1000, 2),
+            "p50_ms": round(values[len(values) // 2] * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+        }
+    return out
@@ -0,0 +1,107 @@
+# components/photo_store.py
+# Photos de profil : redimensionnées, réencodées et rangées par empreinte, par apprenant
+import hashlib
+import io
+import os
+from typing import Dict, Optional
+
+from PIL import Image, ImageOps
+
+from components.sqlite_db import DATA_DIR
+
+PHOTOS_DIR = os.path.join(DATA_DIR, "photos")
+
+# Tailles (côté max, en px) générées à chaque upload
+THUMB_SIZES = (64, 160, 512)
+DEFAULT_SIZE = 160
+
+JPEG_QUALITY = 85
+MAX_UPLOAD_PIXELS = 40_000_000  # garde-fou "decompression bomb"
+
+_CURRENT_FILE = "current"
+
+
+class PhotoError(ValueError):
+    """Image illisible ou refusée."""
+
+
+def _user_key(email: str) -> str:
+    email = (email or "").strip().lower()
+    if not email:
+        raise PhotoError("email requis pour enregistrer une photo")
+    return hashlib.sha256(email.encode("utf-8")).hexdigest()[:24]
+
+
+def user_dir(email: str) -> str:
+    return os.path.join(PHOTOS_DIR, _user_key(email))
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_thumbnails(data: bytes, sizes=THUMB_SIZES) -> Dict[int, bytes]:
+    """Décode l'upload, corrige l'orientation EXIF et produit un JPEG par taille."""
+    try:
+        img = Image.open(io.BytesIO(data))
+        if img.width * img.height > MAX_UPLOAD_PIXELS:
+            raise PhotoError("image trop grande")
+        # Pour les JPEG, décode directement à une résolution réduite (beaucoup plus rapide)
+        img.draft("RGB", (max(sizes) * 2, max(sizes) * 2))
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGB")
+    except PhotoError:
+        raise
+    except Exception as e:
+        raise PhotoError(f"image illisible : {e}") from e
+
+    out = {}
+    current = img
+    # Du plus grand au plus petit : chaque réduction part de la précédente
+    for size in sorted(sizes, reverse=True):
+        current = current.copy()
+        current.thumbnail((size, size), Image.LANCZOS)
+        buf = io.BytesIO()
+        current.save(buf, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        out[size] = buf.getvalue()
+    return out
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def photo_path(email: str, photo_hash: str, size: int = DEFAULT_SIZE) -> Optional[str]:
+    if not photo_hash:
+        return None
+    path = os.path.join(user_dir(email), f"{photo_hash}_{size}.jpg")
+    return path if os.path.isfile(path) else None
+
+
+def store_photo(email: str, data: bytes) -> str:
+    """
+    Enregistre l'upload (vignettes JPEG) sous Data/photos/<apprenant>/<empreinte>_<taille>.jpg
+    et en fait la photo courante. Un upload déjà connu n'est pas retraité.
+    Retourne l'empreinte (sha256 de l'upload d'origine).
+    """
+    folder = user_dir(email)
+    photo_hash = content_hash(data)
+    if not all(photo_path(email, photo_hash, s) for s in THUMB_SIZES):
+        thumbs = make_thumbnails(data)
+        os.makedirs(folder, exist_ok=True)
+        for size, jpeg in thumbs.items():
+            _atomic_write(os.path.join(folder, f"{photo_hash}_{size}.jpg"), jpeg)
+    _atomic_write(os.path.join(folder, _CURRENT_FILE), photo_hash.encode("ascii"))
+    return photo_hash
+
+
+def current_photo_hash(email: str) -> Optional[str]:
+    """Empreinte de la photo courante de l'apprenant (persistée entre les sessions)."""
+    try:
+        with open(os.path.join(user_dir(email), _CURRENT_FILE), "r", encoding="ascii") as f:
+            return f.read().strip() or None
+    except (OSError, PhotoError):
+        return None
@@ -0,0 +1,123 @@
+# components/profile_store.py
+# Profils apprenants (prénom, nom, poste…) : un enregistrement par email, partagé par toutes les pages
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from components.concurrency import process_singleton
+from components.sqlite_db import DATA_DIR, connect, immediate
+
+PROFILE_DB_PATH = os.path.join(DATA_DIR, "profils.sqlite3")
+LEGACY_PROFILE_PATH = os.path.join(DATA_DIR, "profil_apprenant.json")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    email       TEXT PRIMARY KEY,
+    data        TEXT NOT NULL,
+    updated_at  REAL NOT NULL
+);
+"""
+
+# Clés de l'ancien fichier partagé (accueil.py) -> clés du profil
+_LEGACY_KEYS = {"prenom": "first_name", "nom": "last_name", "email": "email"}
+
+
+def normalize_email(raw: Optional[str]) -> str:
+    """Email identifiant l'apprenant : espaces insécables retirés, minuscules."""
+    if raw is None:
+        return ""
+    return str(raw).replace("\u00A0", " ").strip().lower()
+
+
+class ProfileStore:
+    """
+    get/put par email dans SQLite (transaction par écriture : pas de profil écrasé par
+    un autre apprenant), avec un cache mémoire des lectures.
+    Le cache est vidé à chaque écriture du process, et quand un autre process a écrit
+    dans la base (PRAGMA data_version).
+    """
+
+    def __init__(self, path: str = PROFILE_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self) -> int:
+        return int(self._conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def _check_external_writes(self) -> None:
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._cache.clear()
+            self._data_version = version
+
+    def get(self, email: Optional[str]) -> Dict[str, Any]:
+        """Profil de cet apprenant ({} si inconnu) ; une copie, modifiable sans effet sur le cache."""
+        email = normalize_email(email)
+        if not email:
+            return {}
+        with self._lock:
+            self._check_external_writes()
+            data = self._cache.get(email)
+            if data is None:
+                row = self._conn.execute("SELECT data FROM profiles WHERE email = ?", (email,)).fetchone()
+                try:
+                    data = json.loads(row["data"]) if row else {}
+                except ValueError:
+                    data = {}
+                self._cache[email] = data
+            return dict(data)
+
+    def put(self, email: Optional[str], fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Fusionne `fields` dans le profil de cet apprenant et retourne le profil complet."""
+        email = normalize_email(email)
+        if not email:
+            raise ValueError("email requis pour enregistrer un profil")
+
+        with self._lock:
+            with immediate(self._conn):
+                row = self._conn.execute("SELECT data FROM profiles WHERE email = ?", (email,)).fetchone()
+                try:
+                    data = json.loads(row["data"]) if row else {}
+                except ValueError:
+                    data = {}
+                data.update(fields)
+                data["email"] = email
+                self._conn.execute(
+                    "INSERT INTO profiles (email, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(email) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                    (email, json.dumps(data, ensure_ascii=False, sort_keys=True), time.time()),
+                )
+            self._cache.pop(email, None)
+            self._data_version = self._read_data_version()
+            return dict(data)
+
+    def import_legacy(self, path: str = LEGACY_PROFILE_PATH) -> bool:
+        """Reprend l'ancien Data/profil_apprenant.json (un seul profil) s'il n'est pas déjà en base."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(legacy, dict):
+            return False
+        email = normalize_email(legacy.get("email"))
+        if not email or self.get(email):
+            return False
+        self.put(email, {_LEGACY_KEYS[k]: v for k, v in legacy.items() if k in _LEGACY_KEYS})
+        return True
+
+
+@process_singleton
+def get_store() -> ProfileStore:
+    store = ProfileStore()
+    try:
+        store.import_legacy()
+    except Exception:
+        pass
+    return store
@@ -0,0 +1,223 @@
+# components/profiler.py
+# Profilage à la demande d'un rerun de page (admins seulement), par échantillonnage de la pile
+# Chaque capture = <page>_<horodatage>.folded (format flamegraph.pl / speedscope) + .json (résumé)
+import glob
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import streamlit as st
+
+from components.access_guard import is_admin
+from components.sqlite_db import DATA_DIR
+
+PROFILES_DIR = os.path.join(DATA_DIR, "logs", "profiles")
+SAMPLE_INTERVAL_S = 0.005
+MAX_DURATION_S = 60.0  # une capture oubliée (thread bloqué) s'arrête d'elle-même
+MAX_CAPTURES = 200  # les plus anciennes sont supprimées au-delà
+QUERY_PARAM = "profile"  # ?profile=1 : profile un seul rerun
+TOP_N = 25
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _slug(page_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", page_name or "page").strip("_") or "page"
+
+
+class SamplingCapture:
+    """
+    Échantillonne la pile du thread du script toutes les `interval_s` secondes, à partir
+    du cadre `anchor` (le module de la page). La capture s'arrête seule quand ce cadre a
+    quitté la pile : fin normale du script, st.stop(), st.rerun() ou exception.
+    Aucun coût pour les autres sessions : seul le thread de ce script est lu.
+    """
+
+    def __init__(
+        self,
+        page_name: str,
+        out_dir: str = PROFILES_DIR,
+        interval_s: float = SAMPLE_INTERVAL_S,
+        max_duration_s: float = MAX_DURATION_S,
+    ):
+        self.page_name = page_name
+        self.out_dir = out_dir
+        self.interval_s = interval_s
+        self.max_duration_s = max_duration_s
+        self.stacks: Counter = Counter()
+        self.path: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, anchor=None) -> "SamplingCapture":
+        """Démarre la capture ; `anchor` : cadre dont la sortie termine la capture (appelant par défaut)."""
+        self._anchor = anchor if anchor is not None else sys._getframe(1)
+        self._target = threading.get_ident()
+        self._started_at = datetime.now()
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{self.page_name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Arrêt explicite (sinon automatique) ; retourne le chemin du résumé .json."""
+        self._stop.set()
+        self.join(timeout)
+        return self.path
+
+    def join(self, timeout: Optional[float] = None) -> Optional[str]:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.path
+
+    def _stack(self) -> Optional[List[str]]:
+        """Pile du thread cible, de la page vers la fonction en cours ; None si la page est terminée."""
+        frame = sys._current_frames().get(self._target)
+        labels = []
+        while frame is not None:
+            if frame is self._anchor:
+                labels.append(f"<page> {self.page_name}")
+                labels.reverse()
+                return labels
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        return None
+
+    def _run(self) -> None:
+        t0 = time.perf_counter()
+        deadline = t0 + self.max_duration_s
+        try:
+            while not self._stop.wait(self.interval_s):
+                stack = self._stack()
+                if stack is None or time.perf_counter() >= deadline:
+                    break
+                self.stacks[";".join(stack)] += 1
+        finally:
+            self._anchor = None  # ne pas retenir les variables de la page
+            duration = time.perf_counter() - t0
+            try:
+                self.path = self._save(duration)
+            except OSError:
+                self.path = None
+
+    def _save(self, duration_s: float) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(
+            self.out_dir,
+            f"{_slug(self.page_name)}_{self._started_at.strftime('%Y%m%d-%H%M%S')}_{self._started_at.microsecond // 1000:03d}",
+        )
+        with open(base + ".folded", "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        meta = {
+            "page": self.page_name,
+            "started_at": self._started_at.isoformat(timespec="seconds"),
+            "duration_ms": round(duration_s * 1000, 1),
+            "interval_ms": self.interval_s * 1000,
+            "samples": sum(self.stacks.values()),
+            "folded": os.path.basename(base + ".folded"),
+            "top": top_functions(self.stacks, duration_s * 1000, TOP_N),
+        }
+        tmp = base + ".json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, base + ".json")
+        prune(self.out_dir)
+        return base + ".json"
+
+
+def top_functions(stacks: Dict[str, int], duration_ms: float, n: int = TOP_N) -> List[Dict[str, Any]]:
+    """
+    Fonctions triées par temps cumulé (échantillons où elles sont dans la pile),
+    avec leur temps propre (échantillons où elles sont en haut de pile).
+    """
+    total = sum(stacks.values())
+    if not total:
+        return []
+    cumulative: Counter = Counter()
+    own: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        for label in set(frames):  # récursion : une fois par échantillon
+            cumulative[label] += count
+        own[frames[-1]] += count
+    ms_per_sample = duration_ms / total
+    return [
+        {
+            "function": label,
+            "cumulative_ms": round(count * ms_per_sample, 1),
+            "cumulative_pct": round(100.0 * count / total, 1),
+            "own_ms": round(own[label] * ms_per_sample, 1),
+        }
+        for label, count in cumulative.most_common(n)
+    ]
+
+
+def list_captures(out_dir: str = PROFILES_DIR, limit: int = 50) -> List[Dict[str, Any]]:
+    """Résumés des captures, les plus récentes d'abord (clé "path" ajoutée)."""
+    captures = []
+    for path in sorted(glob.glob(os.path.join(out_dir, "*.json")), key=os.path.getmtime, reverse=True)[:limit]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        meta["path"] = path
+        captures.append(meta)
+    return captures
+
+
+def read_folded(meta: Dict[str, Any]) -> str:
+    """Contenu du fichier .folded d'une capture (à ouvrir dans speedscope ou flamegraph.pl)."""
+    path = os.path.join(os.path.dirname(meta["path"]), meta["folded"])
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def prune(out_dir: str = PROFILES_DIR, keep: int = MAX_CAPTURES) -> int:
+    """Supprime les captures les plus anciennes au-delà de `keep`."""
+    summaries = sorted(glob.glob(os.path.join(out_dir, "*.json")), key=os.path.getmtime, reverse=True)
+    removed = 0
+    for path in summaries[keep:]:
+        for victim in (path, path[: -len(".json")] + ".folded"):
+            try:
+                os.remove(victim)
+            except OSError:
+                pass
+        removed += 1
+    return removed
+
+
+# ---------------------------------------------------------
+# Activation depuis une page
+# ---------------------------------------------------------
+
+def _query_flag() -> bool:
+    value = st.query_params.get(QUERY_PARAM, "")
+    return str(value).strip().lower() in ("1", "true", "on", "yes")
+
+
+def maybe_profile(page_name: str, email: Optional[str]) -> Optional[SamplingCapture]:
+    """
+    À appeler au niveau module d'une page, une fois l'utilisateur connu.
+    Profile le rerun en cours si l'utilisateur est admin (secret ADMIN_EMAILS) et que
+    - le secret PROFILE_RERUNS est vrai (tous les reruns des admins), ou
+    - l'URL contient ?profile=1 (un seul rerun : le paramètre est retiré ensuite).
+    """
+    from_secret = bool(st.secrets.get("PROFILE_RERUNS", False))
+    from_query = _query_flag()
+    if not (from_secret or from_query) or not is_admin(email):
+        return None
+    if from_query:
+        del st.query_params[QUERY_PARAM]
+    capture = SamplingCapture(page_name).start(anchor=sys._getframe(1))
+    st.caption(f"⏱️ Profilage de ce rerun en cours (capture dans {PROFILES_DIR}).")
+    return capture
@@ -0,0 +1,649 @@
+# components/repository.py
+# Couche d'accès aux données : entités typées, backends interchangeables (JSON, SQLite,
+# Google Sheets, mémoire) et cache de lecture partagé, invalidé à chaque écriture.
+import copy
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+from components.cache import MemoryCache, get_shared_cache
+from components.concurrency import process_singleton
+from components.espace_store import EspaceState, EspaceStore
+from components.jsonl_appender import ID_FIELD, get_appender
+from components.profile_store import ProfileStore, normalize_email
+from components.sqlite_db import DATA_DIR, connect, immediate
+
+DISC_LOG_PATH = os.path.join(DATA_DIR, "logs", "disc_forced_sessions.jsonl")
+
+# ============================================================
+# ENTITÉS
+# ============================================================
+
+
+def _from_record(cls, record: Dict[str, Any]):
+    """Construit l'entité à partir d'un enregistrement (clés inconnues ignorées, copie profonde)."""
+    names = {f.name for f in fields(cls)}
+    return cls(**{k: copy.deepcopy(v) for k, v in record.items() if k in names})
+
+
+@dataclass
+class Profile:
+    email: str = ""
+    first_name: str = ""
+    last_name: str = ""
+    job_title: str = ""
+    company: str = ""
+    bio: str = ""
+    photo_hash: Optional[str] = None
+    share_contact: bool = False  # accepte que ses partenaires d'entraînement voient son e-mail
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Profile":
+        return _from_record(cls, record)
+
+    def to_record(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Espace:
+    email: str = ""
+    state: EspaceState = field(default_factory=EspaceState)
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Espace":
+        return cls(email=record.get("email", ""), state=_from_record(EspaceState, record))
+
+    def to_record(self) -> Dict[str, Any]:
+        return {"email": self.email, **asdict(self.state)}
+
+
+@dataclass
+class DiscSession:
+    user: str = ""
+    ts: str = ""
+    scores: Dict[str, int] = field(default_factory=dict)
+    style: str = ""
+    top_dims: List[str] = field(default_factory=list)
+    choices: List[Dict[str, Any]] = field(default_factory=list)
+    submission_id: str = ""  # identifiant de la tentative : une session n'est enregistrée qu'une fois
+    bank_version: str = ""
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "DiscSession":
+        return _from_record(cls, record)
+
+    def to_record(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Message:
+    msg_id: str = ""
+    user_id: str = ""
+    sender: str = "user"
+    message: str = ""
+    created_at: str = ""
+    status: str = ""
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Message":
+        return _from_record(cls, {k: "" if v is None else str(v) for k, v in record.items()})
+
+    def to_record(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# ============================================================
+# COLLECTIONS
+# ============================================================
+
+
+@dataclass(frozen=True)
+class Collection:
+    name: str
+    key_field: str
+    kind: str  # "record" : un enregistrement par clé ; "log" : ajouts successifs
+    email_key: bool = True
+    cache_ttl_s: Optional[float] = None  # None : TTL par défaut du cache
+    id_field: Optional[str] = None  # journal : un ajout portant un identifiant déjà présent n'est pas réécrit
+
+    def norm_key(self, key: Any) -> str:
+        return normalize_email(key) if self.email_key else str(key if key is not None else "").strip()
+
+    def record_id(self, record: Dict[str, Any]) -> Optional[str]:
+        value = record.get(self.id_field) if self.id_field else None
+        return str(value) if value else None
+
+
+PROFILES = Collection("profiles", "email", "record")
+ESPACES = Collection("espaces", "email", "record")
+DISC_SESSIONS = Collection("disc_sessions", "user", "log", id_field=ID_FIELD)
+# Les réponses du coach sont écrites directement dans Sheets : lecture gardée peu de temps
+MESSAGES = Collection("messages", "user_id", "log", email_key=False, cache_ttl_s=15.0)
+
+COLLECTIONS = (PROFILES, ESPACES, DISC_SESSIONS, MESSAGES)
+
+# ============================================================
+# BACKENDS
+# ============================================================
+
+
+class UnsupportedOperation(NotImplementedError):
+    """Opération que ce backend ne sait pas faire (ex. journal demandé à un backend d'enregistrements)."""
+
+
+class Backend(ABC):
+    """
+    Stockage brut (dictionnaires JSON-compatibles).
+    Collections "record" : get / put / merge ; collections "log" : find / append.
+    append retourne (enregistrement du journal, True s'il vient d'être écrit) : si la collection
+    a un id_field et que cet identifiant est déjà dans le journal, rien n'est écrit et
+    l'enregistrement existant est retourné.
+    """
+
+    supports_logs = True  # False : find / append lèvent UnsupportedOperation
+
+    _merge_lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, coll: Collection, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def put(self, coll: Collection, record: Dict[str, Any]) -> None:
+        ...
+
+    def merge(self, coll: Collection, key: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Fusionne `values` dans l'enregistrement ; les backends transactionnels le font de façon atomique."""
+        with self._merge_lock:
+            record = self.get(coll, key) or {}
+            record.update(values)
+            record[coll.key_field] = key
+            self.put(coll, record)
+            return record
+
+    @abstractmethod
+    def find(self, coll: Collection, key: str) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def append(self, coll: Collection, record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        ...
+
+    @staticmethod
+    def _same_id(coll: Collection, records: List[Dict[str, Any]], rid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Enregistrement de `records` portant l'identifiant `rid` (None si absent ou sans identifiant)."""
+        if rid is None:
+            return None
+        return next((r for r in records if coll.record_id(r) == rid), None)
+
+
+class RecordBackend(Backend):
+    """Backend d'enregistrements seuls : refusé par Repository pour une collection "log"."""
+
+    supports_logs = False
+
+    def find(self, coll, key):
+        raise UnsupportedOperation(f"{type(self).__name__} ne gère pas de journal ({coll.name})")
+
+    def append(self, coll, record):
+        raise UnsupportedOperation(f"{type(self).__name__} ne gère pas de journal ({coll.name})")
+
+
+class MemoryBackend(Backend):
+    """Tout en mémoire : tests, démos, benchmarks."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._logs: Dict[str, List[Dict[str, Any]]] = {}
+
+    def get(self, coll, key):
+        with self._lock:
+            record = self._records.get(coll.name, {}).get(key)
+            return copy.deepcopy(record) if record is not None else None
+
+    def put(self, coll, record):
+        key = coll.norm_key(record.get(coll.key_field))
+        with self._lock:
+            self._records.setdefault(coll.name, {})[key] = copy.deepcopy(record)
+
+    def find(self, coll, key):
+        with self._lock:
+            return [
+                copy.deepcopy(r) for r in self._logs.get(coll.name, [])
+                if coll.norm_key(r.get(coll.key_field)) == key
+            ]
+
+    def append(self, coll, record):
+        with self._lock:
+            log = self._logs.setdefault(coll.name, [])
+            existing = self._same_id(coll, log, coll.record_id(record))
+            if existing is not None:
+                return copy.deepcopy(existing), False
+            log.append(copy.deepcopy(record))
+            return record, True
+
+
+class JsonFileBackend(Backend):
+    """
+    Fichiers JSON sous `root` : un fichier par enregistrement (<root>/<collection>/<clé>.json,
+    écriture atomique) et un JSONL par journal (<root>/<collection>.jsonl, ou chemin donné dans `paths`).
+    Les ajouts passent par l'appender partagé du fichier (components.jsonl_appender).
+    """
+
+    def __init__(self, root: str = DATA_DIR, paths: Optional[Dict[str, str]] = None):
+        self.root = root
+        self.paths = dict(paths or {})
+
+    def _record_path(self, coll: Collection, key: str) -> str:
+        return os.path.join(self.root, coll.name, quote(key, safe="@.-_") + ".json")
+
+    def _log_path(self, coll: Collection) -> str:
+        return self.paths.get(coll.name) or os.path.join(self.root, coll.name + ".jsonl")
+
+    def get(self, coll, key):
+        try:
+            with open(self._record_path(coll, key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, coll, record):
+        path = self._record_path(coll, coll.norm_key(record.get(coll.key_field)))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+    def find(self, coll, key):
+        records = []
+        try:
+            with open(self._log_path(coll), "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    if coll.norm_key(rec.get(coll.key_field)) == key:
+                        records.append(rec)
+        except OSError:
+            return []
+        return records
+
+    def append(self, coll, record):
+        # Appender partagé du fichier : verrou entre process, dédoublonnage sur ID_FIELD
+        return get_appender(self._log_path(coll)).append(record)
+
+
+class SqliteBackend(Backend):
+    """
+    Une table par collection : (clé PRIMARY KEY, data, updated_at) pour les enregistrements,
+    (id, clé, data, created_at, rid) pour les journaux, rid (identifiant id_field) unique.
+    """
+
+    def __init__(self, path: str = os.path.join(DATA_DIR, "repository.sqlite3")):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._ready = set()
+
+    def _table(self, coll: Collection) -> str:
+        if coll.name not in self._ready:
+            if coll.kind == "record":
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {coll.name} "
+                    f"({coll.key_field} TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+                )
+            else:
+                self._conn.executescript(
+                    f"CREATE TABLE IF NOT EXISTS {coll.name} "
+                    f"(id INTEGER PRIMARY KEY AUTOINCREMENT, {coll.key_field} TEXT NOT NULL, "
+                    f"data TEXT NOT NULL, created_at REAL NOT NULL);"
+                    f"CREATE INDEX IF NOT EXISTS idx_{coll.name}_{coll.key_field} "
+                    f"ON {coll.name}({coll.key_field}, id);"
+                )
+                columns = {r["name"] for r in self._conn.execute(f"PRAGMA table_info({coll.name})")}
+                if "rid" not in columns:  # tables créées avant le dédoublonnage
+                    self._conn.execute(f"ALTER TABLE {coll.name} ADD COLUMN rid TEXT")
+                self._conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{coll.name}_rid ON {coll.name}(rid)")
+            self._ready.add(coll.name)
+        return coll.name
+
+    def get(self, coll, key):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT data FROM {self._table(coll)} WHERE {coll.key_field} = ?", (key,)
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def put(self, coll, record):
+        key = coll.norm_key(record.get(coll.key_field))
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self._table(coll)} ({coll.key_field}, data, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(record, ensure_ascii=False, sort_keys=True), time.time()),
+            )
+
+    def merge(self, coll, key, values):
+        with self._lock, immediate(self._conn):
+            table = self._table(coll)
+            row = self._conn.execute(f"SELECT data FROM {table} WHERE {coll.key_field} = ?", (key,)).fetchone()
+            record = json.loads(row["data"]) if row else {}
+            record.update(values)
+            record[coll.key_field] = key
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} ({coll.key_field}, data, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(record, ensure_ascii=False, sort_keys=True), time.time()),
+            )
+        return record
+
+    def find(self, coll, key):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM {self._table(coll)} WHERE {coll.key_field} = ? ORDER BY id", (key,)
+            ).fetchall()
+        return [json.loads(r["data"]) for r in rows]
+
+    def append(self, coll, record):
+        rid = coll.record_id(record)
+        with self._lock, immediate(self._conn):
+            table = self._table(coll)
+            if rid is not None:
+                row = self._conn.execute(f"SELECT data FROM {table} WHERE rid = ?", (rid,)).fetchone()
+                if row:
+                    return json.loads(row["data"]), False
+            self._conn.execute(
+                f"INSERT INTO {table} ({coll.key_field}, data, created_at, rid) VALUES (?, ?, ?, ?)",
+                (coll.norm_key(record.get(coll.key_field)), json.dumps(record, ensure_ascii=False), time.time(), rid),
+            )
+        return record, True
+
+
+class SheetsBackend(Backend):
+    """
+    Un onglet Google Sheets par collection, une colonne par champ (en-tête en ligne 1).
+    Le classeur est ouvert au premier accès ; l'enregistrement retourné par append porte la
+    ligne écrite (sheet_row). Le dédoublonnage sur id_field relit l'onglet : il ne protège que
+    des ajouts du même process.
+    """
+
+    def __init__(
+        self,
+        open_spreadsheet: Optional[Callable[[], Any]] = None,
+        sheet_names: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, List[str]]] = None,
+    ):
+        from components.sheets_client import MESSAGES_HEADER, MESSAGES_SHEET_NAME
+
+        self._open = open_spreadsheet
+        self.sheet_names = {"messages": MESSAGES_SHEET_NAME, **(sheet_names or {})}
+        self.headers = {"messages": list(MESSAGES_HEADER), **(headers or {})}
+        self._worksheets: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._append_lock = threading.Lock()
+
+    def _worksheet(self, coll: Collection):
+        with self._lock:
+            ws = self._worksheets.get(coll.name)
+            if ws is None:
+                from gspread.exceptions import WorksheetNotFound
+
+                if self._open is None:
+                    from components.sheets_client import get_spreadsheet
+
+                    self._open = get_spreadsheet
+                title = self.sheet_names.get(coll.name, coll.name.upper())
+                sh = self._open()
+                try:
+                    ws = sh.worksheet(title)
+                except WorksheetNotFound:  # quota, réseau… : l'erreur remonte, pas d'onglet en double
+                    ws = sh.add_worksheet(title=title, rows=2000, cols=max(10, len(self._header(coll))))
+                    ws.append_row(self._header(coll))
+                self._worksheets[coll.name] = ws
+            return ws
+
+    def _header(self, coll: Collection) -> List[str]:
+        return self.headers.get(coll.name) or [coll.key_field, "data"]
+
+    def _row(self, coll: Collection, record: Dict[str, Any]) -> List[Any]:
+        """Valeurs dans l'ordre de l'en-tête ; les champs sans colonne vont en JSON dans la colonne "data"."""
+        header = self._header(coll)
+        extra = {k: v for k, v in record.items() if k not in header}
+        row = []
+        for h in header:
+            v = extra if h == "data" and h not in record else record.get(h, "")
+            row.append(json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v)
+        return row
+
+    @staticmethod
+    def _record(row: Dict[str, Any]) -> Dict[str, Any]:
+        record = dict(row)
+        data = record.pop("data", None)
+        if isinstance(data, str) and data.startswith("{"):
+            try:
+                record.update(json.loads(data))
+            except ValueError:
+                record["data"] = data
+        elif data is not None:
+            record["data"] = data
+        return record
+
+    def _matching(self, coll: Collection, key: str) -> List[Dict[str, Any]]:
+        return [
+            self._record(r) for r in self._worksheet(coll).get_all_records()
+            if coll.norm_key(r.get(coll.key_field)) == key
+        ]
+
+    def get(self, coll, key):
+        matches = self._matching(coll, key)
+        return matches[-1] if matches else None
+
+    def put(self, coll, record):
+        ws = self._worksheet(coll)
+        key = coll.norm_key(record.get(coll.key_field))
+        col = self._header(coll).index(coll.key_field) + 1
+        keys = [coll.norm_key(v) for v in ws.col_values(col)]
+        row = self._row(coll, record)
+        if key in keys[1:]:
+            ws.update(values=[row], range_name=f"A{keys.index(key, 1) + 1}")
+        else:
+            ws.append_row(row)
+
+    def find(self, coll, key):
+        return self._matching(coll, key)
+
+    def append(self, coll, record):
+        from components.coach_inbox import parse_sheet_row
+
+        with self._append_lock:
+            rid = coll.record_id(record)
+            if rid is not None:
+                existing = self._same_id(coll, self.find(coll, coll.norm_key(record.get(coll.key_field))), rid)
+                if existing is not None:
+                    return existing, False
+            response = self._worksheet(coll).append_row(self._row(coll, record))
+        return {**record, "sheet_row": parse_sheet_row(response)}, True
+
+
+class ProfileStoreBackend(RecordBackend):
+    """Profils dans components.profile_store (SQLite, fusion transactionnelle)."""
+
+    def __init__(self, store: ProfileStore):
+        self.store = store
+
+    def get(self, coll, key):
+        return self.store.get(key) or None
+
+    def put(self, coll, record):
+        self.store.put(record.get("email"), record)
+
+    def merge(self, coll, key, values):
+        return self.store.put(key, values)
+
+
+class EspaceStoreBackend(RecordBackend):
+    """Mon espace dans components.espace_store (SQLite, un enregistrement par champ)."""
+
+    def __init__(self, store: EspaceStore):
+        self.store = store
+
+    def get(self, coll, key):
+        data = self.store.load(key)
+        return {**data, "email": key} if data else None
+
+    def put(self, coll, record):
+        self.store.save(record.get("email"), record)
+
+    def merge(self, coll, key, values):
+        self.store.save(key, values)
+        return {**self.store.load(key), "email": key}
+
+
+# ============================================================
+# REPOSITORY
+# ============================================================
+
+
+class Repository:
+    """
+    Point d'accès unique aux données, quel que soit le backend de chaque collection.
+    Lectures mises en cache (clé "repo:<collection>:<clé>") ; chaque écriture invalide
+    l'entrée concernée, invalidate() permet de forcer une relecture.
+    """
+
+    def __init__(self, backends: Union[Backend, Dict[str, Backend]], cache: Optional[Any] = None):
+        if isinstance(backends, Backend):
+            backends = {c.name: backends for c in COLLECTIONS}
+        for coll in COLLECTIONS:
+            backend = backends.get(coll.name)
+            if coll.kind == "log" and backend is not None and not backend.supports_logs:
+                raise ValueError(f"{type(backend).__name__} ne peut pas stocker le journal {coll.name!r}")
+        self.backends = dict(backends)
+        self.cache = cache if cache is not None else MemoryCache()
+
+    def _backend(self, coll: Collection) -> Backend:
+        try:
+            return self.backends[coll.name]
+        except KeyError:
+            raise KeyError(f"aucun backend configuré pour la collection {coll.name!r}") from None
+
+    @staticmethod
+    def _cache_key(coll: Collection, key: str) -> str:
+        return f"repo:{coll.name}:{key}"
+
+    def _read(self, coll: Collection, key: str, load: Callable[[], Any]) -> Any:
+        return self.cache.get_or_set(self._cache_key(coll, key), load, ttl_s=coll.cache_ttl_s)
+
+    def invalidate(self, coll: Optional[Collection] = None, key: Optional[str] = None) -> None:
+        if coll is None:
+            self.cache.delete_prefix("repo:")
+        elif key is None:
+            self.cache.delete_prefix(f"repo:{coll.name}:")
+        else:
+            self.cache.delete(self._cache_key(coll, coll.norm_key(key)))
+
+    # --- enregistrements ---
+
+    def _get_record(self, coll: Collection, key: Any) -> Optional[Dict[str, Any]]:
+        key = coll.norm_key(key)
+        if not key:
+            return None
+        return self._read(coll, key, lambda: self._backend(coll).get(coll, key))
+
+    def _merge_record(self, coll: Collection, key: Any, values: Dict[str, Any]) -> Dict[str, Any]:
+        key = coll.norm_key(key)
+        if not key:
+            raise ValueError(f"{coll.key_field} requis pour enregistrer dans {coll.name}")
+        try:
+            return self._backend(coll).merge(coll, key, values)
+        finally:
+            self.invalidate(coll, key)
+
+    def get_profile(self, email: Optional[str]) -> Optional[Profile]:
+        record = self._get_record(PROFILES, email)
+        return Profile.from_record(record) if record else None
+
+    def update_profile(self, email: Optional[str], **values) -> Profile:
+        return Profile.from_record(self._merge_record(PROFILES, email, values))
+
+    def put_profile(self, profile: Profile) -> Profile:
+        values = profile.to_record()
+        return self.update_profile(values.pop("email"), **values)
+
+    def get_espace(self, email: Optional[str]) -> Espace:
+        record = self._get_record(ESPACES, email)
+        return Espace.from_record(record) if record else Espace(email=normalize_email(email))
+
+    def get_espace_fields(self, email: Optional[str]) -> Dict[str, Any]:
+        """Champs enregistrés seulement (sans les valeurs par défaut de EspaceState)."""
+        record = self._get_record(ESPACES, email) or {}
+        return {k: copy.deepcopy(v) for k, v in record.items() if k != "email"}
+
+    def update_espace(self, email: Optional[str], **values) -> Espace:
+        return Espace.from_record(self._merge_record(ESPACES, email, values))
+
+    def put_espace(self, espace: Espace) -> Espace:
+        return self.update_espace(espace.email, **asdict(espace.state))
+
+    # --- journaux ---
+
+    def _find(self, coll: Collection, key: Any) -> List[Dict[str, Any]]:
+        key = coll.norm_key(key)
+        if not key:
+            return []
+        return self._read(coll, key, lambda: self._backend(coll).find(coll, key))
+
+    def _append(self, coll: Collection, record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        try:
+            return self._backend(coll).append(coll, record)
+        finally:
+            self.invalidate(coll, record.get(coll.key_field))
+
+    def disc_sessions(self, email: Optional[str]) -> List[DiscSession]:
+        """Sessions DISC de l'apprenant, dans l'ordre d'enregistrement."""
+        return [DiscSession.from_record(r) for r in self._find(DISC_SESSIONS, email)]
+
+    def last_disc_session(self, email: Optional[str]) -> Optional[DiscSession]:
+        sessions = self.disc_sessions(email)
+        return sessions[-1] if sessions else None
+
+    def add_disc_session(self, session: DiscSession) -> Tuple[Dict[str, Any], bool]:
+        """(session du journal, True si nouvelle) : même submission_id -> écrite une fois, quel que soit le backend."""
+        return self._append(DISC_SESSIONS, session.to_record())
+
+    def messages(self, user_id: Any) -> List[Message]:
+        """Messages échangés avec le coach, triés par date."""
+        msgs = [Message.from_record(r) for r in self._find(MESSAGES, user_id)]
+        return sorted(msgs, key=lambda m: m.created_at)
+
+    def add_message(self, message: Message) -> Tuple[Dict[str, Any], bool]:
+        """(message écrit, True) ; avec Sheets, le message porte sa ligne (sheet_row)."""
+        return self._append(MESSAGES, message.to_record())
+
+
+def default_backends() -> Dict[str, Backend]:
+    from components import espace_store, profile_store
+
+    return {
+        PROFILES.name: ProfileStoreBackend(profile_store.get_store()),
+        ESPACES.name: EspaceStoreBackend(espace_store.get_store()),
+        DISC_SESSIONS.name: JsonFileBackend(paths={DISC_SESSIONS.name: DISC_LOG_PATH}),
+        MESSAGES.name: SheetsBackend(),
+    }
+
+
+@process_singleton
+def get_repository() -> Repository:
+    """Cache partagé entre process : une lecture ou une invalidation faite par un worker profite aux autres."""
+    return Repository(default_backends(), cache=get_shared_cache())
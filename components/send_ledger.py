@@ -0,0 +1,100 @@
+# components/send_ledger.py
+# Registre des e-mails envoyés : un même contenu n'est pas renvoyé au même destinataire
+# dans la fenêtre de déduplication (double clic, rerun, autre onglet, autre process)
+import os
+import threading
+import time
+from typing import Optional
+
+from components.concurrency import process_singleton
+from components.profile_store import normalize_email
+from components.sqlite_db import DATA_DIR, connect, immediate
+
+SEND_LEDGER_DB_PATH = os.path.join(DATA_DIR, "envois.sqlite3")
+DEDUP_WINDOW_S = 24 * 3600.0
+PENDING_TIMEOUT_S = 300.0  # un envoi "en cours" plus vieux est considéré comme abandonné
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sends (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipient    TEXT NOT NULL,
+    content_key  TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    created_at   REAL NOT NULL,
+    sent_at      REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sends_lookup ON sends(recipient, content_key, created_at);
+"""
+
+
+class SendLedger:
+    """
+    claim() réserve l'envoi (transaction BEGIN IMMEDIATE : deux clics simultanés ne
+    peuvent pas réserver tous les deux), puis complete() après l'envoi SMTP réussi,
+    ou release() en cas d'échec pour permettre un nouvel essai.
+    """
+
+    def __init__(self, path: str = SEND_LEDGER_DB_PATH, window_s: float = DEDUP_WINDOW_S):
+        self.path = path
+        self.window_s = window_s
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def claim(self, recipient: str, content_key: str, now: Optional[float] = None) -> Optional[int]:
+        """Identifiant de la réservation, ou None si ce contenu a déjà été envoyé (ou est en cours d'envoi)."""
+        recipient = normalize_email(recipient)
+        now = time.time() if now is None else now
+        with self._lock, immediate(self._conn):
+            row = self._conn.execute(
+                "SELECT id FROM sends WHERE recipient = ? AND content_key = ? AND ("
+                "  (status = ? AND sent_at >= ?) OR (status = ? AND created_at >= ?)"
+                ") LIMIT 1",
+                (recipient, content_key, STATUS_SENT, now - self.window_s, STATUS_PENDING, now - PENDING_TIMEOUT_S),
+            ).fetchone()
+            if row is not None:
+                return None
+            cur = self._conn.execute(
+                "INSERT INTO sends (recipient, content_key, status, created_at) VALUES (?, ?, ?, ?)",
+                (recipient, content_key, STATUS_PENDING, now),
+            )
+            return int(cur.lastrowid)
+
+    def complete(self, claim_id: int, now: Optional[float] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE sends SET status = ?, sent_at = ? WHERE id = ?",
+                (STATUS_SENT, time.time() if now is None else now, claim_id),
+            )
+
+    def release(self, claim_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sends WHERE id = ? AND status = ?", (claim_id, STATUS_PENDING))
+
+    def last_sent_at(self, recipient: str, content_key: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(sent_at) FROM sends WHERE recipient = ? AND content_key = ? AND status = ?",
+                (normalize_email(recipient), content_key, STATUS_SENT),
+            ).fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    def prune(self, older_than_s: Optional[float] = None) -> int:
+        """Supprime les lignes sorties de la fenêtre (le registre reste petit)."""
+        cutoff = time.time() - (older_than_s if older_than_s is not None else self.window_s)
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM sends WHERE created_at < ?", (cutoff,))
+        return cur.rowcount
+
+
+@process_singleton
+def get_ledger() -> SendLedger:
+    ledger = SendLedger()
+    try:
+        ledger.prune()
+    except Exception:
+        pass
+    return ledger
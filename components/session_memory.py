@@ -0,0 +1,124 @@
+# components/session_memory.py
+# Audit mémoire de st.session_state : octets par clé, par session et au total
+import sys
+import types
+from collections import deque
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import streamlit as st
+
+LARGE_VALUE_BYTES = 256 * 1024  # au-delà : candidat au blob store (components/blob_store.py)
+
+_NOT_FOLLOWED = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.MethodType,
+    types.BuiltinFunctionType,
+)
+
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Taille approximative (octets) de `obj` et de ce qu'il contient.
+    Un objet partagé n'est compté qu'une fois ; modules, classes et fonctions ne sont pas suivis.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    try:
+        size = sys.getsizeof(obj)
+    except TypeError:
+        return 0
+
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, memoryview):
+        return size + obj.nbytes
+    if isinstance(obj, _NOT_FOLLOWED):
+        return size
+    if isinstance(obj, Mapping):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return size + sum(deep_sizeof(item, seen) for item in obj)
+    nbytes = getattr(obj, "nbytes", None)  # tableaux numpy, Series ; DataFrame : memory_usage
+    if isinstance(nbytes, int):
+        return size + nbytes
+    memory_usage = getattr(obj, "memory_usage", None)
+    if callable(memory_usage):
+        try:
+            return size + int(memory_usage(deep=True).sum())
+        except Exception:
+            pass
+    if is_dataclass(obj):
+        return size + sum(deep_sizeof(getattr(obj, f.name, None), seen) for f in fields(obj))
+    if hasattr(obj, "__dict__"):
+        return size + deep_sizeof(vars(obj), seen)
+    return size
+
+
+def state_report(state: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Une ligne par clé {key, type, bytes}, les plus lourdes d'abord."""
+    rows = []
+    for key in list(state.keys()):
+        try:
+            value = state[key]
+        except KeyError:
+            continue
+        rows.append({"key": str(key), "type": type(value).__name__, "bytes": deep_sizeof(value)})
+    rows.sort(key=lambda r: r["bytes"], reverse=True)
+    return rows
+
+
+def _session_states() -> Iterable[Tuple[str, Mapping[str, Any]]]:
+    """(session_id, état) de toutes les sessions du process (API interne de Streamlit)."""
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        raise RuntimeError("pas de runtime Streamlit (mode bare / AppTest)")
+    manager = Runtime.instance()._session_mgr
+    return [(info.session.id, info.session.session_state.filtered_state) for info in manager.list_sessions()]
+
+
+def process_report(states: Optional[Iterable[Tuple[str, Mapping[str, Any]]]] = None) -> Dict[str, Any]:
+    """
+    Mémoire des sessions du process :
+    {"sessions": [{session_id, bytes, keys, top}], "total_bytes", "by_key": [{key, sessions, bytes}]}.
+    Sans argument, lit toutes les sessions ; si l'API interne n'est pas disponible,
+    seule la session courante est auditée.
+    """
+    if states is None:
+        try:
+            states = _session_states()
+        except Exception:
+            states = [("courante", st.session_state.to_dict())]
+
+    sessions = []
+    by_key: Dict[str, Dict[str, Any]] = {}
+    for session_id, state in states:
+        rows = state_report(state)
+        sessions.append(
+            {
+                "session_id": session_id,
+                "bytes": sum(r["bytes"] for r in rows),
+                "keys": len(rows),
+                "top": rows[:5],
+            }
+        )
+        for r in rows:
+            agg = by_key.setdefault(r["key"], {"key": r["key"], "sessions": 0, "bytes": 0})
+            agg["sessions"] += 1
+            agg["bytes"] += r["bytes"]
+    sessions.sort(key=lambda s: s["bytes"], reverse=True)
+    return {
+        "sessions": sessions,
+        "total_bytes": sum(s["bytes"] for s in sessions),
+        "by_key": sorted(by_key.values(), key=lambda a: a["bytes"], reverse=True),
+    }
+
+
+def large_values(state: Mapping[str, Any], threshold: int = LARGE_VALUE_BYTES) -> List[Dict[str, Any]]:
+    """Clés dont la valeur dépasse `threshold` octets (à déplacer dans le blob store)."""
+    return [r for r in state_report(state) if r["bytes"] >= threshold]
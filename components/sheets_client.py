@@ -0,0 +1,34 @@
+# components/sheets_client.py
+import gspread
+import streamlit as st
+from google.oauth2.service_account import Credentials
+from gspread.exceptions import WorksheetNotFound
+
+MESSAGES_SHEET_NAME = "MESSAGES"
+MESSAGES_HEADER = ["msg_id", "user_id", "sender", "message", "created_at", "status"]
+MESSAGES_ID_COL = MESSAGES_HEADER.index("msg_id") + 1
+MESSAGES_STATUS_COL = MESSAGES_HEADER.index("status") + 1
+
+
+@st.cache_resource(show_spinner=False)
+def get_spreadsheet():
+    """Client gspread + classeur ouverts une fois par process (secrets google / scopes / gspread)."""
+    google_info = dict(st.secrets["google"])
+    scopes = st.secrets["scopes"]
+
+    creds = Credentials.from_service_account_info(google_info, scopes=scopes)
+    client = gspread.authorize(creds)
+
+    spreadsheet_id = st.secrets["gspread"]["spreadsheet_id"]
+    return client.open_by_key(spreadsheet_id)
+
+
+def get_messages_worksheet():
+    """Ouvre (ou crée) l'onglet MESSAGES."""
+    sh = get_spreadsheet()
+    try:
+        return sh.worksheet(MESSAGES_SHEET_NAME)
+    except WorksheetNotFound:
+        ws_msg = sh.add_worksheet(title=MESSAGES_SHEET_NAME, rows=2000, cols=10)
+        ws_msg.append_row(MESSAGES_HEADER)
+        return ws_msg
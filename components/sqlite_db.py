@@ -0,0 +1,36 @@
+# components/sqlite_db.py
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator
+
+DATA_DIR = "Data"
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Ouvre une connexion SQLite prête pour plusieurs process Streamlit.
+    - WAL : les lecteurs ne bloquent pas l'écrivain
+    - busy_timeout : on attend un verrou plutôt que d'échouer tout de suite
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=10000")
+    return conn
+
+
+@contextmanager
+def immediate(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Transaction BEGIN IMMEDIATE : le verrou d'écriture est pris dès le début, donc une lecture
+    suivie d'une écriture (read-modify-write) ne peut pas perdre la mise à jour d'un autre
+    process. Validée à la sortie du bloc, annulée sur exception.
+    """
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
@@ -0,0 +1,345 @@
+# components/team_builder.py
+# Constitution de groupes d'atelier équilibrés en énergies DISC, à partir d'une cohorte (CSV)
+# jointe aux derniers résultats DISC : placement glouton puis recherche locale par échanges,
+# le gain de chaque échange étant évalué pour tous les candidats d'un coup (NumPy).
+#
+#   python -m components.team_builder Data/profils_etudiants.csv --size 5 --out groupes.csv
+import argparse
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from components.allowlist import read_emails
+from components.disc_log import latest_sessions
+from components.disc_texts import DIMS
+from components.profile_store import normalize_email
+from components.repository import DISC_LOG_PATH
+
+# Poids des deux critères d'équilibre : profil moyen du groupe proche de celui de la cohorte,
+# et répartition des énergies dominantes proche de celle de la cohorte
+PROFILE_WEIGHT = 1.0
+DOMINANT_WEIGHT = 1.0
+MAX_PASSES = 20
+
+
+@dataclass
+class TeamPlan:
+    """Affectation : groups[i] = numéro de groupe (0..n_groups-1) de emails[i]."""
+
+    emails: List[str]
+    groups: np.ndarray
+    n_groups: int
+    cost: float  # 0 = chaque groupe reproduit exactement le mélange de la cohorte
+    greedy_cost: float
+    swaps: int = 0
+    passes: int = 0
+    missing: List[str] = field(default_factory=list)  # apprenants sans résultat DISC (placés en complément)
+    violations: List[Tuple[str, str]] = field(default_factory=list)  # paires à séparer restées ensemble
+
+    def members(self) -> List[List[str]]:
+        out: List[List[str]] = [[] for _ in range(self.n_groups)]
+        for email, g in zip(self.emails, self.groups):
+            out[int(g)].append(email)
+        return out
+
+
+# ---------------------------------------------------------
+# Données
+# ---------------------------------------------------------
+
+def cohort_scores(emails: Iterable[str], log_path: str = DISC_LOG_PATH) -> Dict[str, Dict[str, int]]:
+    """Scores de la dernière session DISC de chaque apprenant qui en a une."""
+    latest = latest_sessions(log_path)
+    scores = {}
+    for email in emails:
+        rec = latest.get(normalize_email(email))
+        if rec and isinstance(rec.get("scores"), dict):
+            scores[normalize_email(email)] = {dim: int(rec["scores"].get(dim, 0) or 0) for dim in DIMS}
+    return scores
+
+
+def load_cohort(csv_path: str, log_path: str = DISC_LOG_PATH) -> Tuple[List[str], Dict[str, Dict[str, int]]]:
+    """(emails de la cohorte, scores de la dernière session DISC de ceux qui en ont une)."""
+    emails = list(dict.fromkeys(read_emails(csv_path)))
+    return emails, cohort_scores(emails, log_path)
+
+
+def _deviations(emails: Sequence[str], scores: Dict[str, Dict[str, int]]) -> np.ndarray:
+    """
+    Écart de chaque apprenant au mélange moyen de la cohorte : [parts D/I/S/C, énergie(s)
+    dominante(s)], pondérés. Sans résultat DISC : écart nul (l'apprenant ne déséquilibre rien).
+    """
+    n = len(emails)
+    known = np.array([e in scores for e in emails], dtype=bool)
+    raw = np.zeros((n, len(DIMS)), dtype=np.float64)
+    for i, email in enumerate(emails):
+        if known[i]:
+            raw[i] = [scores[email].get(dim, 0) for dim in DIMS]
+    totals = raw.sum(axis=1, keepdims=True)
+    shares = np.divide(raw, totals, out=np.full_like(raw, 1 / len(DIMS)), where=totals > 0)
+    dominant = (shares == shares.max(axis=1, keepdims=True)).astype(np.float64)
+    dominant /= dominant.sum(axis=1, keepdims=True)  # ex æquo : poids partagé
+
+    z = np.hstack([math.sqrt(PROFILE_WEIGHT) * shares, math.sqrt(DOMINANT_WEIGHT) * dominant])
+    y = np.zeros_like(z)
+    if known.any():
+        y[known] = z[known] - z[known].mean(axis=0)
+    return y
+
+
+def _conflicts(emails: Sequence[str], apart: Iterable[Tuple[str, str]]) -> Dict[int, set]:
+    row_of = {e: i for i, e in enumerate(emails)}
+    out: Dict[int, set] = {}
+    for a, b in apart:
+        i, j = row_of.get(normalize_email(a)), row_of.get(normalize_email(b))
+        if i is not None and j is not None and i != j:
+            out.setdefault(i, set()).add(j)
+            out.setdefault(j, set()).add(i)
+    return out
+
+
+def _cost(dev_sums: np.ndarray, sizes: np.ndarray) -> float:
+    return float(((dev_sums ** 2).sum(axis=1) / np.maximum(sizes, 1) ** 2).sum())
+
+
+# ---------------------------------------------------------
+# Résolution
+# ---------------------------------------------------------
+
+def _greedy(y: np.ndarray, capacity: np.ndarray, conflicts: Dict[int, set]) -> np.ndarray:
+    """Profils les plus marqués d'abord, chacun dans le groupe (non plein) qu'il équilibre le mieux."""
+    n, m = len(y), len(capacity)
+    groups = np.full(n, -1, dtype=np.int64)
+    sums = np.zeros((m, y.shape[1]))
+    counts = np.zeros(m, dtype=np.int64)
+    for i in np.argsort(-(y ** 2).sum(axis=1), kind="stable"):
+        # Hausse de ||somme des écarts||² ; à égalité, le groupe le moins rempli
+        delta = 2 * sums @ y[i] + y[i] @ y[i] + 1e-9 * counts
+        delta[counts >= capacity] = np.inf
+        for j in conflicts.get(i, ()):
+            if groups[j] >= 0:
+                delta[groups[j]] = np.inf
+        g = int(np.argmin(delta))
+        if not np.isfinite(delta[g]):  # aucun groupe libre : placé quand même, _repair() tentera de séparer
+            g = int(np.argmin(np.where(counts < capacity, counts, np.iinfo(np.int64).max)))
+        groups[i] = g
+        sums[g] += y[i]
+        counts[g] += 1
+    return groups
+
+
+def _swap_allowed(i: int, j: int, groups: np.ndarray, conflicts: Dict[int, set]) -> bool:
+    a, b = groups[i], groups[j]
+    return (all(groups[k] != b for k in conflicts.get(i, ()) if k != j)
+            and all(groups[k] != a for k in conflicts.get(j, ()) if k != i))
+
+
+def _clashes(i: int, g: int, groups: np.ndarray, conflicts: Dict[int, set], skip: int) -> int:
+    """Nombre de paires à séparer que formerait l'apprenant i dans le groupe g (hors `skip`)."""
+    return sum(1 for k in conflicts.get(i, ()) if k != skip and groups[k] == g)
+
+
+def _repair(groups: np.ndarray, conflicts: Dict[int, set], max_passes: int = MAX_PASSES) -> None:
+    """
+    Sépare les paires que le placement glouton a dû réunir : un apprenant concerné est échangé
+    avec un apprenant d'un autre groupe dès que l'échange diminue le nombre de paires réunies.
+    La recherche locale rééquilibre ensuite les groupes sans jamais en réunir de nouvelles.
+    """
+    for _ in range(max_passes):
+        improved = False
+        for i in sorted(conflicts):
+            a = groups[i]
+            if not _clashes(i, a, groups, conflicts, skip=-1):
+                continue
+            for j in np.flatnonzero(groups != a):
+                b = groups[j]
+                before = _clashes(i, a, groups, conflicts, skip=j) + _clashes(j, b, groups, conflicts, skip=i)
+                after = _clashes(i, b, groups, conflicts, skip=j) + _clashes(j, a, groups, conflicts, skip=i)
+                if after < before:
+                    groups[i], groups[j] = b, a
+                    improved = True
+                    break
+        if not improved:
+            return
+
+
+def _violations(emails: Sequence[str], groups: np.ndarray, conflicts: Dict[int, set]) -> List[Tuple[str, str]]:
+    """Paires à ne pas mettre ensemble qui partagent pourtant un groupe."""
+    return [(emails[i], emails[j]) for i in sorted(conflicts) for j in sorted(conflicts[i])
+            if i < j and groups[i] == groups[j]]
+
+
+def _local_search(y: np.ndarray, groups: np.ndarray, sizes: np.ndarray, conflicts: Dict[int, set],
+                  rng: np.random.Generator, max_passes: int, deadline: Optional[float]) -> Tuple[int, int]:
+    """
+    Échanges deux à deux tant qu'ils réduisent le coût. Pour un apprenant i (groupe a), le gain
+    de l'échange avec chaque j (groupe b) se calcule en une fois, d = y_j - y_i :
+        Δ = (2·D_a·d + |d|²) / n_a² + (|d|² - 2·D_b·d) / n_b²
+    avec D_g la somme des écarts du groupe g.
+    """
+    m = len(sizes)
+    dev_sums = np.zeros((m, y.shape[1]))
+    np.add.at(dev_sums, groups, y)
+    inv2 = 1.0 / np.maximum(sizes, 1).astype(np.float64) ** 2
+    sq = (y ** 2).sum(axis=1)
+    own = (dev_sums[groups] * y).sum(axis=1)  # D_{g(j)}·y_j, tenu à jour après chaque échange
+
+    swaps = passes = 0
+    while passes < max_passes:
+        passes += 1
+        improved = False
+        for i in rng.permutation(len(y)):
+            a = groups[i]
+            yi = y[i]
+            y_dot_yi = y @ yi
+            d_sq = sq - 2 * y_dot_yi + sq[i]
+            da_d = y @ dev_sums[a] - yi @ dev_sums[a]
+            db_d = own - (dev_sums @ yi)[groups]
+            delta = (2 * da_d + d_sq) * inv2[a] + (d_sq - 2 * db_d) * inv2[groups]
+            delta[groups == a] = np.inf
+
+            candidates = np.argpartition(delta, min(8, len(delta) - 1))[:8]
+            for j in candidates[np.argsort(delta[candidates])]:
+                if delta[j] >= -1e-12:
+                    break
+                if conflicts and not _swap_allowed(i, j, groups, conflicts):
+                    continue
+                b = groups[j]
+                d = y[j] - yi
+                dev_sums[a] += d
+                dev_sums[b] -= d
+                groups[i], groups[j] = b, a
+                moved = np.flatnonzero((groups == a) | (groups == b))
+                own[moved] = (dev_sums[groups[moved]] * y[moved]).sum(axis=1)
+                swaps += 1
+                improved = True
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                return swaps, passes
+        if not improved:
+            break
+    return swaps, passes
+
+
+def form_teams(
+    emails: Sequence[str],
+    scores: Dict[str, Dict[str, int]],
+    group_size: int,
+    apart: Iterable[Tuple[str, str]] = (),
+    seed: int = 0,
+    max_passes: int = MAX_PASSES,
+    time_budget_s: Optional[float] = None,
+) -> TeamPlan:
+    """
+    Groupes de group_size apprenants (tailles à un près), chacun aussi proche que possible du
+    mélange D/I/S/C de la cohorte. `apart` : paires d'emails à ne pas mettre ensemble ; celles
+    qui n'ont pas pu être séparées (trop de contraintes pour le nombre de groupes) sont listées
+    dans plan.violations.
+    """
+    if group_size < 1:
+        raise ValueError("group_size doit être >= 1")
+    emails = [normalize_email(e) for e in emails]
+    emails = [e for e in dict.fromkeys(emails) if e]
+    scores = {normalize_email(e): s for e, s in scores.items()}
+    missing = [e for e in emails if e not in scores]
+    n = len(emails)
+    if not n:
+        return TeamPlan(emails=[], groups=np.zeros(0, dtype=np.int64), n_groups=0, cost=0.0, greedy_cost=0.0)
+
+    m = math.ceil(n / group_size)
+    capacity = np.full(m, n // m) + (np.arange(m) < n % m)
+    y = _deviations(emails, scores)
+    conflicts = _conflicts(emails, apart)
+
+    groups = _greedy(y, capacity, conflicts)
+    _repair(groups, conflicts)
+    sizes = np.bincount(groups, minlength=m)
+    dev_sums = np.zeros((m, y.shape[1]))
+    np.add.at(dev_sums, groups, y)
+    greedy_cost = _cost(dev_sums, sizes)
+
+    deadline = time.monotonic() + time_budget_s if time_budget_s else None
+    swaps, passes = _local_search(y, groups, sizes, conflicts, np.random.default_rng(seed), max_passes, deadline)
+    dev_sums = np.zeros((m, y.shape[1]))
+    np.add.at(dev_sums, groups, y)
+    return TeamPlan(
+        emails=emails,
+        groups=groups,
+        n_groups=m,
+        cost=_cost(dev_sums, sizes),
+        greedy_cost=greedy_cost,
+        swaps=swaps,
+        passes=passes,
+        missing=missing,
+        violations=_violations(emails, groups, conflicts),
+    )
+
+
+# ---------------------------------------------------------
+# Restitution
+# ---------------------------------------------------------
+
+def _dominant(score: Optional[Dict[str, int]]) -> str:
+    if not score:
+        return ""
+    top = max(score.values())
+    return "".join(dim for dim in DIMS if score.get(dim) == top)
+
+
+def teams_frame(plan: TeamPlan, scores: Dict[str, Dict[str, int]]) -> pd.DataFrame:
+    """Une ligne par apprenant : groupe (à partir de 1), email, énergie dominante, scores."""
+    rows = []
+    for email, g in zip(plan.emails, plan.groups):
+        score = scores.get(email)
+        rows.append(
+            {
+                "groupe": int(g) + 1,
+                "email": email,
+                "dominante": _dominant(score),
+                **{dim: (score or {}).get(dim) for dim in DIMS},
+            }
+        )
+    df = pd.DataFrame(rows, columns=["groupe", "email", "dominante", *DIMS])
+    return df.sort_values(["groupe", "email"]).reset_index(drop=True)
+
+
+def groups_summary(plan: TeamPlan, scores: Dict[str, Dict[str, int]]) -> pd.DataFrame:
+    """Une ligne par groupe : taille, scores moyens, nombre d'apprenants par énergie dominante."""
+    df = teams_frame(plan, scores)
+    summary = df.groupby("groupe").agg(taille=("email", "size"), **{f"{dim} moyen": (dim, "mean") for dim in DIMS})
+    for dim in DIMS:
+        summary[f"dominante {dim}"] = df["dominante"].str.contains(dim).groupby(df["groupe"]).sum()
+    return summary.round(1).reset_index()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Constitue des groupes équilibrés en énergies DISC.")
+    parser.add_argument("cohort_csv", help="CSV de la cohorte (colonne email)")
+    parser.add_argument("--size", type=int, required=True, help="taille des groupes")
+    parser.add_argument("--log", default=DISC_LOG_PATH, help="journal des sessions DISC")
+    parser.add_argument("--out", help="CSV de sortie (sinon affichage)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    emails, scores = load_cohort(args.cohort_csv, args.log)
+    t0 = time.perf_counter()
+    plan = form_teams(emails, scores, args.size, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+    print(
+        f"{len(emails)} apprenants ({len(plan.missing)} sans résultat DISC), {plan.n_groups} groupes : "
+        f"coût {plan.greedy_cost:.4f} (glouton) -> {plan.cost:.4f} ({plan.swaps} échanges) en {elapsed:.2f} s"
+    )
+    for a, b in plan.violations:
+        print(f"attention : {a} et {b} sont dans le même groupe (contrainte impossible à respecter)")
+    if args.out:
+        teams_frame(plan, scores).to_csv(args.out, index=False)
+    else:
+        print(groups_summary(plan, scores).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
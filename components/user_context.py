@@ -1,6 +1,10 @@
 # components/user_context.py
 import streamlit as st
 
+from components import photo_store
+from components.profile_store import normalize_email
+from components.repository import get_repository
+
 # Profil par défaut
 DEFAULT_PROFILE = {
     "first_name": "",
@@ -9,23 +13,58 @@ DEFAULT_PROFILE = {
     "job_title": "",
     "company": "",
     "bio": "",
-    "photo_bytes": None,  # bytes de l'image
+    "photo_hash": None,  # empreinte de la photo (fichiers dans Data/photos)
+    "share_contact": False,
 }
 
 
+def current_email() -> str:
+    """Email de l'apprenant courant (verrouillé par le lien d'accès si disponible)."""
+    return normalize_email(st.session_state.get("approved_email") or st.session_state.get("email"))
+
+
 def init_user() -> dict:
-    """Initialise le profil utilisateur dans st.session_state si besoin."""
+    """
+    Initialise le profil utilisateur dans st.session_state si besoin,
+    à partir du profil enregistré pour l'email courant.
+    """
     profile = st.session_state.get("user_profile")
-    if profile is None:
+    email = current_email()
+    if profile is None or (email and profile.get("email") != email):
         profile = DEFAULT_PROFILE.copy()
+        if email:
+            try:
+                saved = get_repository().get_profile(email)
+                if saved is not None:
+                    profile.update(saved.to_record())
+            except Exception:
+                # On ne bloque pas l'app si le stockage est indisponible
+                pass
         # On récupère si possible ce qui vient déjà de l'onglet Accueil
         for key in ("first_name", "last_name", "email"):
             if key in st.session_state and st.session_state[key]:
                 profile[key] = st.session_state[key]
+        if email:
+            profile["email"] = email
         st.session_state["user_profile"] = profile
     return profile
 
 
+def update_profile(email: str, **fields) -> dict:
+    """
+    Enregistre ces champs dans le profil de l'apprenant (tous les process voient la mise à jour)
+    et recopie les clés globales utilisées ailleurs.
+    """
+    profile = {**DEFAULT_PROFILE, **get_repository().update_profile(email, **fields).to_record()}
+    st.session_state["user_profile"] = profile
+
+    # Ces clés sont utilisées par le DISC, etc.
+    st.session_state["first_name"] = profile["first_name"]
+    st.session_state["last_name"] = profile["last_name"]
+    st.session_state["email"] = profile["email"]
+    return profile
+
+
 def get_profile() -> dict:
     """Retourne le profil courant (et l'initialise si vide)."""
     return init_user()
@@ -40,35 +79,44 @@ def save_profile(
     bio: str,
 ) -> None:
     """Met à jour le profil + recopie dans les clés globales utilisées ailleurs."""
-    profile = init_user()
-    profile.update(
-        {
-            "first_name": first_name.strip(),
-            "last_name": last_name.strip(),
-            "email": email.strip().lower(),
-            "job_title": job_title.strip(),
-            "company": company.strip(),
-            "bio": bio.strip(),
-        }
+    update_profile(
+        email,
+        first_name=first_name.strip(),
+        last_name=last_name.strip(),
+        job_title=job_title.strip(),
+        company=company.strip(),
+        bio=bio.strip(),
     )
-    st.session_state["user_profile"] = profile
-
-    # Ces clés sont utilisées par le DISC, etc.
-    st.session_state["first_name"] = profile["first_name"]
-    st.session_state["last_name"] = profile["last_name"]
-    st.session_state["email"] = profile["email"]
 
 
-def save_photo(uploaded_file) -> None:
-    """Sauvegarde la photo (bytes) dans le profil."""
+def save_photo(uploaded_file) -> bool:
+    """
+    Redimensionne et enregistre la photo sur disque (par apprenant) ;
+    seule son empreinte est gardée dans le profil.
+    Retourne True si la photo courante a changé.
+    """
     if uploaded_file is None:
-        return
+        return False
     profile = init_user()
-    profile["photo_bytes"] = uploaded_file.getvalue()
+    photo_hash = photo_store.store_photo(_photo_owner(profile), uploaded_file.getvalue())
+    changed = photo_hash != profile.get("photo_hash")
+    profile["photo_hash"] = photo_hash
     st.session_state["user_profile"] = profile
+    if changed:
+        get_repository().update_profile(_photo_owner(profile), photo_hash=photo_hash)
+    return changed
 
 
-def get_photo():
-    """Retourne les bytes de la photo ou None."""
+def get_photo(size: int = photo_store.DEFAULT_SIZE):
+    """Retourne le chemin de la photo à la taille demandée, ou None."""
     profile = init_user()
-    return profile.get("photo_bytes")
+    owner = _photo_owner(profile)
+    if not owner:
+        return None
+    if not profile.get("photo_hash"):
+        profile["photo_hash"] = photo_store.current_photo_hash(owner)
+    return photo_store.photo_path(owner, profile.get("photo_hash"), size)
+
+
+def _photo_owner(profile: dict) -> str:
+    return current_email() or normalize_email(profile.get("email"))
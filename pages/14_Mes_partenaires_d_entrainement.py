@@ -0,0 +1,110 @@
+import pandas as pd
+import streamlit as st
+
+from components.access_guard import log_page_open
+from components.partner_index import COMPLEMENTARY, SIMILAR, get_partner_index
+from components.profiler import maybe_profile
+from components.repository import get_repository
+from components.user_context import update_profile
+
+st.set_page_config(
+    page_title="Mes partenaires d'entraînement",
+    page_icon="🤝",
+    layout="wide",
+)
+
+st.title("🤝 Mes partenaires d’entraînement")
+
+# ---------------------------------------------------------
+# 0) Vérifier qu’on connaît l’utilisateur
+# ---------------------------------------------------------
+email = (st.session_state.get("approved_email") or st.session_state.get("email") or "").strip().lower()
+
+if not email:
+    st.warning(
+        "Je ne trouve pas ton profil en mémoire. "
+        "Merci de passer d'abord par **Mon espace apprenant**."
+    )
+    st.stop()
+
+maybe_profile("partenaires", email)
+log_page_open(email, "partenaires")
+
+# ---------------------------------------------------------
+# 1) Mon profil dans l'index (dernière session DISC)
+# ---------------------------------------------------------
+index = get_partner_index()
+cohort, cohort_size = index.cohort_of(email)
+
+if not cohort_size:
+    st.info(
+        "Tes partenaires d’entraînement apparaîtront ici dès que tu auras complété le questionnaire DISC."
+    )
+    st.stop()
+
+if cohort:
+    st.caption(f"Cohorte **{cohort}** : {cohort_size} apprenants ont complété le questionnaire DISC.")
+else:
+    st.caption(f"{cohort_size} apprenants ont complété le questionnaire DISC.")
+
+# ---------------------------------------------------------
+# 2) Recherche des partenaires
+# ---------------------------------------------------------
+MODES = {
+    "Des profils proches du mien (mêmes énergies, mêmes réponses)": SIMILAR,
+    "Des profils complémentaires (forts là où je le suis moins)": COMPLEMENTARY,
+}
+
+col_mode, col_k = st.columns([3, 1])
+with col_mode:
+    mode_label = st.radio("Je cherche…", list(MODES), index=1)
+with col_k:
+    k = st.number_input("Nombre de partenaires", min_value=1, max_value=20, value=5, step=1)
+
+# ---------------------------------------------------------
+# 3) Consentement : e-mail visible par mes partenaires (désactivé par défaut)
+# ---------------------------------------------------------
+repo = get_repository()
+my_profile = repo.get_profile(email)
+shared = bool(my_profile and my_profile.share_contact)
+share = st.checkbox(
+    "J’accepte que mes partenaires d’entraînement voient mon adresse e-mail pour me contacter",
+    value=shared,
+)
+if share != shared:
+    update_profile(email, share_contact=share)
+
+partners = index.partners(email, k=int(k), mode=MODES[mode_label])
+
+if not partners:
+    st.info("Personne d’autre dans ta cohorte n’a encore complété le questionnaire DISC.")
+    st.stop()
+
+
+def _display(rank: int, profile) -> str:
+    """Prénom et initiale du nom si le profil est renseigné, sinon un simple numéro."""
+    if profile and profile.first_name:
+        initial = f" {profile.last_name[:1].upper()}." if profile.last_name else ""
+        return f"{profile.first_name}{initial}"
+    return f"Partenaire {rank}"
+
+
+# Seuls le style et le score d'affinité sont montrés : les scores détaillés restent privés
+rows = []
+for rank, p in enumerate(partners, start=1):
+    profile = repo.get_profile(p["email"])
+    rows.append(
+        {
+            "Partenaire": _display(rank, profile),
+            "Style": p["style"] or "—",
+            "Affinité" if MODES[mode_label] == SIMILAR else "Complémentarité": round(100 * max(p["score"], 0)),
+            "Contact": p["email"] if profile and profile.share_contact else "—",
+        }
+    )
+st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+st.caption(
+    "Affinité : ressemblance des scores DISC et des réponses au questionnaire (100 = identiques). "
+    "Complémentarité : énergies dominantes là où tu es le moins à l’aise (100 = profils opposés). "
+    "L’adresse e-mail n’apparaît que pour les apprenants qui ont accepté de la partager."
+)
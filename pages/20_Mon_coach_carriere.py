@@ -1,10 +1,15 @@
+import html
 import streamlit as st
 from datetime import datetime
 import uuid
 
-import gspread
-from gspread.exceptions import APIError, WorksheetNotFound
-from google.oauth2.service_account import Credentials
+from gspread.exceptions import APIError
+
+from components.access_guard import log_page_open
+from components.coach_inbox import STATUS_NEW, get_inbox
+from components.profiler import maybe_profile
+from components.repository import Message, get_repository
+from components.sheets_client import get_spreadsheet
 
 st.set_page_config(
     page_title="Mes échanges avec mon coach",
@@ -29,19 +34,14 @@ if not user_id or not email:
     st.stop()
 
 st.info(f"Connecté en tant que **{first_name}** ({email})")
+maybe_profile("coach", email)
+log_page_open(email, "coach")
 
 # ---------------------------------------------------------
 # 1) Connexion à Google Sheets
 # ---------------------------------------------------------
 try:
-    google_info = dict(st.secrets["google"])
-    scopes = st.secrets["scopes"]
-
-    creds = Credentials.from_service_account_info(google_info, scopes=scopes)
-    client = gspread.authorize(creds)
-
-    spreadsheet_id = st.secrets["gspread"]["spreadsheet_id"]
-    sh = client.open_by_key(spreadsheet_id)
+    get_spreadsheet()  # sonde : arrêt immédiat si le classeur est injoignable
 
 except Exception as e:
     st.error(f"Erreur de connexion à Google Sheets : {repr(e)}")
@@ -50,31 +50,11 @@ except Exception as e:
 # ---------------------------------------------------------
 # 2) Ouverture / création de l’onglet MESSAGES
 # ---------------------------------------------------------
-MESSAGES_SHEET_NAME = "MESSAGES"
+repo = get_repository()
 
 try:
-    try:
-        ws_msg = sh.worksheet(MESSAGES_SHEET_NAME)
-    except WorksheetNotFound:
-        ws_msg = sh.add_worksheet(title=MESSAGES_SHEET_NAME, rows=2000, cols=10)
-        ws_msg.append_row(
-            ["msg_id", "user_id", "sender", "message", "created_at", "status"]
-        )
-
-    # Récupérer tous les messages
-    all_msgs = ws_msg.get_all_records()
-
-    # Filtrer sur l'utilisateur courant
-    my_msgs = [
-        m for m in all_msgs
-        if str(m.get("user_id", "")).strip() == str(user_id)
-    ]
-
-    # Trier par date si possible
-    def _safe_created_at(m):
-        return m.get("created_at", "")
-
-    my_msgs = sorted(my_msgs, key=_safe_created_at)
+    # Messages de l'utilisateur courant, triés par date (lecture mise en cache)
+    my_msgs = repo.messages(user_id)
 
 except APIError as e:
     st.error("Erreur lors de l'accès à l’onglet MESSAGES.")
@@ -95,9 +75,10 @@ else:
     chat_container = st.container()
     with chat_container:
         for m in my_msgs:
-            sender = m.get("sender", "user")
-            message = m.get("message", "")
-            created_at = m.get("created_at", "")
+            sender = m.sender or "user"
+            # Texte saisi par l'apprenant ou le coach : échappé, seul le cadre est du HTML
+            message = html.escape(m.message).replace("\n", "<br>")
+            created_at = html.escape(m.created_at)
 
             if sender == "user":
                 # Message apprenant
@@ -155,14 +136,33 @@ if submitted:
         try:
             msg_id = str(uuid.uuid4())
             created_at = datetime.utcnow().isoformat() + "Z"
-            status = "new"   # le coach verra que c’est un nouveau message
+            status = STATUS_NEW   # le coach verra que c’est un nouveau message
 
-            ws_msg.append_row(
-                [msg_id, user_id, "user", new_message.strip(), created_at, status]
+            written, _ = repo.add_message(
+                Message(msg_id, str(user_id), "user", new_message.strip(), created_at, status)
             )
 
+            # Miroir dans l'index local de la boîte de réception coach
+            try:
+                get_inbox().record_message(
+                    msg_id=msg_id,
+                    user_id=user_id,
+                    sender="user",
+                    message=new_message.strip(),
+                    created_at=created_at,
+                    status=status,
+                    email=email,
+                    sheet_row=written.get("sheet_row"),
+                )
+            except Exception:
+                # L'index est reconstructible depuis Sheets : on ne bloque pas l'envoi
+                pass
+
             st.success("Message envoyé à ton coach 🎯")
-            st.experimental_rerun()  # pour rafraîchir le fil
+            try:
+                st.rerun()  # pour rafraîchir le fil
+            except AttributeError:
+                st.experimental_rerun()
 
         except Exception as e:
             st.error(f"Erreur lors de l’envoi du message : {repr(e)}")
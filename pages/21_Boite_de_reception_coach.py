@@ -0,0 +1,113 @@
+import html
+
+import streamlit as st
+
+from components.access_guard import enforce_access
+from components.coach_inbox import current_sheet_rows, get_inbox
+from components.profiler import maybe_profile
+from components.sheets_client import MESSAGES_ID_COL, MESSAGES_STATUS_COL, get_messages_worksheet
+
+st.set_page_config(
+    page_title="Boîte de réception coach",
+    page_icon="📥",
+    layout="wide",
+)
+
+PORTAL_URL = (st.secrets.get("PORTAL_ACCESS_URL") or "https://everboarding.fr/everinsight").strip()
+
+# ---------------------------------------------------------
+# 0) Accès réservé aux coachs (secret COACH_EMAILS)
+# ---------------------------------------------------------
+access = enforce_access(portal_url=PORTAL_URL, page_name="coach_inbox")
+coach_email = (access.get("email") or "").strip().lower()
+maybe_profile("coach_inbox", coach_email)
+
+coach_emails = {str(e).strip().lower() for e in (st.secrets.get("COACH_EMAILS") or [])}
+if coach_email not in coach_emails:
+    st.warning("🔒 Cette page est réservée aux coachs.")
+    st.stop()
+
+st.title("📥 Boîte de réception coach")
+
+inbox = get_inbox()
+
+# ---------------------------------------------------------
+# 1) Compteurs (lus depuis l'index, sans télécharger l'onglet)
+# ---------------------------------------------------------
+counters = inbox.unread_counts()
+
+col_total, col_learners, col_sync = st.columns([1, 1, 2])
+with col_total:
+    st.metric("Messages non lus", sum(c["unread"] for c in counters))
+with col_learners:
+    st.metric("Apprenants en attente", len(counters))
+with col_sync:
+    st.caption(
+        "L'index est alimenté à chaque envoi de message. "
+        "En cas de doute, resynchronise-le depuis Google Sheets."
+    )
+    if st.button("🔄 Resynchroniser depuis Google Sheets"):
+        try:
+            with st.spinner("Lecture de l'onglet MESSAGES..."):
+                n = inbox.rebuild(get_messages_worksheet().get_all_records())
+            st.success(f"Index reconstruit ({n} messages).")
+            st.rerun()
+        except Exception as e:
+            st.error(f"Erreur de resynchronisation : {repr(e)}")
+
+st.write("---")
+
+# ---------------------------------------------------------
+# 2) Non lus groupés par apprenant
+# ---------------------------------------------------------
+if not counters:
+    st.info("Aucun message non lu. 🎉")
+    st.stop()
+
+
+def _mark_read(msg_ids):
+    changed = inbox.mark_read(msg_ids)
+    if not changed:
+        return
+    try:
+        ws_msg = get_messages_worksheet()
+        # Lignes relues par msg_id : l'onglet a pu être trié ou modifié depuis l'envoi
+        rows = current_sheet_rows(changed, ws_msg.col_values(MESSAGES_ID_COL))
+        if not rows:
+            return
+        ws_msg.batch_update(
+            [
+                {
+                    "range": f"{chr(ord('A') + MESSAGES_STATUS_COL - 1)}{row}",
+                    "values": [["read"]],
+                }
+                for row in rows
+            ]
+        )
+    except Exception as e:
+        st.warning(f"Index mis à jour, mais la synchro Google Sheets a échoué : {repr(e)}")
+
+
+for group in inbox.inbox(per_learner=20):
+    learner = group["email"] or group["user_id"]
+    with st.expander(f"**{learner}** — {group['unread']} non lu(s) · dernier : {group['last_created_at']}"):
+        for m in group["messages"]:
+            # Texte saisi par l'apprenant : échappé, seul le cadre est du HTML
+            body = html.escape(str(m["message"] or "")).replace("\n", "<br>")
+            st.markdown(
+                f"""
+<div style="
+    background-color:#e6f4ff;
+    border-radius:12px;
+    padding:8px 12px;
+    margin-bottom:6px;
+">
+<span style="font-size:11px;color:#666;">({html.escape(str(m['created_at']))})</span><br>
+{body}
+</div>
+""",
+                unsafe_allow_html=True,
+            )
+        if st.button("✅ Marquer comme lu", key=f"read__{group['user_id']}"):
+            _mark_read([m["msg_id"] for m in group["messages"]])
+            st.rerun()
@@ -0,0 +1,82 @@
+import pandas as pd
+import streamlit as st
+
+from components.access_guard import require_admin
+from components.profiler import PROFILES_DIR, QUERY_PARAM, list_captures, read_folded
+
+st.set_page_config(
+    page_title="Profils de performance",
+    page_icon="⏱️",
+    layout="wide",
+)
+
+PORTAL_URL = (st.secrets.get("PORTAL_ACCESS_URL") or "https://everboarding.fr/everinsight").strip()
+
+# ---------------------------------------------------------
+# 0) Accès réservé aux admins (secret ADMIN_EMAILS)
+# ---------------------------------------------------------
+require_admin(portal_url=PORTAL_URL, page_name="profils_admin")
+
+st.title("⏱️ Profils de performance")
+st.caption(
+    f"Ajoute `&{QUERY_PARAM}=1` à l'URL d'une page pour profiler un rerun, "
+    "ou active le secret `PROFILE_RERUNS` pour profiler tous tes reruns. "
+    f"Les captures sont enregistrées dans `{PROFILES_DIR}`."
+)
+
+captures = list_captures()
+if not captures:
+    st.info("Aucune capture pour le moment.")
+    st.stop()
+
+# ---------------------------------------------------------
+# 1) Captures récentes
+# ---------------------------------------------------------
+st.subheader("Captures récentes")
+st.dataframe(
+    pd.DataFrame(
+        [
+            {
+                "page": c.get("page"),
+                "début": c.get("started_at"),
+                "durée (ms)": c.get("duration_ms"),
+                "échantillons": c.get("samples"),
+            }
+            for c in captures
+        ]
+    ),
+    hide_index=True,
+)
+
+# ---------------------------------------------------------
+# 2) Détail d'une capture : fonctions les plus coûteuses (temps cumulé)
+# ---------------------------------------------------------
+st.subheader("Détail")
+labels = [f"{c.get('started_at')} — {c.get('page')} ({c.get('duration_ms')} ms)" for c in captures]
+selected = captures[st.selectbox("Capture", range(len(captures)), format_func=lambda i: labels[i])]
+
+if selected.get("top"):
+    st.dataframe(
+        pd.DataFrame(selected["top"]).rename(
+            columns={
+                "function": "fonction",
+                "cumulative_ms": "cumulé (ms)",
+                "cumulative_pct": "cumulé (%)",
+                "own_ms": "propre (ms)",
+            }
+        ),
+        hide_index=True,
+    )
+else:
+    st.info("Rerun trop court : aucun échantillon.")
+
+try:
+    st.download_button(
+        "🔥 Télécharger la pile (flame graph)",
+        data=read_folded(selected),
+        file_name=selected["folded"],
+        mime="text/plain",
+        help="Format « folded » : à ouvrir dans speedscope.app ou avec flamegraph.pl.",
+    )
+except OSError:
+    st.caption("Fichier de pile introuvable.")
@@ -0,0 +1,71 @@
+import pandas as pd
+import streamlit as st
+
+from components.access_guard import require_admin
+from components.blob_store import BLOBS_DIR, get_blob_store
+from components.session_memory import LARGE_VALUE_BYTES, process_report
+
+st.set_page_config(
+    page_title="Mémoire des sessions",
+    page_icon="🧠",
+    layout="wide",
+)
+
+PORTAL_URL = (st.secrets.get("PORTAL_ACCESS_URL") or "https://everboarding.fr/everinsight").strip()
+
+# ---------------------------------------------------------
+# 0) Accès réservé aux admins (secret ADMIN_EMAILS)
+# ---------------------------------------------------------
+require_admin(portal_url=PORTAL_URL, page_name="memoire_admin")
+
+st.title("🧠 Mémoire des sessions")
+st.caption(
+    "Taille approximative de st.session_state dans ce process (un process par worker). "
+    f"Les valeurs de plus de {LARGE_VALUE_BYTES // 1024} Ko devraient passer par le blob store ({BLOBS_DIR})."
+)
+
+report = process_report()
+
+
+def _mo(n: int) -> float:
+    return round(n / (1024 * 1024), 2)
+
+
+col_sessions, col_total = st.columns(2)
+with col_sessions:
+    st.metric("Sessions", len(report["sessions"]))
+with col_total:
+    st.metric("Total (Mo)", _mo(report["total_bytes"]))
+
+# ---------------------------------------------------------
+# 1) Par clé, toutes sessions confondues
+# ---------------------------------------------------------
+st.subheader("Par clé")
+st.dataframe(
+    pd.DataFrame(
+        [{"clé": a["key"], "sessions": a["sessions"], "total (Mo)": _mo(a["bytes"])} for a in report["by_key"]]
+    ),
+    hide_index=True,
+)
+
+# ---------------------------------------------------------
+# 2) Par session (clés les plus lourdes)
+# ---------------------------------------------------------
+st.subheader("Par session")
+st.dataframe(
+    pd.DataFrame(
+        [
+            {
+                "session": s["session_id"],
+                "clés": s["keys"],
+                "total (Ko)": round(s["bytes"] / 1024, 1),
+                "plus lourdes": ", ".join(f"{r['key']} ({r['bytes'] // 1024} Ko)" for r in s["top"]),
+            }
+            for s in report["sessions"]
+        ]
+    ),
+    hide_index=True,
+)
+
+if st.button("🧹 Purger les blobs expirés"):
+    st.success(f"{get_blob_store().gc()} blob(s) supprimé(s).")
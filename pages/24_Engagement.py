@@ -0,0 +1,91 @@
+import pandas as pd
+import streamlit as st
+
+from components.access_guard import require_admin
+from components.event_rollup import FUNNEL, UNWIRED_STAGES, load_rollups, rollup_state
+
+st.set_page_config(
+    page_title="Engagement",
+    page_icon="📈",
+    layout="wide",
+)
+
+PORTAL_URL = (st.secrets.get("PORTAL_ACCESS_URL") or "https://everboarding.fr/everinsight").strip()
+
+FUNNEL_LABELS = {
+    "accueil": "Accueil",
+    "mon_espace": "Mon espace",
+    "coach": "Coach carrière",
+    "resultats": "Résultats DISC",
+}
+
+# ---------------------------------------------------------
+# 0) Accès réservé aux admins (secret ADMIN_EMAILS)
+# ---------------------------------------------------------
+require_admin(portal_url=PORTAL_URL, page_name="engagement_admin")
+
+st.title("📈 Engagement des apprenants")
+
+# Uniquement les agrégats précalculés (python -m components.event_rollup), jamais les événements bruts
+rollups = load_rollups()
+daily, pages, funnel = rollups["daily"], rollups["daily_pages"], rollups["daily_funnel"]
+updated_at = rollup_state().get("updated_at")
+st.caption(f"Agrégats calculés le {updated_at}." if updated_at else "Agrégats pas encore calculés.")
+
+if daily.empty:
+    st.info("Aucun agrégat disponible : lance `python -m components.event_rollup`.")
+    st.stop()
+
+days = sorted(daily["date"].astype(str).unique())
+start, end = st.select_slider("Période", options=days, value=(days[max(0, len(days) - 30)], days[-1]))
+
+
+def _in_period(df: pd.DataFrame) -> pd.DataFrame:
+    dates = df["date"].astype(str)
+    return df[(dates >= start) & (dates <= end)]
+
+
+daily, pages, funnel = _in_period(daily), _in_period(pages), _in_period(funnel)
+
+# ---------------------------------------------------------
+# 1) Activité quotidienne
+# ---------------------------------------------------------
+col_events, col_learners, col_profiles = st.columns(3)
+with col_events:
+    st.metric("Événements", int(daily["events"].sum()))
+with col_learners:
+    st.metric("Apprenants actifs (max / jour)", int(daily["learners"].max()))
+with col_profiles:
+    st.metric("Profils enregistrés", int(daily["profiles_saved"].sum()))
+
+st.subheader("Apprenants uniques par jour")
+st.line_chart(daily.set_index("date")["learners"])
+
+st.subheader("Ouvertures par page")
+st.bar_chart(pages.pivot_table(index="date", columns="page", values="opens", aggfunc="sum", fill_value=0))
+
+# ---------------------------------------------------------
+# 2) Entonnoir accueil -> Mon espace -> coach -> résultats DISC (le même jour)
+# ---------------------------------------------------------
+st.subheader("Entonnoir")
+totals = funnel.groupby("stage")["learners"].sum().reindex(list(FUNNEL), fill_value=0)
+first = max(int(totals.iloc[0]), 1)
+st.dataframe(
+    pd.DataFrame(
+        {
+            "étape": [FUNNEL_LABELS.get(s, s) for s in totals.index],
+            "apprenants": totals.to_numpy(),
+            "conversion depuis l'accueil": (totals / first).round(3).to_numpy(),
+            "conversion depuis l'étape précédente": (totals / totals.shift(1).fillna(totals.iloc[0]).clip(lower=1))
+            .round(3)
+            .to_numpy(),
+        }
+    ),
+    hide_index=True,
+)
+unwired = [FUNNEL_LABELS.get(s, s) for s in FUNNEL if s in UNWIRED_STAGES]
+if unwired:
+    st.caption(
+        f"⚠️ Étape(s) pas encore branchée(s) : {', '.join(unwired)}. Aucune page accessible aux apprenants "
+        "ne l’enregistre pour l’instant, elle reste donc à 0."
+    )
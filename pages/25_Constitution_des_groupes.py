@@ -0,0 +1,89 @@
+import streamlit as st
+
+from components.access_guard import require_admin
+from components.allowlist import get_allowlist
+from components.team_builder import cohort_scores, form_teams, groups_summary, teams_frame
+
+st.set_page_config(
+    page_title="Constitution des groupes",
+    page_icon="🧩",
+    layout="wide",
+)
+
+PORTAL_URL = (st.secrets.get("PORTAL_ACCESS_URL") or "https://everboarding.fr/everinsight").strip()
+
+# ---------------------------------------------------------
+# 0) Accès réservé aux admins (secret ADMIN_EMAILS)
+# ---------------------------------------------------------
+require_admin(portal_url=PORTAL_URL, page_name="groupes_admin")
+
+st.title("🧩 Constitution des groupes d’atelier")
+st.caption(
+    "Groupes équilibrés en énergies D / I / S / C à partir des derniers résultats DISC de la cohorte. "
+    "Les apprenants sans résultat sont répartis en complément."
+)
+
+# ---------------------------------------------------------
+# 1) Paramètres
+# ---------------------------------------------------------
+allowlist = get_allowlist()
+cohorts = allowlist.cohorts()
+if not cohorts:
+    st.info("Aucune cohorte : ajoute un CSV dans Data/cohortes/ ou Data/profils_etudiants.csv.")
+    st.stop()
+
+col_cohort, col_size = st.columns([3, 1])
+with col_cohort:
+    cohort = st.selectbox("Cohorte", [c for c, _ in cohorts], format_func=lambda c: f"{c} ({dict(cohorts)[c]})")
+with col_size:
+    group_size = st.number_input("Taille des groupes", min_value=2, max_value=20, value=5, step=1)
+
+apart_text = st.text_area(
+    "Apprenants à ne pas mettre ensemble (une paire par ligne : email1, email2)",
+    placeholder="alice@ecole.fr, bob@ecole.fr",
+)
+apart = []
+for line in apart_text.splitlines():
+    parts = [p.strip() for p in line.replace(";", ",").split(",") if p.strip()]
+    if len(parts) == 2:
+        apart.append((parts[0], parts[1]))
+
+# ---------------------------------------------------------
+# 2) Calcul
+# ---------------------------------------------------------
+if st.button("Constituer les groupes", type="primary"):
+    emails = allowlist.members(cohort)
+    scores = cohort_scores(emails)
+    with st.spinner("Constitution des groupes…"):
+        plan = form_teams(emails, scores, int(group_size), apart=apart, time_budget_s=20)
+    st.session_state["_teams_result"] = (cohort, int(group_size), plan, scores)
+
+result = st.session_state.get("_teams_result")
+if not result or result[0] != cohort:
+    st.stop()
+
+_, size, plan, scores = result
+st.success(
+    f"{len(plan.emails)} apprenants répartis en {plan.n_groups} groupes de {size} "
+    f"({len(plan.missing)} sans résultat DISC). "
+    f"Écart au mélange de la cohorte : {plan.greedy_cost:.3f} après placement, {plan.cost:.3f} après {plan.swaps} échanges."
+)
+
+if plan.violations:
+    st.warning(
+        "⚠️ Certaines paires n’ont pas pu être séparées (trop de contraintes pour le nombre de groupes) :\n"
+        + "\n".join(f"- {a} et {b}" for a, b in plan.violations)
+    )
+
+st.subheader("Synthèse par groupe")
+st.dataframe(groups_summary(plan, scores), use_container_width=True, hide_index=True)
+
+st.subheader("Détail")
+detail = teams_frame(plan, scores)
+st.dataframe(detail, use_container_width=True, hide_index=True)
+st.download_button(
+    "⬇️ Télécharger les groupes (CSV)",
+    data=detail.to_csv(index=False).encode("utf-8"),
+    file_name=f"groupes_{cohort}_{size}.csv",
+    mime="text/csv",
+)
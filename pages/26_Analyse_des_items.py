@@ -0,0 +1,64 @@
+import streamlit as st
+
+from components.access_guard import require_admin
+from components.item_analysis import get_item_analysis
+
+st.set_page_config(
+    page_title="Analyse des items",
+    page_icon="🔬",
+    layout="wide",
+)
+
+PORTAL_URL = (st.secrets.get("PORTAL_ACCESS_URL") or "https://everboarding.fr/everinsight").strip()
+
+# ---------------------------------------------------------
+# 0) Accès réservé aux admins (secret ADMIN_EMAILS)
+# ---------------------------------------------------------
+require_admin(portal_url=PORTAL_URL, page_name="items_admin")
+
+st.title("🔬 Analyse des items du questionnaire DISC")
+st.caption(
+    "Calculée sur toutes les sessions du journal. Questionnaire à choix forcé : l’alpha et les "
+    "corrélations item-total sont tirés vers le bas, à comparer d’une question à l’autre."
+)
+
+with st.spinner("Analyse des sessions…"):
+    analysis = get_item_analysis()
+
+if not analysis.n_sessions:
+    st.info("Aucune session DISC enregistrée pour le moment.")
+    st.stop()
+
+st.markdown(f"**{analysis.n_sessions}** sessions, dont **{analysis.n_complete}** complètes.")
+
+# ---------------------------------------------------------
+# 1) Cohérence interne par dimension
+# ---------------------------------------------------------
+st.subheader("Cohérence par dimension")
+st.dataframe(analysis.dimensions.round(3), use_container_width=True, hide_index=True)
+
+# ---------------------------------------------------------
+# 2) Propositions
+# ---------------------------------------------------------
+st.subheader("Propositions")
+only_weak = st.checkbox("Seulement les propositions peu discriminantes (r item-total < 0,1)")
+options = analysis.options
+if only_weak:
+    options = options[options["item_total_r"] < 0.1]
+st.dataframe(options.round(3), use_container_width=True, hide_index=True)
+
+col_options, col_dims = st.columns(2)
+with col_options:
+    st.download_button(
+        "⬇️ Propositions (CSV)",
+        data=analysis.options.to_csv(index=False).encode("utf-8"),
+        file_name="item_options.csv",
+        mime="text/csv",
+    )
+with col_dims:
+    st.download_button(
+        "⬇️ Dimensions (CSV)",
+        data=analysis.dimensions.to_csv(index=False).encode("utf-8"),
+        file_name="item_dimensions.csv",
+        mime="text/csv",
+    )
@@ -0,0 +1,76 @@
+import pandas as pd
+import streamlit as st
+
+from components.access_guard import require_admin
+from components.allowlist import get_allowlist
+from components.disc_log import ALL_COHORTS
+from components.disc_texts import DIMS
+from components.history_index import DOWN, UP, get_history_index
+
+st.set_page_config(
+    page_title="Évolution des profils",
+    page_icon="📈",
+    layout="wide",
+)
+
+PORTAL_URL = (st.secrets.get("PORTAL_ACCESS_URL") or "https://everboarding.fr/everinsight").strip()
+
+# ---------------------------------------------------------
+# 0) Accès réservé aux admins (secret ADMIN_EMAILS)
+# ---------------------------------------------------------
+require_admin(portal_url=PORTAL_URL, page_name="evolution_admin")
+
+st.title("📈 Évolution des profils DISC")
+st.caption("Écart entre la première et la dernière passation de chaque apprenant ayant refait le questionnaire.")
+
+# ---------------------------------------------------------
+# 1) Paramètres
+# ---------------------------------------------------------
+cohorts = [c for c, _ in get_allowlist().cohorts()]
+col_cohort, col_criterion, col_k = st.columns([2, 2, 1])
+with col_cohort:
+    cohort = st.selectbox(
+        "Cohorte", [ALL_COHORTS] + cohorts, format_func=lambda c: "Tous les apprenants" if c == ALL_COHORTS else c
+    )
+with col_criterion:
+    criteria = {"Ampleur totale": (None, UP)}
+    for dim in DIMS:
+        criteria[f"Hausse de {dim}"] = (dim, UP)
+        criteria[f"Baisse de {dim}"] = (dim, DOWN)
+    criterion = st.selectbox("Classement", list(criteria))
+with col_k:
+    k = st.number_input("Nombre", min_value=1, max_value=500, value=20, step=5)
+
+# ---------------------------------------------------------
+# 2) Classement
+# ---------------------------------------------------------
+history_index = get_history_index()
+n_repeat = history_index.count(cohort)
+st.markdown(f"**{n_repeat}** apprenant(s) avec au moins deux passations.")
+
+dim, direction = criteria[criterion]
+movers = history_index.movers(cohort, k=int(k), dim=dim, direction=direction)
+if not movers:
+    st.info("Aucune évolution à afficher pour ce critère.")
+    st.stop()
+
+table = pd.DataFrame(
+    [
+        {
+            "Email": m["email"],
+            "Passations": m["n_sessions"],
+            "Première": m["first_ts"],
+            "Dernière": m["latest_ts"],
+            **{f"Δ {d}": m[d] for d in DIMS},
+            "Ampleur": m["movement"],
+        }
+        for m in movers
+    ]
+)
+st.dataframe(table, use_container_width=True, hide_index=True)
+st.download_button(
+    "⬇️ Télécharger (CSV)",
+    data=table.to_csv(index=False).encode("utf-8"),
+    file_name=f"evolution_{cohort}.csv",
+    mime="text/csv",
+)
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.allowlist import Allowlist  # noqa: E402
+from components.disc_log import LogTail  # noqa: E402
+
+
+class DiscLog:
+    """Journal des sessions DISC d'un test (vide au départ)."""
+
+    def __init__(self, path):
+        self.path = path
+        path.touch()
+
+    def append(self, *lines: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+    def tail(self) -> LogTail:
+        return LogTail(str(self.path))
+
+
+@pytest.fixture
+def disc_log(tmp_path):
+    return DiscLog(tmp_path / "sessions.jsonl")
+
+
+@pytest.fixture
+def cohort_allowlist(tmp_path):
+    """cohort_allowlist("a@x.fr", ...) : Allowlist relue à chaque accès, cohorte "mba" (tmp_path/mba.csv)."""
+
+    def _make(*emails: str, cohort: str = "mba") -> Allowlist:
+        path = tmp_path / f"{cohort}.csv"
+        path.write_text("email\n" + "".join(f"{e}\n" for e in emails), encoding="utf-8")
+        return Allowlist([str(path)], check_interval_s=0)
+
+    return _make
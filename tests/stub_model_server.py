@@ -0,0 +1,125 @@
+# Serveur local imitant POST /v1/responses de l'API OpenAI (tests et répétitions à blanc).
+#
+#   python tests/stub_model_server.py --port 8765
+#   python -m components.batch_pregen --base-url http://127.0.0.1:8765/v1 --cohort Data/profils_etudiants.csv
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _response_body(prompt: str, model: str) -> dict:
+    text = f"Texte de test ({len(prompt)} caractères de prompt)."
+    return {
+        "id": "resp_stub",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": model,
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_stub",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def _stream_events(prompt: str, model: str):
+    """Événements SSE de l'API Responses en mode stream (deltas puis response.completed)."""
+    body = _response_body(prompt, model)
+    text = body["output"][0]["content"][0]["text"]
+    seq = 0
+    yield {"type": "response.created", "sequence_number": seq, "response": {**body, "status": "in_progress", "output": []}}
+    for word in text.split(" "):
+        seq += 1
+        yield {
+            "type": "response.output_text.delta",
+            "sequence_number": seq,
+            "item_id": "msg_stub",
+            "output_index": 0,
+            "content_index": 0,
+            "delta": word + " ",
+            "logprobs": [],
+        }
+    yield {"type": "response.completed", "sequence_number": seq + 1, "response": body}
+
+
+class StubModelServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.requests = []
+        self.max_concurrent = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.requests.append(payload)
+                    server._active += 1
+                    server.max_concurrent = max(server.max_concurrent, server._active)
+                try:
+                    time.sleep(server.delay_s)
+                    if not self.path.endswith("/responses"):
+                        self.send_error(404)
+                        return
+                    if payload.get("stream"):
+                        self.send_response(200)
+                        self.send_header("Content-Type", "text/event-stream")
+                        self.end_headers()
+                        for event in _stream_events(str(payload.get("input", "")), payload.get("model", "")):
+                            self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+                            self.wfile.flush()
+                        self.close_connection = True
+                        return
+                    body = json.dumps(
+                        _response_body(str(payload.get("input", "")), payload.get("model", ""))
+                    ).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server._lock:
+                        server._active -= 1
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+    with StubModelServer(port=args.port, delay_s=args.delay) as stub:
+        print(f"Stub OpenAI sur {stub.base_url}")
+        threading.Event().wait()
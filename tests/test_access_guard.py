@@ -0,0 +1,34 @@
+from components import access_guard
+from components.cache import SharedCache
+
+
+def test_only_approvals_are_cached(tmp_path, monkeypatch):
+    cache = SharedCache(str(tmp_path / "shared.sqlite3"))
+    calls = []
+
+    def fake_validate(token):
+        calls.append(token)
+        if token == "good":
+            return True, {"ok": True, "status": "approved", "email": "a@x.fr"}
+        return False, {"ok": False}
+
+    monkeypatch.setattr(access_guard, "get_shared_cache", lambda: cache)
+    monkeypatch.setattr(access_guard, "validate_token_via_webhook", fake_validate)
+
+    assert access_guard.validate_token_cached("good") == (True, {"ok": True, "status": "approved", "email": "a@x.fr"})
+    assert access_guard.validate_token_cached("good")[0] is True
+    assert access_guard.validate_token_cached("bad")[0] is False
+    assert access_guard.validate_token_cached("bad")[0] is False
+    assert calls == ["good", "bad", "bad"]
+    assert all("good" not in k for k in [r[0] for r in cache._conn.execute("SELECT key FROM cache")])
+
+
+def test_page_open_is_logged_once_the_email_is_known(monkeypatch):
+    events = []
+    monkeypatch.setattr(access_guard.st, "session_state", {})
+    monkeypatch.setattr(access_guard, "log_event_via_webhook", lambda **kw: events.append(kw["email"]))
+
+    access_guard.log_page_open("", "mon_espace")
+    access_guard.log_page_open("a@x.fr", "mon_espace")
+    access_guard.log_page_open("a@x.fr", "mon_espace")
+    assert events == ["a@x.fr"]
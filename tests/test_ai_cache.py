@@ -0,0 +1,89 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from components import coach_ia
+from components.ai_cache import ResponseCache, make_key
+
+
+class StubClient:
+    """Imite client.responses.create(...) de l'API Responses."""
+
+    def __init__(self, text="Texte généré.", delay=0.0, fail=False):
+        self.text = text
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.responses = self
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        content = SimpleNamespace(text=f"  {self.text}  ")
+        return SimpleNamespace(output=[SimpleNamespace(content=[content])])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "ai.sqlite3"))
+
+
+def test_identical_inputs_hit_the_cache(cache):
+    client = StubClient()
+    a = coach_ia.generer_motivation_ia("Devenir chef", "a", "b", "c", "d", "e", client=client, cache=cache)
+    b = coach_ia.generer_motivation_ia("Devenir  chef ", "a", "b", "c", "d", "e", client=client, cache=cache)
+    assert a == b == "Texte généré."
+    assert len(client.calls) == 1
+    assert client.calls[0]["model"] == coach_ia.MODEL
+
+    coach_ia.generer_kpi_ia("Devenir chef", "obj", "", "", "mai", "2027", client=client, cache=cache)
+    assert len(client.calls) == 2
+
+
+def test_key_depends_on_model_and_template():
+    inputs = {"ambition": "x"}
+    assert make_key("m1", "v1", inputs) != make_key("m2", "v1", inputs)
+    assert make_key("m1", "v1", inputs) != make_key("m1", "v2", inputs)
+
+
+def test_concurrent_identical_calls_are_collapsed(cache):
+    client = StubClient(delay=0.2)
+    results = []
+
+    def worker():
+        results.append(coach_ia.generer_motivation_ia("x", "a", "b", "c", "d", "e", client=client, cache=cache))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(client.calls) == 1
+    assert results == ["Texte généré."] * 8
+
+
+def test_errors_are_not_cached(cache):
+    with pytest.raises(RuntimeError):
+        coach_ia.generer_motivation_ia("x", "", "", "", "", "e", client=StubClient(fail=True), cache=cache)
+    assert len(cache) == 0
+    client = StubClient()
+    coach_ia.generer_motivation_ia("x", "", "", "", "", "e", client=client, cache=cache)
+    assert len(client.calls) == 1
+
+
+def test_ttl_and_size_bounded_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "ai.sqlite3"), max_entries=3)
+    for i in range(5):
+        cache.set(f"k{i}", "v")
+        time.sleep(0.001)
+    assert len(cache) == 3
+    assert cache.get("k0") is None and cache.get("k4") == "v"
+
+    expired = ResponseCache(str(tmp_path / "ttl.sqlite3"), ttl_s=0)
+    expired.set("k", "v")
+    time.sleep(0.01)
+    assert expired.get("k") is None
@@ -0,0 +1,47 @@
+import os
+
+from components.allowlist import Allowlist, read_emails
+
+
+def _write(path, text, mtime=None):
+    path.write_text(text, encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_read_emails_normalizes(tmp_path):
+    csv_path = tmp_path / "c.csv"
+    _write(csv_path, "\ufeffnom,Email\nAna, Ana@X.fr \nBob,\n")
+    assert read_emails(str(csv_path)) == ["ana@x.fr"]
+
+
+def test_lookup_cohort_and_count(tmp_path):
+    (tmp_path / "cohortes").mkdir()
+    _write(tmp_path / "profils_etudiants.csv", "email\na@x.fr\nb@x.fr\n")
+    _write(tmp_path / "cohortes" / "mba_2026.csv", "email\nc@x.fr\nA@x.fr\n")
+    allow = Allowlist([str(tmp_path / "profils_etudiants.csv"), str(tmp_path / "cohortes" / "*.csv")])
+
+    assert allow.lookup(" A@X.FR") and "c@x.fr" in allow and not allow.lookup("z@x.fr")
+    assert allow.cohort_of("c@x.fr") == "mba_2026"
+    assert allow.cohort_of("a@x.fr") == "mba_2026"  # premier chemin dans l'ordre alphabétique
+    assert allow.count() == 3
+    assert allow.cohorts() == [("mba_2026", 2), ("profils_etudiants", 1)]
+
+
+def test_reload_on_mtime_change(tmp_path):
+    csv_path = tmp_path / "profils_etudiants.csv"
+    _write(csv_path, "email\na@x.fr\n", mtime=1_000_000)
+    allow = Allowlist([str(csv_path)], check_interval_s=0)
+    assert allow.count() == 1
+
+    _write(csv_path, "email\na@x.fr\nb@x.fr\n", mtime=1_000_100)
+    assert allow.lookup("b@x.fr")
+    assert allow.count("profils_etudiants") == 2
+
+    csv_path.unlink()
+    assert allow.count() == 0
+
+
+def test_missing_sources(tmp_path):
+    allow = Allowlist([str(tmp_path / "absent.csv"), str(tmp_path / "*.csv")])
+    assert allow.count() == 0 and allow.cohort_of("a@x.fr") is None
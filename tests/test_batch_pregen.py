@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from components import batch_pregen, coach_ia
+from components.ai_cache import ResponseCache
+from components.espace_store import EspaceState, EspaceStore
+
+from stub_model_server import StubModelServer
+
+openai = pytest.importorskip("openai")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EspaceStore(str(tmp_path / "espace.sqlite3"))
+    for i in range(6):
+        store.save(
+            f"learner{i}@x.fr",
+            {
+                "ambition_courte": f"Ambition {i}",
+                "why5": "être utile",
+                "objectif_principal": f"Objectif {i}",
+                "horizon_annee": 2027,
+            },
+        )
+    store.save("vide@x.fr", {"why1": "pas encore d'ambition"})
+    return store
+
+
+def test_cohort_is_pregenerated_into_the_cache(tmp_path, store):
+    cache = ResponseCache(str(tmp_path / "ai.sqlite3"))
+    jobs = batch_pregen.collect_jobs(store)
+    assert len(jobs) == 12
+
+    with StubModelServer(delay_s=0.05) as stub:
+        client = openai.OpenAI(api_key="stub", base_url=stub.base_url, max_retries=0)
+        report = batch_pregen.run_jobs(jobs, client, cache, parallelism=3)
+        assert report == {"jobs": 12, "generated": 12, "cached": 0, "failed": 0}
+        assert 1 < stub.max_concurrent <= 3
+
+        again = batch_pregen.run_jobs(jobs, client, cache, parallelism=3)
+        assert again["cached"] == 12
+        assert len(stub.requests) == 12
+
+    assert cache.get(jobs[0].key).startswith("Texte de test")
+
+
+def test_batch_file_round_trip(tmp_path, store):
+    cache = ResponseCache(str(tmp_path / "ai.sqlite3"))
+    jobs = batch_pregen.collect_jobs(store, ["learner0@x.fr", "inconnu@x.fr"])
+    path = tmp_path / "batch.jsonl"
+    assert batch_pregen.export_batch_file(jobs, str(path), cache) == 2
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    output = tmp_path / "out.jsonl"
+    output.write_text(
+        "\n".join(
+            json.dumps(
+                {
+                    "custom_id": line["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {"output": [{"content": [{"type": "output_text", "text": " ok "}]}]},
+                    },
+                }
+            )
+            for line in lines
+        ),
+        encoding="utf-8",
+    )
+    assert batch_pregen.import_batch_results(str(output), cache) == {"imported": 2, "failed": 0}
+    assert cache.get(jobs[1].key) == "ok"
+    assert batch_pregen.export_batch_file(jobs, str(path), cache) == 0
+
+
+def test_keys_match_the_page_when_the_month_was_never_saved(store):
+    class _KeyRecorder:
+        def __init__(self):
+            self.keys = []
+
+        def stream_or_compute(self, key, _open):
+            self.keys.append(key)
+            return iter(())
+
+    data = store.load("learner0@x.fr")
+    assert "horizon_mois" not in data
+    job = next(j for j in batch_pregen.jobs_for_entry("learner0@x.fr", data) if j.kind == "kpi")
+    assert "None" not in job.prompt
+
+    # Même appel que le bouton KPI de la page Mon espace
+    etat = EspaceState.from_session(data)
+    recorder = _KeyRecorder()
+    coach_ia.stream_kpi_ia(
+        etat.ambition_courte, etat.objectif_principal, etat.sous_objectif_1, etat.sous_objectif_2,
+        etat.horizon_mois, etat.horizon_annee_txt, cache=recorder,
+    )
+    assert recorder.keys == [job.key]
@@ -0,0 +1,54 @@
+import os
+
+from components import blob_store
+from components.blob_store import BlobRef, BlobStore, get_session_blob, put_session_blob
+from components.session_memory import large_values, process_report, state_report
+
+
+def test_put_get_is_content_addressed(tmp_path):
+    store = BlobStore(str(tmp_path))
+    ref = store.put(b"%PDF-1.4 abc", mime="application/pdf")
+    assert store.put(b"%PDF-1.4 abc", mime="application/pdf") == ref
+    assert ref.size == 12 and len(ref.digest) == 64
+    assert store.get(ref) == b"%PDF-1.4 abc"
+    assert sum(len(files) for _, _, files in os.walk(tmp_path)) == 1
+
+    os.remove(store.path(ref))
+    assert store.get(ref) is None
+
+
+def test_gc_bounds_total_size(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=250)
+    refs = []
+    for i in range(3):
+        refs.append(store.put(bytes([i]) * 100))
+        os.utime(store.path(refs[-1]), (1000 + i, 1000 + i))
+    store.ttl_s = 1e12  # seule la limite de taille joue ici
+
+    assert store.gc() == 1
+    assert store.get(refs[0]) is None
+    assert store.get(refs[2]) is not None
+
+
+def test_session_holds_reference_only(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path))
+    monkeypatch.setattr(blob_store, "get_blob_store", lambda: store)
+    state = {"radar_png": b"old inline bytes"}
+    assert get_session_blob("radar_png", state) == b"old inline bytes"
+
+    put_session_blob("radar_png", b"\x89PNG" + b"x" * 500_000, mime="image/png", state=state)
+    assert isinstance(state["radar_png"], BlobRef)
+    assert get_session_blob("radar_png", state)[:4] == b"\x89PNG"
+    assert get_session_blob("missing", state) is None
+    assert state_report(state)[0]["bytes"] < 1024
+
+
+def test_memory_report_per_key_and_session():
+    big = b"x" * 300_000
+    report = process_report([("s1", {"last_pdf_bytes": big, "email": "a@x.fr"}), ("s2", {"email": "b@x.fr"})])
+
+    assert [s["session_id"] for s in report["sessions"]] == ["s1", "s2"]
+    assert report["by_key"][0]["key"] == "last_pdf_bytes"
+    assert report["by_key"][1] == {"key": "email", "sessions": 2, "bytes": report["by_key"][1]["bytes"]}
+    assert report["total_bytes"] > 300_000
+    assert [r["key"] for r in large_values({"last_pdf_bytes": big, "email": "a@x.fr"})] == ["last_pdf_bytes"]
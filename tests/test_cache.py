@@ -0,0 +1,79 @@
+import time
+
+from components.cache import MemoryCache
+
+
+def test_get_set_delete_prefix():
+    cache = MemoryCache()
+    cache.set("repo:profiles:a", 1)
+    cache.set("repo:profiles:b", 2)
+    cache.set("repo:messages:a", 3)
+    assert cache.get("repo:profiles:a") == 1 and cache.get("absent", "x") == "x"
+    assert cache.delete_prefix("repo:profiles:") == 2
+    assert len(cache) == 1
+    cache.delete("repo:messages:a")
+    assert cache.get("repo:messages:a") is None
+
+
+def test_ttl_and_lru():
+    cache = MemoryCache(ttl_s=0.05, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_s=10)
+    cache.get("a")  # "a" devient le plus récent
+    cache.set("c", 3, ttl_s=10)
+    assert cache.get("b") is None and cache.get("c") == 3
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_get_or_set_skips_none():
+    cache = MemoryCache()
+    calls = []
+    assert cache.get_or_set("k", lambda: calls.append(1)) is None
+    assert cache.get_or_set("k", lambda: calls.append(1) or "v") == "v"
+    assert cache.get_or_set("k", lambda: calls.append(1) or "w") == "v"
+    assert len(calls) == 2
+
+
+def test_shared_cache_is_seen_by_other_instances(tmp_path):
+    from components.cache import SharedCache
+
+    path = str(tmp_path / "shared.sqlite3")
+    a, b = SharedCache(path), SharedCache(path)
+    a.set("repo:profiles:a@x.fr", {"first_name": "Ana"})
+    a.set("repo:profiles:b@x.fr", [1, 2])
+    a.set("token:x", {"ok": True})
+    assert b.get("repo:profiles:a@x.fr") == {"first_name": "Ana"}
+
+    assert b.delete_prefix("repo:profiles:") == 2
+    assert a.get("repo:profiles:b@x.fr") is None and len(a) == 1
+    b.clear()
+    assert a.get("token:x", "absent") == "absent"
+
+
+def test_shared_cache_ttl_lru_and_get_or_set(tmp_path):
+    from components.cache import SharedCache
+
+    cache = SharedCache(str(tmp_path / "shared.sqlite3"), ttl_s=0.05, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_s=10)
+    cache.set("c", 3, ttl_s=10)  # "a" (le moins récemment utilisé) est évincé
+    assert cache.get("a") is None and cache.get("b") == 2
+    cache.set("d", "x")
+    time.sleep(0.06)
+    assert cache.get("d") is None
+
+    calls = []
+    assert cache.get_or_set("e", lambda: calls.append(1) or "v", ttl_s=10) == "v"
+    assert cache.get_or_set("e", lambda: calls.append(1) or "w") == "v"
+    assert len(calls) == 1
+
+
+def test_shared_cache_prefix_is_literal(tmp_path):
+    from components.cache import SharedCache
+
+    cache = SharedCache(str(tmp_path / "shared.sqlite3"))
+    cache.set("a_b:1", 1)
+    cache.set("axb:1", 2)
+    assert cache.delete_prefix("a_b:") == 1
+    assert cache.get("axb:1") == 2
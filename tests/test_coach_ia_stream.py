@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+
+import pytest
+
+from components import coach_ia
+from components.ai_cache import ResponseCache
+
+
+class StubStream:
+    def __init__(self, deltas, fail_after=None):
+        self.deltas = deltas
+        self.fail_after = fail_after
+        self.closed = False
+
+    def __iter__(self):
+        for i, d in enumerate(self.deltas):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("connexion coupée")
+            yield SimpleNamespace(type="response.output_text.delta", delta=d)
+        yield SimpleNamespace(type="response.completed")
+
+    def close(self):
+        self.closed = True
+
+
+class StubStreamingClient:
+    def __init__(self, **stream_kwargs):
+        self.stream_kwargs = stream_kwargs
+        self.streams = []
+        self.responses = self
+
+    def create(self, **kwargs):
+        assert kwargs["stream"] is True
+        stream = StubStream(**self.stream_kwargs)
+        self.streams.append(stream)
+        return stream
+
+
+class Placeholder:
+    def __init__(self):
+        self.frames = []
+
+    def markdown(self, text):
+        self.frames.append(text)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "ai.sqlite3"))
+
+
+def test_tokens_are_rendered_as_they_arrive_then_cached(cache):
+    client = StubStreamingClient(deltas=["Je ", "veux ", "avancer."])
+    zone = Placeholder()
+    texte, via_ia = coach_ia.render_stream(
+        zone,
+        coach_ia.stream_motivation_ia("x", "", "", "", "", "e", client=client, cache=cache),
+        fallback=lambda: "fallback",
+    )
+    assert (texte, via_ia) == ("Je veux avancer.", True)
+    assert zone.frames[0] == "Je  ▌" and zone.frames[-1] == "Je veux avancer."
+    assert client.streams[0].closed
+
+    # Deuxième demande identique : servie par le cache, sans nouveau stream
+    again = list(coach_ia.stream_motivation_ia("x", "", "", "", "", "e", client=client, cache=cache))
+    assert again == ["Je veux avancer."]
+    assert len(client.streams) == 1
+
+
+def test_mid_stream_failure_switches_to_fallback(cache):
+    client = StubStreamingClient(deltas=["Je ", "veux "], fail_after=1)
+    zone = Placeholder()
+    texte, via_ia = coach_ia.render_stream(
+        zone,
+        coach_ia.stream_kpi_ia("x", "obj", "", "", "", "", client=client, cache=cache),
+        fallback=lambda: "texte de secours",
+    )
+    assert (texte, via_ia) == ("texte de secours", False)
+    assert zone.frames[-1] == "texte de secours"
+    assert client.streams[0].closed
+    assert len(cache) == 0
+
+
+def test_abandoned_stream_is_closed_and_not_cached(cache):
+    client = StubStreamingClient(deltas=["a", "b", "c"])
+    chunks = coach_ia.stream_motivation_ia("x", "", "", "", "", "e", client=client, cache=cache)
+    assert next(chunks) == "a"
+    chunks.close()
+    assert client.streams[0].closed
+    assert len(cache) == 0
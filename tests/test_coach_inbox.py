@@ -0,0 +1,64 @@
+from components.coach_inbox import CoachInbox, current_sheet_rows, parse_sheet_row
+
+
+def _inbox(tmp_path):
+    return CoachInbox(str(tmp_path / "inbox.sqlite3"))
+
+
+def test_counters_follow_new_and_read(tmp_path):
+    inbox = _inbox(tmp_path)
+    inbox.record_message("m1", "u1", "user", "hello", "2026-01-01T10:00:00Z", email="A@x.fr")
+    inbox.record_message("m2", "u1", "user", "again", "2026-01-02T10:00:00Z")
+    inbox.record_message("m3", "u2", "user", "hi", "2026-01-01T09:00:00Z")
+    inbox.record_message("m4", "u2", "coach", "reply", "2026-01-03T09:00:00Z")
+
+    assert inbox.total_unread() == 3
+    counts = inbox.unread_counts()
+    assert [c["user_id"] for c in counts] == ["u1", "u2"]
+    assert counts[0]["email"] == "a@x.fr"
+    assert counts[0]["unread"] == 2
+
+    changed = inbox.mark_read(["m1", "m2", "m4"])
+    assert {m["msg_id"] for m in changed} == {"m1", "m2"}
+    assert inbox.total_unread() == 1
+    assert [c["user_id"] for c in inbox.unread_counts()] == ["u2"]
+
+
+def test_record_is_idempotent(tmp_path):
+    inbox = _inbox(tmp_path)
+    assert inbox.record_message("m1", "u1", "user", "hello", "2026-01-01T10:00:00Z")
+    assert not inbox.record_message("m1", "u1", "user", "hello", "2026-01-01T10:00:00Z")
+    assert inbox.total_unread() == 1
+
+
+def test_rebuild_from_sheet_records(tmp_path):
+    inbox = _inbox(tmp_path)
+    inbox.record_message("m0", "u1", "user", "old", "2025-12-01T10:00:00Z", email="a@x.fr")
+    records = [
+        {"msg_id": "m1", "user_id": "u1", "sender": "user", "message": "a", "created_at": "1", "status": "new"},
+        {"msg_id": "m2", "user_id": "u1", "sender": "user", "message": "b", "created_at": "2", "status": "read"},
+        {"msg_id": "m3", "user_id": "u2", "sender": "user", "message": "c", "created_at": "3", "status": "new"},
+    ]
+    assert inbox.rebuild(records) == 3
+    assert inbox.total_unread() == 2
+    groups = inbox.inbox()
+    assert groups[0]["user_id"] == "u2"
+    assert groups[1]["email"] == "a@x.fr"
+    assert groups[1]["messages"][0]["sheet_row"] == 2
+
+
+def test_parse_sheet_row():
+    assert parse_sheet_row({"updates": {"updatedRange": "MESSAGES!A12:F12"}}) == 12
+    assert parse_sheet_row({}) is None
+    assert parse_sheet_row(None) is None
+
+
+def test_sheet_rows_are_checked_against_msg_id():
+    column = ["msg_id", "m3", "m1", "m2"]  # onglet trié depuis l'envoi
+    changed = [
+        {"msg_id": "m1", "sheet_row": 3},  # toujours à sa place
+        {"msg_id": "m2", "sheet_row": 2},  # déplacé : retrouvé par msg_id
+        {"msg_id": "m4", "sheet_row": 4},  # supprimé : ignoré (la ligne 4 porte m2)
+        {"msg_id": "m3", "sheet_row": None},
+    ]
+    assert current_sheet_rows(changed, column) == [3, 4, 2]
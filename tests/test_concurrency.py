@@ -0,0 +1,24 @@
+import threading
+
+from components.concurrency import process_singleton
+
+
+def test_process_singleton_builds_once_across_threads():
+    calls = []
+
+    @process_singleton
+    def get_thing():
+        calls.append(1)
+        return object()
+
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(get_thing())) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and len({id(x) for x in seen}) == 1
+
+    first = seen[0]
+    get_thing.reset()
+    assert get_thing() is not first and len(calls) == 2
@@ -0,0 +1,128 @@
+import json
+import threading
+
+import pytest
+
+from components.disc_questionnaire import build_session, draft_bank_from_log, load_question_bank, submit
+from components.jsonl_appender import JsonlAppender
+from components.repository import JsonFileBackend, MemoryBackend, Repository
+
+
+def _bank(tmp_path, n=4):
+    questions = [
+        {
+            "qid": q,
+            "prompt": f"Situation {q}",
+            "options": [{"text": f"q{q} {dim}", "dim": dim} for dim in "DISC"],
+        }
+        for q in range(1, n + 1)
+    ]
+    path = tmp_path / "disc_questions.json"
+    path.write_text(json.dumps({"questions": questions}), encoding="utf-8")
+    return load_question_bank(str(path))
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_bank_validation_and_scoring(tmp_path):
+    bank = _bank(tmp_path)
+    assert [q.qid for q in bank.questions] == [1, 2, 3, 4] and bank.get(2).prompt == "Situation 2"
+
+    record = build_session(" A@x.fr ", bank, {1: 1, 2: 1, 3: 0, 4: 3}, "s1")
+    assert record["user"] == "a@x.fr" and record["ts"].endswith("Z")
+    assert record["scores"] == {"D": 1, "I": 2, "S": 0, "C": 1}
+    assert record["style"] == "ID" and record["top_dims"] == ["I", "D"]  # ex æquo : ordre D, I, S, C
+    assert record["choices"][0] == {"qid": 1, "choice": "q1 I", "dim": "I"}
+
+    with pytest.raises(ValueError):
+        build_session("a@x.fr", bank, {1: 0, 2: 0, 3: 0}, "s2")  # question 4 sans réponse
+    with pytest.raises(ValueError):
+        build_session("a@x.fr", bank, {1: 0, 2: 0, 3: 0, 4: 9}, "s2")
+
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps([{"qid": 1, "options": [{"text": "a", "dim": "X"}, {"text": "b", "dim": "D"}]}]))
+    with pytest.raises(ValueError):
+        load_question_bank(str(bad))
+
+
+def test_concurrent_appends_are_grouped_and_never_interleaved(tmp_path):
+    log = tmp_path / "sessions.jsonl"
+    appender = JsonlAppender(str(log), window_s=0.02, fsync=False)
+    barrier = threading.Barrier(40)
+    results = []
+
+    def worker(i):
+        barrier.wait()
+        results.append(appender.append({"submission_id": f"s{i}", "user": f"u{i}@x.fr", "pad": "x" * 5000}))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(40)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(r["submission_id"] for r in _lines(log)) == sorted(f"s{i}" for i in range(40))
+    assert all(created for _, created in results)
+    assert appender.batches < 40  # soumissions simultanées regroupées
+
+
+def test_double_submission_is_recorded_once_across_writers(tmp_path):
+    bank = _bank(tmp_path)
+    log = tmp_path / "sessions.jsonl"
+    repo = Repository(JsonFileBackend(str(tmp_path), paths={"disc_sessions": str(log)}))
+    answers = {1: 0, 2: 0, 3: 1, 4: 2}
+
+    first, created = submit("a@x.fr", answers, "same", bank=bank, repository=repo)
+    assert created and repo.last_disc_session("a@x.fr").submission_id == "same"
+    # Autre process (autre appender, même fichier) : le doublon est vu en relisant la fin du journal
+    again, created = JsonlAppender(str(log), window_s=0).append(build_session("a@x.fr", bank, answers, "same"))
+    assert not created and again == first
+    assert submit("a@x.fr", answers, "same", bank=bank, repository=repo) == (first, False)
+
+    # Double clic : deux threads avec le même identifiant
+    out = []
+    threads = [
+        threading.Thread(target=lambda: out.append(submit("b@x.fr", answers, "b1", bank=bank, repository=repo)))
+        for _ in range(2)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(created for _, created in out) == [False, True]
+    assert [r["submission_id"] for r in _lines(log)] == ["same", "b1"]
+
+
+def test_submit_writes_to_the_configured_backend(tmp_path):
+    bank = _bank(tmp_path)
+    repo = Repository(MemoryBackend())
+    assert submit("a@x.fr", {1: 0, 2: 0, 3: 1, 4: 2}, "m1", bank=bank, repository=repo)[1]
+    assert not submit("a@x.fr", {1: 0, 2: 0, 3: 1, 4: 2}, "m1", bank=bank, repository=repo)[1]
+    assert [s.submission_id for s in repo.disc_sessions("a@x.fr")] == ["m1"]
+
+
+def test_partial_line_is_terminated_and_draft_bank(tmp_path):
+    log = tmp_path / "sessions.jsonl"
+    log.write_text('{"user": "a@x.fr", "choices": [{"qid": 2, "choice": "Oui", "dim": "I"}]}\n{"user": "brok', "utf-8")
+    JsonlAppender(str(log), window_s=0, fsync=False).append({"submission_id": "s", "user": "c@x.fr"})
+    lines = log.read_text(encoding="utf-8").splitlines()
+    assert lines[-2] == '{"user": "brok' and json.loads(lines[-1])["user"] == "c@x.fr"
+
+    assert draft_bank_from_log(str(log)) == [{"qid": 2, "prompt": "", "options": [{"text": "Oui", "dim": "I"}]}]
+
+
+def test_duplicates_are_found_by_line_position(tmp_path):
+    log = tmp_path / "sessions.jsonl"
+    existing = [{"submission_id": f"s{i}", "user": f"u{i}@x.fr", "note": 'dit "submission_id": "s99"'} for i in range(50)]
+    existing.append({"submission_id": 'a"b', "user": "q@x.fr"})
+    log.write_text("".join(json.dumps(r) + "\n" for r in existing), encoding="utf-8")
+
+    appender = JsonlAppender(str(log), window_s=0, fsync=False)
+    assert appender.append({"submission_id": "s7", "user": "autre@x.fr"}) == (existing[7], False)
+    assert appender.append({"submission_id": 'a"b'}) == (existing[-1], False)
+    assert appender.append({"submission_id": "s99", "user": "n@x.fr"})[1]  # texte d'un champ, pas un identifiant
+    assert all(isinstance(pos, int) for pos in appender._known.values())  # positions, pas d'enregistrements
+    assert appender.append({"submission_id": "s99"})[0]["user"] == "n@x.fr"
+    assert len(_lines(log)) == 52
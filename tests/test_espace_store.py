@@ -0,0 +1,33 @@
+from components.espace_store import ESPACE_FIELDS, EspaceState, EspaceStore, diff_fields
+
+
+def test_users_are_isolated(tmp_path):
+    store = EspaceStore(str(tmp_path / "espace.sqlite3"))
+    store.save("A@x.fr", {"ambition_courte": "devenir chef de projet", "horizon_annee": 2027})
+    store.save("b@x.fr", {"ambition_courte": "changer de métier"})
+
+    assert store.load("a@x.fr") == {"ambition_courte": "devenir chef de projet", "horizon_annee": 2027}
+    assert store.load("b@x.fr") == {"ambition_courte": "changer de métier"}
+    assert store.emails() == ["a@x.fr", "b@x.fr"]
+
+
+def test_noop_and_partial_writes(tmp_path):
+    store = EspaceStore(str(tmp_path / "espace.sqlite3"))
+    assert store.save("a@x.fr", {"why1": "un", "why2": "deux"}) == ["why1", "why2"]
+    assert store.save("a@x.fr", {"why1": "un", "why2": "deux"}) == []
+    assert store.save("a@x.fr", {"why2": "DEUX", "inconnu": 1}) == ["why2"]
+    assert store.load("a@x.fr") == {"why1": "un", "why2": "DEUX"}
+
+
+def test_diff_fields():
+    saved = {"why1": "un", "ambition_validee": False}
+    current = {"why1": "un", "ambition_validee": True, "why2": "deux", "autre": 1}
+    assert diff_fields(current, saved) == {"ambition_validee": True, "why2": "deux"}
+
+
+def test_espace_state_from_session():
+    etat = EspaceState.from_session({"why1": "un", "horizon_annee": 2027, "why2": None, "autre": 1})
+    assert etat.whys == ["un", "", "", "", ""]
+    assert etat.horizon_annee_txt == "2027"
+    assert EspaceState().horizon_annee_txt == ""
+    assert ESPACE_FIELDS[0] == "ambition_courte" and len(ESPACE_FIELDS) == 15
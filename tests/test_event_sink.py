@@ -0,0 +1,79 @@
+import gzip
+import json
+import os
+from datetime import datetime
+
+from components.event_rollup import FUNNEL, UNWIRED_STAGES, load_rollups, run_rollup
+from components.event_sink import EventSink, partition_days, partition_files, read_events
+
+
+def _ts(s):
+    return datetime.fromisoformat(s).timestamp()
+
+
+def test_sink_writes_daily_gzip_partitions(tmp_path):
+    sink = EventSink(str(tmp_path), flush_every=2, flush_interval_s=60)
+    sink.record("A@x.fr ", "app_open", "accueil", ts=_ts("2026-10-18T23:59:00"))
+    sink.record("a@x.fr", "app_open", "mon_espace", ts=_ts("2026-10-19T00:01:00"))  # 2e : écriture
+    sink.record("b@x.fr", "profile_saved", "accueil", ts=_ts("2026-10-19T09:00:00"))
+    assert sink.flush() == 1
+
+    assert partition_days(str(tmp_path)) == ["2026-10-18", "2026-10-19"]
+    [path] = partition_files("2026-10-19", str(tmp_path))
+    with gzip.open(path, "rt", encoding="utf-8") as f:  # deux membres gzip à la suite
+        assert [json.loads(line)["email"] for line in f] == ["a@x.fr", "b@x.fr"]
+    assert [e["page"] for e in read_events("2026-10-18", str(tmp_path))] == ["accueil"]
+
+
+def test_rollup_funnel_and_incremental_recompute(tmp_path):
+    events, rollups = str(tmp_path / "events"), str(tmp_path / "rollups")
+    sink = EventSink(events)
+    day = "2026-10-19T"
+    for email, page, hhmm in [
+        ("a@x.fr", "accueil", "09:00"),
+        ("a@x.fr", "mon_espace", "09:05"),
+        ("a@x.fr", "coach", "09:10"),
+        ("a@x.fr", "resultats", "09:20"),
+        ("a@x.fr", "mon_espace", "09:30"),
+        ("b@x.fr", "accueil", "10:00"),
+        ("b@x.fr", "mon_espace", "10:01"),
+        ("c@x.fr", "coach", "11:00"),  # sans passer par l'accueil
+    ]:
+        sink.record(email, "app_open", page, ts=_ts(day + hhmm))
+    sink.record("a@x.fr", "profile_saved", "accueil", ts=_ts(day + "09:01"))
+    sink.flush()
+
+    assert run_rollup(events, rollups)["days_recomputed"] == ["2026-10-19"]
+    tables = load_rollups(rollups)
+    daily = tables["daily"].iloc[0]
+    assert (daily["events"], daily["learners"], daily["profiles_saved"]) == (9, 3, 1)
+
+    pages = tables["daily_pages"].set_index("page")
+    assert pages.loc["mon_espace", "opens"] == 3 and pages.loc["mon_espace", "learners"] == 2
+    funnel = tables["daily_funnel"].set_index("stage")
+    assert funnel["learners"].tolist() == [2, 2, 1, 1]
+    assert funnel.loc["coach", "conversion_prev"] == 0.5
+    assert funnel.loc["resultats", "conversion_start"] == 0.5
+
+    # Rien n'a changé : aucun jour recalculé ; un nouvel événement : seul son jour l'est
+    assert run_rollup(events, rollups)["days_recomputed"] == []
+    sink.record("d@x.fr", "app_open", "accueil", ts=_ts("2026-10-20T08:00"))
+    sink.flush()
+    assert run_rollup(events, rollups)["days_recomputed"] == ["2026-10-20"]
+    assert load_rollups(rollups)["daily"]["date"].tolist() == ["2026-10-19", "2026-10-20"]
+    assert os.path.exists(os.path.join(rollups, "state.json"))
+
+
+def test_funnel_stages_are_logged_by_routed_pages():
+    # Seuls accueil.py et pages/ sont servis par Streamlit (archives_cachees/ ne l'est pas)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    routed = [os.path.join(root, "accueil.py")] + [
+        os.path.join(root, "pages", name) for name in os.listdir(os.path.join(root, "pages")) if name.endswith(".py")
+    ]
+    logged = set()
+    for path in routed:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if "log_page_open(" in line or "page=" in line:
+                    logged.update(stage for stage in FUNNEL if f'"{stage}"' in line)
+    assert set(FUNNEL) - logged == UNWIRED_STAGES
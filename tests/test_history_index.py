@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from components.history_index import DOWN, HistoryIndex
+
+
+def _session(user, ts, d, i=0, s=0, c=0):
+    return json.dumps({"ts": ts, "user": user, "scores": {"D": d, "I": i, "S": s, "C": c}}) + "\n"
+
+
+MBA = ("a@x.fr", "b@x.fr")
+
+
+def _index(disc_log, allowlist):
+    return HistoryIndex(disc_log.tail(), allowlist, check_interval_s=0)
+
+
+def test_trajectory_and_first_to_latest_delta(disc_log, cohort_allowlist):
+    index = _index(disc_log, cohort_allowlist(*MBA))
+    disc_log.append(_session("A@x.fr", "t1", 10, 5, 5, 5), _session("b@x.fr", "t1", 4, 4, 4, 13))
+    assert index.delta("a@x.fr") is None  # une seule passation
+    assert index.count() == 0
+
+    disc_log.append(_session("a@x.fr", "t2", 8, 7, 5, 5), _session("a@x.fr", "t3", 6, 9, 5, 5))
+    assert [p["ts"] for p in index.trajectory("a@x.fr")] == ["t1", "t2", "t3"]
+    assert index.trajectory("a@x.fr")[1] == {"ts": "t2", "D": 8, "I": 7, "S": 5, "C": 5}
+
+    delta = index.delta("a@x.fr")
+    assert delta["n_sessions"] == 3 and (delta["first_ts"], delta["latest_ts"]) == ("t1", "t3")
+    assert (delta["D"], delta["I"], delta["S"], delta["movement"]) == (-4, 4, 0, 8)
+    assert delta["first"]["D"] == 10 and delta["latest"]["I"] == 9
+    assert index.trajectory("inconnu@x.fr") == []
+
+
+def test_who_moved_most_by_cohort_and_dimension(disc_log, cohort_allowlist):
+    index = _index(disc_log, cohort_allowlist(*MBA))
+    disc_log.append(
+        _session("a@x.fr", "t1", 10, 5), _session("a@x.fr", "t2", 6, 9),   # ampleur 8
+        _session("b@x.fr", "t1", 5, 5), _session("b@x.fr", "t2", 7, 3),    # ampleur 4
+        _session("z@x.fr", "t1", 0, 10), _session("z@x.fr", "t2", 10, 0),  # hors cohorte, ampleur 20
+        _session("n@x.fr", "t1", 5, 5), _session("n@x.fr", "t2", 5, 5),    # aucune évolution
+    )
+    assert [m["email"] for m in index.movers()] == ["z@x.fr", "a@x.fr", "b@x.fr"]
+    assert [m["email"] for m in index.movers("mba", k=1)] == ["a@x.fr"]
+    assert [m["email"] for m in index.movers("mba", dim="D")] == ["b@x.fr"]
+    assert [m["email"] for m in index.movers("mba", dim="D", direction=DOWN)] == ["a@x.fr"]
+    assert index.count("mba") == 2 and index.count() == 4
+    with pytest.raises(ValueError):
+        index.movers(dim="X")
+
+    # Une nouvelle passation remplace l'écart précédent dans le classement
+    disc_log.append(_session("b@x.fr", "t3", 15, 0))
+    assert [m["email"] for m in index.movers("mba")] == ["b@x.fr", "a@x.fr"]
+    assert index.movers("mba")[0]["movement"] == 15
+
+
+def test_cohort_reload_and_rewritten_log(tmp_path, disc_log, cohort_allowlist):
+    index = _index(disc_log, cohort_allowlist(*MBA))
+    disc_log.append(_session("c@x.fr", "t1", 1), _session("c@x.fr", "t2", 5))
+    assert index.movers("mba") == []
+
+    (tmp_path / "mba.csv").write_text("email\nc@x.fr\n", encoding="utf-8")
+    index.allowlist.reload()
+    assert [m["email"] for m in index.movers("mba")] == ["c@x.fr"]
+
+    disc_log.path.write_text(_session("a@x.fr", "t1", 1), encoding="utf-8")  # journal réécrit
+    assert index.count() == 0 and index.trajectory("c@x.fr") == []
+
+
+def test_small_batches_match_a_full_rebuild(disc_log, cohort_allowlist):
+    index = _index(disc_log, cohort_allowlist(*MBA))
+    disc_log.append(*[_session(f"u{i}@x.fr", "t1", i % 7, 3) + _session(f"u{i}@x.fr", "t2", 3, i % 5) for i in range(40)])
+    index.refresh()
+    for i in (3, 3, 17):  # une passation à la fois : classement mis à jour par insertion
+        disc_log.append(_session(f"u{i}@x.fr", "t3", 9, 0))
+        index.refresh()
+
+    fresh = HistoryIndex(disc_log.tail(), index.allowlist, check_interval_s=0)
+    assert index.movers(k=40) == fresh.movers(k=40)
+    assert index.movers(dim="I", direction=DOWN, k=40) == fresh.movers(dim="I", direction=DOWN, k=40)
+    assert index.delta("u3@x.fr")["n_sessions"] == 4
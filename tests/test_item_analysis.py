@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pytest
+
+from components.cache import MemoryCache
+from components.disc_log import LogTail
+from components.item_analysis import ItemMatrix, _kr20, analyze_matrix, export_csv, get_item_analysis
+
+
+def _session(user, picks):
+    return {
+        "user": user,
+        "scores": {},
+        "choices": [{"qid": qid, "choice": f"q{qid} {dim}", "dim": dim} for qid, dim in picks.items()],
+    }
+
+
+def _write(path, sessions, mode="a"):
+    with open(path, mode, encoding="utf-8") as f:
+        for s in sessions:
+            f.write(json.dumps(s) + "\n")
+
+
+SESSIONS = [
+    _session("a@x.fr", {1: "D", 2: "D", 3: "I"}),
+    _session("b@x.fr", {1: "D", 2: "I", 3: "I"}),
+    _session("c@x.fr", {1: "I", 2: "I", 3: "D"}),
+    _session("d@x.fr", {1: "D", 2: "D", 3: "D"}),
+    _session("e@x.fr", {1: "I", 2: "D"}),  # incomplète : hors indices de cohérence
+]
+
+
+def test_rates_consistency_and_item_total(tmp_path):
+    log = tmp_path / "sessions.jsonl"
+    _write(log, SESSIONS)
+    matrix = ItemMatrix(LogTail(str(log)))
+    assert matrix.refresh()
+    analysis = analyze_matrix(matrix.matrix(), matrix.qids, matrix.texts)
+
+    assert analysis.n_sessions == 5 and analysis.n_complete == 4
+    opts = analysis.options.set_index(["qid", "dim"])
+    assert opts.loc[(1, "D"), "n"] == 3 and opts.loc[(1, "D"), "rate"] == pytest.approx(0.6)
+    assert opts.loc[(3, "I"), "rate"] == pytest.approx(0.5)
+    assert opts.loc[(2, "I"), "choice"] == "q2 I"
+    assert set(analysis.options["dim"]) == {"D", "I"}  # S et C jamais proposées
+
+    # KR-20 de D à la main : items (q1, q2, q3) sur les 4 sessions complètes
+    items = np.array([[1, 1, 0], [1, 0, 0], [0, 0, 1], [1, 1, 1]], dtype=float)
+    k, totals = 3, items.sum(axis=1)
+    expected = k / (k - 1) * (1 - sum(np.var(items[:, j], ddof=1) for j in range(k)) / np.var(totals, ddof=1))
+    dims = analysis.dimensions.set_index("dim")
+    assert dims.loc["D", "alpha"] == pytest.approx(expected) and dims.loc["D", "n_items"] == 3
+    assert dims.loc["D", "mean"] == pytest.approx(totals.mean())
+    assert np.isnan(dims.loc["S", "alpha"])
+
+    # Item-total corrigé : q1 contre (q2 + q3)
+    rest = items[:, 1] + items[:, 2]
+    assert opts.loc[(1, "D"), "item_total_r"] == pytest.approx(np.corrcoef(items[:, 0], rest)[0, 1])
+    assert _kr20(np.ones((4, 3))) != _kr20(np.ones((4, 3)))  # variance nulle -> NaN
+
+
+def test_incremental_reads_truncation_and_snapshot(tmp_path):
+    log, snapshot = tmp_path / "sessions.jsonl", str(tmp_path / "matrix.npz")
+    _write(log, SESSIONS[:2])
+    matrix = ItemMatrix(LogTail(str(log)), snapshot_path=snapshot)
+    matrix.refresh()
+    _write(log, SESSIONS[2:] + [_session("f@x.fr", {4: "S"})])
+    assert matrix.refresh() and not matrix.refresh()
+    assert matrix.matrix().shape == (6, 4) and matrix.qids == [1, 2, 3, 4]
+
+    # Nouveau process : reprise depuis l'instantané, seules les nouvelles lignes sont lues
+    _write(log, [_session("g@x.fr", {1: "C"})])
+    resumed = ItemMatrix(LogTail(str(log)), snapshot_path=snapshot)
+    assert resumed.matrix().shape == (6, 4) and resumed.texts[(4, "S")] == "q4 S"
+    assert resumed.refresh()
+    assert resumed.matrix().shape == (7, 4) and resumed.matrix()[-1, 0] == 3  # C
+
+    # Journal réécrit (plus court) : la matrice est reconstruite
+    _write(log, SESSIONS[:1], mode="w")
+    assert resumed.refresh()
+    assert resumed.matrix().shape == (1, 3)
+
+
+def test_results_cached_per_log_version_and_csv_export(tmp_path):
+    log = tmp_path / "sessions.jsonl"
+    _write(log, SESSIONS[:3])
+    cache = MemoryCache()
+    first = get_item_analysis(str(log), cache=cache)
+    assert get_item_analysis(str(log), cache=cache) is first
+
+    _write(log, SESSIONS[3:])
+    second = get_item_analysis(str(log), cache=cache)
+    assert second.log_version != first.log_version and second.n_sessions == 5
+
+    paths = export_csv(second, str(tmp_path / "out"))
+    assert [p.rsplit("/", 1)[-1] for p in paths] == ["item_options.csv", "item_dimensions.csv"]
+    assert (tmp_path / "out" / "item_options.csv").read_text(encoding="utf-8").startswith("qid,dim,choice,n,rate")
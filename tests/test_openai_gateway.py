@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from components.openai_gateway import MIN_SAMPLES, DeadlineExceeded, GatewayBusy, GatewayMetrics, OpenAIGateway
+
+
+def test_concurrency_is_bounded_and_queue_times_out():
+    gw = OpenAIGateway(max_concurrent=2, queue_timeout_s=0.05)
+    release = threading.Event()
+    started = threading.Barrier(3)
+
+    def hold():
+        with gw.slot():
+            started.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for t in threads:
+        t.start()
+    started.wait()
+    assert gw.metrics.snapshot()["in_flight"] == 2
+    for _ in range(MIN_SAMPLES + 1):
+        with pytest.raises(GatewayBusy):
+            gw.call(lambda: "trop tard")
+    release.set()
+    for t in threads:
+        t.join()
+    assert gw.call(lambda: "ok") == "ok"
+
+    # Refus faute de place : comptés à part, sans effet sur le taux d'erreur ni les latences
+    snap = gw.metrics.snapshot()
+    assert snap["rejected"] == MIN_SAMPLES + 1 and snap["errors"] == 0 and snap["calls"] == 3
+    assert gw.should_fallback() is None
+
+
+def test_recent_errors_trigger_fast_fallback():
+    gw = OpenAIGateway(metrics=GatewayMetrics())
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            gw.call(lambda: (_ for _ in ()).throw(RuntimeError("api down")))
+    assert gw.should_fallback() == "trop d'erreurs récentes"
+    with pytest.raises(GatewayBusy):
+        gw.call(lambda: "ok")
+
+
+def test_stream_deadline_and_slot_release():
+    gw = OpenAIGateway(max_concurrent=1)
+
+    def slow():
+        for i in range(5):
+            time.sleep(0.03)
+            yield i
+
+    with pytest.raises(DeadlineExceeded):
+        list(gw.stream(slow, deadline_s=0.05))
+    assert gw.metrics.snapshot()["in_flight"] == 0
+
+    events = gw.stream(slow)
+    next(events)
+    events.close()
+    snap = gw.metrics.snapshot()
+    assert snap["in_flight"] == 0
+    assert snap["errors"] == 1  # seul le dépassement de délai compte comme erreur
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from components.partner_index import COMPLEMENTARY, SIMILAR, PartnerIndex
+
+
+def _session(user, answers, style=""):
+    """answers : une lettre D/I/S/C par question ; scores = décompte des lettres."""
+    return json.dumps(
+        {
+            "user": user,
+            "style": style,
+            "scores": {dim: answers.count(dim) for dim in "DISC"},
+            "choices": [{"qid": q + 1, "choice": "…", "dim": dim} for q, dim in enumerate(answers)],
+        }
+    ) + "\n"
+
+
+MBA = ("a@x.fr", "b@x.fr", "c@x.fr", "d@x.fr")
+
+
+def _index(disc_log, allowlist):
+    return PartnerIndex(disc_log.tail(), allowlist, check_interval_s=0)
+
+
+def test_similar_and_complementary_partners_within_cohort(disc_log, cohort_allowlist):
+    index = _index(disc_log, cohort_allowlist(*MBA))
+    disc_log.append(
+        _session("a@x.fr", "DDDDIIS", style="DI"),
+        _session("b@x.fr", "DDDDIIC"),  # presque les mêmes réponses
+        _session("c@x.fr", "DIIISSS"),
+        _session("d@x.fr", "CCCSSSI"),  # fort en S/C, faible en D
+        _session("z@x.fr", "DDDDIIS"),  # identique à a mais hors cohorte
+    )
+
+    similar = index.partners("A@x.fr", k=2, mode=SIMILAR)
+    assert [p["email"] for p in similar] == ["b@x.fr", "c@x.fr"]
+    assert similar[0]["scores"] == {"D": 4, "I": 2, "S": 0, "C": 1}
+    assert similar[0]["score"] > similar[1]["score"]
+
+    complementary = index.partners("a@x.fr", k=1, mode=COMPLEMENTARY)
+    assert [p["email"] for p in complementary] == ["d@x.fr"]
+
+    assert index.cohort_of("a@x.fr") == ("mba", 4)
+    assert [p["email"] for p in index.partners("z@x.fr", k=1)] == ["a@x.fr"]  # hors liste : tous les apprenants
+    assert index.partners("inconnu@x.fr") == []
+    with pytest.raises(ValueError):
+        index.partners("a@x.fr", mode="autre")
+
+
+def test_retake_and_new_questions_update_vectors(disc_log, cohort_allowlist):
+    index = _index(disc_log, cohort_allowlist(*MBA))
+    disc_log.append(_session("a@x.fr", "DDDD"), _session("b@x.fr", "SSSS"), _session("c@x.fr", "DDDS"))
+    assert index.partners("a@x.fr", k=1)[0]["email"] == "c@x.fr"
+
+    # b refait le questionnaire (avec des questions en plus) : sa ligne est remplacée, pas dupliquée
+    disc_log.append(_session("b@x.fr", "DDDDDD"))
+    assert len(index) == 3
+    assert index.partners("a@x.fr", k=1)[0]["email"] == "b@x.fr"
+
+
+def test_approximate_mode_matches_exact_on_small_index(disc_log, cohort_allowlist, monkeypatch):
+    from components import partner_index
+
+    index = _index(disc_log, cohort_allowlist())
+    answers = ["DDIISC", "DDDIIS", "SSCCID", "CCCSSD", "IIIDDS", "DISCDI", "SSSSCC", "DDDDDI"]
+    disc_log.append(*[_session(f"u{i}@x.fr", a) for i, a in enumerate(answers)])
+
+    monkeypatch.setattr(partner_index, "APPROX_CANDIDATES", 4)
+    exact = index.partners("u0@x.fr", k=2, approximate=False)
+    approx = index.partners("u0@x.fr", k=2, approximate=True)
+    assert len(approx) == 2
+    assert approx[0]["score"] <= exact[0]["score"]
+    assert {p["email"] for p in approx} <= {f"u{i}@x.fr" for i in range(1, len(answers))}
@@ -0,0 +1,84 @@
+import io
+
+from PIL import Image
+
+from components import pdf_report
+from components.pdf_report import _header, _new_pdf, _replay_static_block, _static_block, build_pdf, build_pdfs
+
+SCORES = {"D": 7, "I": 9, "S": 3, "C": 1}
+ORDERED = sorted(SCORES.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def _png(mode="RGBA"):
+    buf = io.BytesIO()
+    Image.new(mode, (40, 30), (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_replayed_static_block_matches_direct_layout():
+    pdf_report._static_blocks.clear()
+    direct = _new_pdf()
+    _header(direct, "a@x.fr", SCORES)
+    _static_block(direct, ("I", "D"))
+    for _ in range(2):  # 1er appel : mise en page enregistrée ; 2e : rejouée depuis le cache
+        replayed = _new_pdf()
+        _header(replayed, "a@x.fr", SCORES)
+        _replay_static_block(replayed, ("I", "D"))
+        assert replayed.pages == direct.pages
+        assert (replayed.x, replayed.y, replayed.font_style, replayed.font_size_pt) == (
+            direct.x,
+            direct.y,
+            direct.font_style,
+            direct.font_size_pt,
+        )
+    assert len(pdf_report._static_blocks) == 1
+
+
+def test_build_pdf_embeds_images_from_memory(monkeypatch):
+    def no_temp_file(*args, **kwargs):
+        raise AssertionError("aucun fichier temporaire attendu")
+
+    monkeypatch.setattr("tempfile.NamedTemporaryFile", no_temp_file)
+    pdf_report._image_infos.clear()
+    radar = _png()
+    pdf = build_pdf("a@x.fr", SCORES, ORDERED, "réussie", "", radar_png=radar)
+    assert pdf.startswith(b"%PDF") and b"/Subtype /Image" in pdf
+    assert b"/Width 40\n/Height 30\n/ColorSpace /DeviceRGB" in pdf
+    assert b"/SMask" not in pdf  # alpha aplati sur fond blanc
+
+    # Mêmes bytes : image décodée une seule fois, documents indépendants
+    item = {"scores": SCORES, "ordered_dims": ORDERED, "situation_success": "", "situation_difficult": ""}
+    pdfs = build_pdfs([dict(item, email=f"{i}@x.fr", radar_png=radar) for i in range(3)])
+    assert len(pdf_report._image_infos) == 1
+    assert all(b"/Subtype /Image" in p for p in pdfs)
+    assert build_pdf("a@x.fr", SCORES, ORDERED, "", "", radar_png=_png("RGB")).startswith(b"%PDF")
+
+
+def test_get_or_build_pdf_caches_by_inputs(tmp_path, monkeypatch):
+    from components.blob_store import BlobStore
+    from components.cache import SharedCache
+
+    cache, blobs = SharedCache(str(tmp_path / "cache.sqlite3")), BlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(pdf_report, "get_shared_cache", lambda: cache)
+    monkeypatch.setattr(pdf_report, "get_blob_store", lambda: blobs)
+    builds = []
+    real_build = pdf_report.build_pdf
+    monkeypatch.setattr(pdf_report, "build_pdf", lambda **kw: builds.append(kw) or real_build(**kw))
+
+    inputs = {
+        "email": "a@x.fr",
+        "scores": SCORES,
+        "ordered_dims": ORDERED,
+        "situation_success": "ok",
+        "situation_difficult": "",
+        "radar_png": _png(),
+    }
+    first, key = pdf_report.get_or_build_pdf(**inputs)
+    again, key_again = pdf_report.get_or_build_pdf(**dict(inputs, email=" A@x.fr "))
+    assert (again, key_again) == (first, key) and len(builds) == 1
+
+    _, other = pdf_report.get_or_build_pdf(**dict(inputs, situation_difficult="tendu"))
+    assert other != key and len(builds) == 2
+
+    monkeypatch.setattr(pdf_report, "TEMPLATE_VERSION", pdf_report.TEMPLATE_VERSION + 1)
+    assert pdf_report.pdf_cache_key(**inputs) != key
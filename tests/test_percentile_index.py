@@ -0,0 +1,70 @@
+import json
+import os
+
+from components.percentile_index import PercentileIndex
+
+
+def _session(user, d, i=0, s=0, c=0):
+    return json.dumps({"user": user, "scores": {"D": d, "I": i, "S": s, "C": c}}) + "\n"
+
+
+MBA = ("a@x.fr", "b@x.fr", "c@x.fr")
+
+
+def _index(disc_log, allowlist):
+    return PercentileIndex(disc_log.tail(), allowlist, check_interval_s=0)
+
+
+def test_log_tail_reads_only_complete_new_lines(disc_log):
+    disc_log.append(_session("a@x.fr", 1), "pas du json\n", '{"user": "b@x')
+    tail = disc_log.tail()
+    reset, records = tail.read_new()
+    assert not reset and [r["user"] for r in records] == ["a@x.fr"]
+
+    disc_log.append('.fr", "scores": {}}\n')
+    assert [r["user"] for r in tail.read_new()[1]] == ["b@x.fr"]
+    assert tail.read_new() == (False, [])
+
+    disc_log.path.write_text(_session("c@x.fr", 2), encoding="utf-8")  # fichier réécrit, plus court
+    reset, records = tail.read_new()
+    assert reset and [r["user"] for r in records] == ["c@x.fr"]
+
+
+def test_percentiles_within_cohort(disc_log, cohort_allowlist):
+    index = _index(disc_log, cohort_allowlist(*MBA))
+    disc_log.append(_session("a@x.fr", 5), _session("b@x.fr", 10), _session("c@x.fr", 10), _session("z@x.fr", 20))
+
+    assert index.count("mba") == 3 and index.count() == 4  # z@x.fr hors cohorte
+    assert index.rank("D", 10, "mba") == (1, 2, 3)
+    assert index.percentile("D", 5, "mba") == 100 * 0.5 / 3
+    assert index.percentile("D", 25, "mba") == 100.0
+    assert index.percentile("D", 10, "autre") is None
+
+    pct = index.learner_percentiles("B@X.FR")
+    assert pct["cohort"] == "mba" and pct["n"] == 3 and pct["D"] == 100 * 2 / 3
+    assert index.learner_percentiles("inconnu@x.fr") is None
+
+
+def test_retake_replaces_previous_scores(disc_log, cohort_allowlist):
+    index = _index(disc_log, cohort_allowlist(*MBA))
+    disc_log.append(_session("a@x.fr", 5), _session("b@x.fr", 10))
+    assert index.rank("D", 10, "mba") == (1, 1, 2)
+
+    disc_log.append(_session("a@x.fr", 15))
+    assert index.count("mba") == 2
+    assert index.rank("D", 10, "mba") == (0, 1, 2)
+    assert index.rank("D", 15, "mba") == (1, 1, 2)
+
+
+def test_rebuild_on_truncation_and_cohort_change(tmp_path, disc_log, cohort_allowlist):
+    index = _index(disc_log, cohort_allowlist(*MBA))
+    disc_log.append(_session("a@x.fr", 5), _session("b@x.fr", 10))
+    assert index.count("mba") == 2
+
+    disc_log.path.write_text(_session("c@x.fr", 3), encoding="utf-8")
+    assert index.count("mba") == 1 and index.learner_percentiles("a@x.fr") is None
+
+    cohorts = tmp_path / "mba.csv"
+    cohorts.write_text("email\nz@x.fr\n", encoding="utf-8")
+    os.utime(cohorts, (2_000_000_000, 2_000_000_000))
+    assert index.count("mba") == 0 and index.count() == 1
@@ -0,0 +1,30 @@
+import pytest
+
+from components.perf import MAX_SAMPLES, record, summary, timed
+
+
+def test_timed_records_per_section():
+    state = {}
+    with timed("page", state):
+        pass
+    for ms in (1, 2, 3):
+        record("fragment:etape1", ms / 1000, state)
+
+    stats = summary(state)
+    assert stats["page"]["n"] == 1
+    assert stats["fragment:etape1"] == {"n": 3, "last_ms": 3.0, "p50_ms": 2.0, "max_ms": 3.0}
+
+
+def test_interrupted_block_is_not_recorded():
+    state = {}
+    with pytest.raises(RuntimeError):
+        with timed("page", state):
+            raise RuntimeError("rerun")
+    assert summary(state) == {}
+
+
+def test_samples_are_bounded():
+    state = {}
+    for _ in range(MAX_SAMPLES + 10):
+        record("page", 0.001, state)
+    assert summary(state)["page"]["n"] == MAX_SAMPLES
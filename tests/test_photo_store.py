@@ -0,0 +1,43 @@
+import io
+
+import pytest
+from PIL import Image
+
+from components import photo_store
+
+
+@pytest.fixture(autouse=True)
+def _photos_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(photo_store, "PHOTOS_DIR", str(tmp_path / "photos"))
+
+
+def _png(w, h, color="red"):
+    buf = io.BytesIO()
+    Image.new("RGB", (w, h), color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_thumbnails_are_downscaled_jpegs():
+    thumbs = photo_store.make_thumbnails(_png(2000, 1000))
+    assert sorted(thumbs) == list(photo_store.THUMB_SIZES)
+    for size, data in thumbs.items():
+        img = Image.open(io.BytesIO(data))
+        assert img.format == "JPEG"
+        assert max(img.size) == size
+
+
+def test_store_is_per_user_and_content_addressed():
+    data = _png(800, 600)
+    h = photo_store.store_photo("A@x.fr", data)
+    assert h == photo_store.content_hash(data)
+    assert photo_store.current_photo_hash("a@x.fr") == h
+    assert photo_store.photo_path("a@x.fr", h, 160)
+    assert photo_store.current_photo_hash("b@x.fr") is None
+    assert photo_store.photo_path("b@x.fr", h, 160) is None
+
+
+def test_invalid_upload_is_rejected():
+    with pytest.raises(photo_store.PhotoError):
+        photo_store.store_photo("a@x.fr", b"not an image")
+    with pytest.raises(photo_store.PhotoError):
+        photo_store.store_photo("", _png(10, 10))
@@ -0,0 +1,64 @@
+import json
+import threading
+
+import pytest
+
+from components.profile_store import ProfileStore, normalize_email
+
+
+def test_get_put_per_email(tmp_path):
+    store = ProfileStore(str(tmp_path / "profils.sqlite3"))
+    assert store.get("a@x.fr") == {}
+    store.put("A@x.fr ", {"first_name": "Ana"})
+    store.put("b@x.fr", {"first_name": "Bob"})
+    assert store.put("a@x.fr", {"last_name": "Lopez"}) == {"email": "a@x.fr", "first_name": "Ana", "last_name": "Lopez"}
+    assert store.get("b@x.fr")["first_name"] == "Bob"
+
+    with pytest.raises(ValueError):
+        store.put("  ", {"first_name": "x"})
+
+
+def test_returned_profile_does_not_alter_cache(tmp_path):
+    store = ProfileStore(str(tmp_path / "profils.sqlite3"))
+    store.put("a@x.fr", {"first_name": "Ana"})
+    store.get("a@x.fr")["first_name"] = "modifié"
+    assert store.get("a@x.fr")["first_name"] == "Ana"
+
+
+def test_cache_sees_writes_from_other_process(tmp_path):
+    path = str(tmp_path / "profils.sqlite3")
+    reader, writer = ProfileStore(path), ProfileStore(path)
+    writer.put("a@x.fr", {"first_name": "Ana"})
+    assert reader.get("a@x.fr")["first_name"] == "Ana"  # mis en cache
+    writer.put("a@x.fr", {"first_name": "Anna"})
+    assert reader.get("a@x.fr")["first_name"] == "Anna"
+
+
+def test_concurrent_puts_do_not_lose_fields(tmp_path):
+    path = str(tmp_path / "profils.sqlite3")
+    stores = [ProfileStore(path) for _ in range(4)]
+
+    def _worker(i):
+        for j in range(10):
+            stores[i].put("a@x.fr", {f"champ_{i}_{j}": j})
+            stores[i].put(f"user{i}@x.fr", {"n": j})
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    profile = ProfileStore(path).get("a@x.fr")
+    assert len([k for k in profile if k.startswith("champ_")]) == 40
+    assert all(ProfileStore(path).get(f"user{i}@x.fr")["n"] == 9 for i in range(4))
+
+
+def test_import_legacy(tmp_path):
+    legacy = tmp_path / "profil_apprenant.json"
+    legacy.write_text(json.dumps({"prenom": "Ana", "nom": "Lopez", "email": "A@x.fr"}), encoding="utf-8")
+    store = ProfileStore(str(tmp_path / "profils.sqlite3"))
+    assert store.import_legacy(str(legacy)) is True
+    assert store.get("a@x.fr") == {"email": "a@x.fr", "first_name": "Ana", "last_name": "Lopez"}
+    assert store.import_legacy(str(legacy)) is False
+    assert normalize_email(None) == ""
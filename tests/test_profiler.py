@@ -0,0 +1,55 @@
+import json
+import os
+import time
+
+from components.profiler import SamplingCapture, list_captures, prune, read_folded, top_functions
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _profiled_page(out_dir):
+    # Joue le rôle du module d'une page : la capture s'arrête quand ce cadre se termine
+    capture = SamplingCapture("mon espace", out_dir=str(out_dir), interval_s=0.001).start()
+    _busy(0.15)
+    return capture
+
+
+def test_capture_stops_when_page_frame_exits(tmp_path):
+    capture = _profiled_page(tmp_path)
+    path = capture.join(timeout=5)
+
+    assert path and path.endswith(".json")
+    assert os.path.basename(path).startswith("mon_espace_")
+    with open(path, encoding="utf-8") as f:
+        meta = json.load(f)
+    assert meta["page"] == "mon espace"
+    assert meta["samples"] > 0
+    assert any(row["function"].startswith("_busy ") for row in meta["top"])
+
+    [listed] = list_captures(str(tmp_path))
+    folded = read_folded(listed)
+    assert folded.splitlines()[0].startswith("<page> mon espace;")
+
+
+def test_top_functions_cumulative_and_own():
+    stacks = {"page;a;b": 3, "page;a": 1, "page;c": 4}
+    top = {row["function"]: row for row in top_functions(stacks, duration_ms=80.0)}
+    assert top["page"]["cumulative_ms"] == 80.0
+    assert top["a"] == {"function": "a", "cumulative_ms": 40.0, "cumulative_pct": 50.0, "own_ms": 10.0}
+    assert top["b"]["own_ms"] == 30.0
+    assert top_functions({}, 10.0) == []
+
+
+def test_prune_keeps_most_recent(tmp_path):
+    for i in range(5):
+        base = tmp_path / f"page_{i}"
+        (base.with_suffix(".json")).write_text("{}")
+        (base.with_suffix(".folded")).write_text("")
+        os.utime(base.with_suffix(".json"), (i, i))
+
+    assert prune(str(tmp_path), keep=2) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["page_3.folded", "page_3.json", "page_4.folded", "page_4.json"]
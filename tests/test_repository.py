@@ -0,0 +1,222 @@
+import json
+
+import pytest
+
+from components.espace_store import EspaceStore
+from components.profile_store import ProfileStore
+from components.repository import (
+    DISC_SESSIONS,
+    PROFILES,
+    Backend,
+    DiscSession,
+    EspaceStoreBackend,
+    JsonFileBackend,
+    MemoryBackend,
+    Message,
+    Profile,
+    ProfileStoreBackend,
+    Repository,
+    SqliteBackend,
+    UnsupportedOperation,
+)
+
+
+class CountingBackend(MemoryBackend):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get(self, coll, key):
+        self.reads += 1
+        return super().get(coll, key)
+
+    def find(self, coll, key):
+        self.reads += 1
+        return super().find(coll, key)
+
+
+def _backends(tmp_path):
+    return {
+        "memory": MemoryBackend(),
+        "json": JsonFileBackend(str(tmp_path / "json")),
+        "sqlite": SqliteBackend(str(tmp_path / "repo.sqlite3")),
+    }
+
+
+@pytest.mark.parametrize("name", ["memory", "json", "sqlite"])
+def test_entities_roundtrip(tmp_path, name):
+    repo = Repository(_backends(tmp_path)[name])
+
+    assert repo.get_profile("a@x.fr") is None
+    repo.put_profile(Profile(email="A@x.fr", first_name="Ana"))
+    assert repo.update_profile("a@x.fr", last_name="Lopez") == Profile(email="a@x.fr", first_name="Ana", last_name="Lopez")
+
+    assert repo.get_espace("a@x.fr").state.ambition_courte == ""
+    repo.update_espace("a@x.fr", ambition_courte="devenir chef de projet", horizon_annee=2027)
+    assert repo.get_espace("a@x.fr").state.horizon_annee == 2027
+    assert repo.get_espace_fields("a@x.fr") == {"ambition_courte": "devenir chef de projet", "horizon_annee": 2027}
+
+    repo.add_disc_session(DiscSession(user="a@x.fr", ts="1", scores={"D": 7}))
+    repo.add_disc_session(DiscSession(user="b@x.fr", ts="2"))
+    repo.add_disc_session(DiscSession(user="A@x.fr", ts="3", scores={"D": 9}))
+    assert [s.ts for s in repo.disc_sessions("a@x.fr")] == ["1", "3"]
+    assert repo.last_disc_session("a@x.fr").scores == {"D": 9}
+
+    repo.add_message(Message("m2", "u1", "coach", "bonjour", "2026-01-02", "read"))
+    repo.add_message(Message("m1", "u1", "user", "question", "2026-01-01", "new"))
+    assert [m.msg_id for m in repo.messages("u1")] == ["m1", "m2"]
+
+
+def test_read_through_cache_and_invalidation():
+    backend = CountingBackend()
+    repo = Repository(backend)
+    repo.update_profile("a@x.fr", first_name="Ana")
+
+    repo.get_profile("a@x.fr")
+    repo.get_profile("a@x.fr")
+    assert backend.reads == 2  # merge (lecture) + première lecture
+
+    repo.update_profile("a@x.fr", first_name="Anna")
+    assert repo.get_profile("a@x.fr").first_name == "Anna"
+
+    repo.disc_sessions("a@x.fr")
+    reads = backend.reads
+    backend.append(DISC_SESSIONS, {"user": "a@x.fr", "ts": "hors repository"})
+    assert repo.disc_sessions("a@x.fr") == []  # servi par le cache
+    repo.invalidate(DISC_SESSIONS)
+    assert len(repo.disc_sessions("a@x.fr")) == 1
+    assert backend.reads == reads + 1
+
+    repo.invalidate()
+    repo.get_profile("a@x.fr")
+    assert backend.reads == reads + 2
+
+
+def test_cached_entities_are_copies():
+    repo = Repository(MemoryBackend())
+    repo.add_disc_session(DiscSession(user="a@x.fr", scores={"D": 1}))
+    repo.last_disc_session("a@x.fr").scores["D"] = 99
+    assert repo.last_disc_session("a@x.fr").scores == {"D": 1}
+
+
+def test_store_backends_share_existing_data(tmp_path):
+    profiles = ProfileStore(str(tmp_path / "profils.sqlite3"))
+    espaces = EspaceStore(str(tmp_path / "espace.sqlite3"))
+    profiles.put("a@x.fr", {"first_name": "Ana"})
+    espaces.save("a@x.fr", {"why1": "un"})
+
+    repo = Repository({"profiles": ProfileStoreBackend(profiles), "espaces": EspaceStoreBackend(espaces)})
+    assert repo.get_profile("a@x.fr").first_name == "Ana"
+    assert repo.get_espace("a@x.fr").state.why1 == "un"
+    repo.update_espace("a@x.fr", why2="deux")
+    assert espaces.load("a@x.fr") == {"why1": "un", "why2": "deux"}
+
+    with pytest.raises(KeyError):
+        repo.messages("u1")
+    with pytest.raises(ValueError):
+        repo.update_profile("", first_name="x")
+
+    # Backend d'enregistrements seuls : refusé pour un journal dès la construction
+    with pytest.raises(UnsupportedOperation):
+        ProfileStoreBackend(profiles).append(DISC_SESSIONS, {"user": "a@x.fr"})
+    with pytest.raises(ValueError):
+        Repository({"disc_sessions": EspaceStoreBackend(espaces)})
+    with pytest.raises(TypeError):
+        type("Incomplete", (Backend,), {"get": lambda self, coll, key: None})()
+
+
+def test_json_backend_reads_existing_disc_log(tmp_path):
+    log = tmp_path / "disc_forced_sessions.jsonl"
+    log.write_text(
+        json.dumps({"ts": "t", "user": "A@x.fr", "scores": {"D": 7}, "style": "DI", "inconnu": 1}) + "\n\nnot json\n",
+        encoding="utf-8",
+    )
+    repo = Repository(JsonFileBackend(str(tmp_path), paths={"disc_sessions": str(log)}))
+    assert repo.last_disc_session("a@x.fr") == DiscSession(user="A@x.fr", ts="t", scores={"D": 7}, style="DI")
+    assert PROFILES.norm_key(" A@X.fr ") == "a@x.fr"
+
+    # Ajouts : appender partagé du journal (verrou fichier)
+    repo.add_disc_session(DiscSession(user="a@x.fr", ts="t2", submission_id="s1"))
+    assert [s.ts for s in repo.disc_sessions("a@x.fr")] == ["t", "t2"]
+    assert (tmp_path / "disc_forced_sessions.jsonl.lock").exists()
+
+
+class FakeWorksheet:
+    def __init__(self, header):
+        self.rows = [list(header)]
+
+    def get_all_records(self):
+        return [dict(zip(self.rows[0], r)) for r in self.rows[1:]]
+
+    def col_values(self, col):
+        return [r[col - 1] for r in self.rows]
+
+    def append_row(self, row):
+        self.rows.append(list(row))
+        return {"updates": {"updatedRange": f"MESSAGES!A{len(self.rows)}:F{len(self.rows)}"}}
+
+    def update(self, values, range_name):
+        self.rows[int(range_name[1:]) - 1] = list(values[0])
+
+
+class FakeSpreadsheet:
+    def __init__(self):
+        self.sheets = {}
+
+    def worksheet(self, title):
+        from gspread.exceptions import WorksheetNotFound
+
+        if title not in self.sheets:
+            raise WorksheetNotFound(title)
+        return self.sheets[title]
+
+    def add_worksheet(self, title, rows, cols):
+        self.sheets[title] = FakeWorksheet([])
+        self.sheets[title].rows = []
+        return self.sheets[title]
+
+
+def test_sheets_backend():
+    from components.repository import SheetsBackend
+
+    sh = FakeSpreadsheet()
+    repo = Repository(SheetsBackend(lambda: sh))
+    written, created = repo.add_message(Message("m1", "u1", "user", "question", "2026-01-01", "new"))
+    assert created and written["sheet_row"] == 2
+    assert sh.sheets["MESSAGES"].rows[0][0] == "msg_id"
+    assert [m.message for m in repo.messages("u1")] == ["question"]
+
+    repo.update_profile("a@x.fr", first_name="Ana")
+    repo.update_profile("a@x.fr", first_name="Anna")
+    assert len(sh.sheets["PROFILES"].rows) == 2
+    assert repo.get_profile("a@x.fr").first_name == "Anna"
+
+
+def test_sheets_backend_does_not_create_a_tab_on_api_errors():
+    from components.repository import SheetsBackend
+
+    class FlakySpreadsheet(FakeSpreadsheet):
+        def worksheet(self, title):
+            raise ConnectionError("quota")
+
+    sh = FlakySpreadsheet()
+    with pytest.raises(ConnectionError):
+        Repository(SheetsBackend(lambda: sh)).messages("u1")
+    assert sh.sheets == {}
+
+
+@pytest.mark.parametrize("name", ["memory", "json", "sqlite", "sheets"])
+def test_disc_session_is_written_once_per_submission_id(tmp_path, name):
+    from components.repository import SheetsBackend
+
+    sh = FakeSpreadsheet()
+    backends = {**_backends(tmp_path), "sheets": SheetsBackend(lambda: sh)}
+    repo = Repository(backends[name])
+
+    first = DiscSession(user="a@x.fr", ts="t1", scores={"D": 3}, submission_id="s1")
+    record, created = repo.add_disc_session(first)
+    assert created and DiscSession.from_record(record) == first
+    record, created = repo.add_disc_session(DiscSession(user="a@x.fr", ts="t2", submission_id="s1"))
+    assert not created and DiscSession.from_record(record).ts == "t1"
+    assert repo.add_disc_session(DiscSession(user="a@x.fr", ts="t3"))[1]  # sans identifiant : toujours écrite
+    assert [s.ts for s in repo.disc_sessions("a@x.fr")] == ["t1", "t3"]
@@ -0,0 +1,26 @@
+from components.send_ledger import PENDING_TIMEOUT_S, SendLedger
+
+
+def test_duplicate_send_is_suppressed_within_window(tmp_path):
+    ledger = SendLedger(str(tmp_path / "envois.sqlite3"), window_s=3600)
+    claim = ledger.claim("A@x.fr", "k1", now=1000.0)
+    assert claim is not None
+    assert ledger.claim("a@x.fr", "k1", now=1001.0) is None  # envoi en cours (double clic)
+    ledger.complete(claim, now=1002.0)
+
+    assert ledger.claim("a@x.fr", "k1", now=2000.0) is None
+    assert ledger.claim("a@x.fr", "k2", now=2000.0) is not None  # autre contenu
+    assert ledger.claim("b@x.fr", "k1", now=2000.0) is not None  # autre destinataire
+    assert ledger.last_sent_at("a@x.fr", "k1") == 1002.0
+    assert ledger.claim("a@x.fr", "k1", now=1002.0 + 3601) is not None  # fenêtre écoulée
+
+
+def test_failed_or_abandoned_send_can_be_retried(tmp_path):
+    ledger = SendLedger(str(tmp_path / "envois.sqlite3"))
+    claim = ledger.claim("a@x.fr", "k", now=1000.0)
+    ledger.release(claim)
+    assert ledger.claim("a@x.fr", "k", now=1001.0) is not None  # nouvel essai après échec SMTP
+
+    # Réservation jamais terminée (process arrêté) : ignorée après PENDING_TIMEOUT_S
+    assert ledger.claim("a@x.fr", "k", now=1002.0) is None
+    assert ledger.claim("a@x.fr", "k", now=1001.0 + PENDING_TIMEOUT_S + 1) is not None
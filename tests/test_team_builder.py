@@ -0,0 +1,102 @@
+import json
+
+import numpy as np
+import pytest
+
+from components import team_builder
+from components.team_builder import form_teams, groups_summary, load_cohort, teams_frame
+
+
+def _cohort(n, seed=0):
+    rng = np.random.default_rng(seed)
+    emails = [f"u{i}@x.fr" for i in range(n)]
+    scores = {e: dict(zip("DISC", map(int, rng.multinomial(25, rng.dirichlet([0.7] * 4))))) for e in emails}
+    return emails, scores
+
+
+def test_groups_have_balanced_sizes_and_beat_random(tmp_path):
+    emails, scores = _cohort(203)
+    plan = form_teams(emails, scores, group_size=5)
+
+    sizes = np.bincount(plan.groups)
+    assert plan.n_groups == 41 and sizes.min() >= 4 and sizes.max() <= 5 and sizes.sum() == 203
+    assert sorted(sum(plan.members(), [])) == sorted(emails)
+    assert plan.cost <= plan.greedy_cost
+
+    # Référence : la même taille de groupes tirée au hasard
+    y = team_builder._deviations(plan.emails, scores)
+    groups = np.random.default_rng(1).permutation(plan.groups)
+    dev_sums = np.zeros((plan.n_groups, y.shape[1]))
+    np.add.at(dev_sums, groups, y)
+    assert plan.cost < team_builder._cost(dev_sums, np.bincount(groups)) / 3
+
+
+def test_styles_are_spread_across_groups():
+    # 4 D, 4 I, 4 S, 4 C très marqués -> 4 groupes de 4 avec une énergie de chaque
+    emails, scores = [], {}
+    for dim in "DISC":
+        for k in range(4):
+            email = f"{dim.lower()}{k}@x.fr"
+            emails.append(email)
+            scores[email] = {d: (19 if d == dim else 2) for d in "DISC"}
+    plan = form_teams(emails, scores, group_size=4)
+    detail = teams_frame(plan, scores)
+    assert (detail.groupby("groupe")["dominante"].nunique() == 4).all()
+    assert plan.cost == pytest.approx(0, abs=1e-12)
+
+    summary = groups_summary(plan, scores)
+    assert list(summary["taille"]) == [4] * 4 and (summary["dominante D"] == 1).all()
+
+
+def test_apart_constraint_and_missing_results():
+    emails, scores = _cohort(40, seed=2)
+    for email in emails[:5]:
+        del scores[email]
+    apart = [(emails[i], emails[i + 1]) for i in range(0, 20, 2)]
+    plan = form_teams(emails, scores, group_size=4, apart=apart)
+
+    group_of = dict(zip(plan.emails, plan.groups))
+    assert all(group_of[a] != group_of[b] for a, b in apart) and plan.violations == []
+    assert plan.missing == emails[:5]
+    detail = teams_frame(plan, scores).set_index("email")
+    assert detail.loc[emails[0], "dominante"] == "" and np.isnan(detail.loc[emails[0], "D"])
+
+
+def test_unsatisfiable_pairs_are_repaired_or_reported():
+    emails, scores = _cohort(4)
+    apart = [(emails[2], emails[3])]
+    # Le placement glouton remplit le premier groupe avant de placer la paire : elle est réunie…
+    y, conflicts = team_builder._deviations(emails, scores), team_builder._conflicts(emails, apart)
+    greedy = team_builder._greedy(y, np.array([2, 2]), conflicts)
+    assert team_builder._violations(emails, greedy, conflicts) == apart
+    # … puis séparée par la réparation
+    plan = form_teams(emails, scores, group_size=2, apart=apart)
+    assert plan.violations == [] and plan.groups[2] != plan.groups[3]
+
+    # Trois apprenants incompatibles deux à deux, un seul groupe : les trois paires sont signalées
+    trio = [(emails[0], emails[1]), (emails[1], emails[2]), (emails[0], emails[2])]
+    plan = form_teams(emails[:3], scores, group_size=3, apart=trio)
+    assert sorted(plan.violations) == sorted(trio)
+
+
+def test_load_cohort_joins_latest_session(tmp_path):
+    (tmp_path / "mba.csv").write_text("email\nA@x.fr\nb@x.fr\nc@x.fr\n", encoding="utf-8")
+    log = tmp_path / "sessions.jsonl"
+    log.write_text(
+        "".join(
+            json.dumps({"user": u, "scores": s}) + "\n"
+            for u, s in [
+                ("a@x.fr", {"D": 10, "I": 5, "S": 5, "C": 5}),
+                ("b@x.fr", {"D": 1, "I": 1, "S": 1, "C": 22}),
+                ("a@x.fr", {"D": 1, "I": 20, "S": 2, "C": 2}),
+                ("z@x.fr", {"D": 25, "I": 0, "S": 0, "C": 0}),
+            ]
+        ),
+        encoding="utf-8",
+    )
+    emails, scores = load_cohort(str(tmp_path / "mba.csv"), str(log))
+    assert emails == ["a@x.fr", "b@x.fr", "c@x.fr"]
+    assert scores == {"a@x.fr": {"D": 1, "I": 20, "S": 2, "C": 2}, "b@x.fr": {"D": 1, "I": 1, "S": 1, "C": 22}}
+
+    with pytest.raises(ValueError):
+        form_teams(emails, scores, group_size=0)